@@ -0,0 +1,53 @@
+"""Benchmark of the time needed for 'import powfacpy' in a new interpreter
+(as it happens for every short-lived worker process).
+
+Every measurement starts a fresh interpreter, so that nothing is cached in
+'sys.modules'. The time of the interpreter startup itself ('pass') is 
+measured as a reference.
+
+Run from the repository root:
+  python benchmarks/bench_import.py
+"""
+
+import statistics
+import subprocess
+import sys
+
+REPETITIONS = 10
+
+STATEMENTS = {
+  "interpreter startup (pass)": "pass",
+  "import powfacpy": "import powfacpy",
+  "powfacpy.PFBaseInterface": "import powfacpy; powfacpy.PFBaseInterface",
+  "powfacpy.PFResultsInterface": "import powfacpy; powfacpy.PFResultsInterface",
+  "powfacpy.PFPlotInterface": "import powfacpy; powfacpy.PFPlotInterface",
+}
+
+
+def time_statement(statement):
+  code = ("import time; t = time.perf_counter(); "
+    f"{statement}; print(time.perf_counter() - t)")
+  timings = []
+  for _ in range(REPETITIONS):
+    output = subprocess.run([sys.executable,"-c",code],env={"PYTHONPATH":"src"},
+      capture_output=True,text=True,check=True).stdout
+    timings.append(float(output))
+  return statistics.median(timings)
+
+
+def heavy_modules_loaded_by(statement):
+  code = (f"import sys; {statement}; "
+    "print(','.join(m for m in ('numpy','pandas','matplotlib') if m in sys.modules))")
+  return subprocess.run([sys.executable,"-c",code],env={"PYTHONPATH":"src"},
+    capture_output=True,text=True,check=True).stdout.strip() or "-"
+
+
+def main():
+  print(f"Median of {REPETITIONS} fresh interpreters:")
+  for name,statement in STATEMENTS.items():
+    print(f"  {name:<30}{time_statement(statement)*1e3:8.1f} ms"
+      f"  (loads: {heavy_modules_loaded_by(statement)})")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,83 @@
+"""Micro-benchmark of the conversion of full PF paths to paths relative to
+the active project (PFStringManipuilation.format_full_path/format_full_paths).
+
+The legacy implementation (character loop with string concatenation and
+one 'GetActiveProject' call per path) is compared with the current
+implementation for 100k paths.
+
+Run from the repository root:
+  python benchmarks/bench_string_manipulation.py
+"""
+
+import sys
+import timeit
+from types import SimpleNamespace
+
+sys.path.insert(0,"src")
+import powfacpy
+from powfacpy import PFStringManipuilation
+
+NUMBER_OF_PATHS = 100000
+
+
+class _App:
+  """Application that only provides the active project (the benchmark
+  only measures string manipulation).
+  """
+
+  def __init__(self):
+    self.project = SimpleNamespace(loc_name="powfacpy_base")
+    self.calls = 0
+
+  def GetActiveProject(self):
+    self.calls += 1
+    return self.project
+
+
+def legacy_delete_classes(path):
+  new_string = ""
+  is_between_chars = False
+  for c in path:
+    if c == '.':
+      is_between_chars = True
+    elif c == '\\' and is_between_chars:
+      is_between_chars = False
+      new_string = new_string + '\\'
+    elif not is_between_chars:
+      new_string = new_string + c
+  return new_string
+
+
+def legacy_format_full_path(path,pf_interface):
+  project_name = pf_interface.app.GetActiveProject().loc_name + '.IntPrj\\'
+  path = path[path.find(project_name)+len(project_name):]
+  return legacy_delete_classes(path)
+
+
+def create_full_paths(number_of_paths):
+  prefix = ("\\username.IntUser\\powfacpy_base.IntPrj\\Network Model.IntPrjfolder"
+    "\\Network Data.IntPrjfolder")
+  return [f"{prefix}\\Grid {i % 10}.ElmNet\\Substation {i % 100}.ElmSubstat"
+    f"\\Terminal {i}.ElmTerm" for i in range(number_of_paths)]
+
+
+def main():
+  pf_interface = SimpleNamespace(app=_App())
+  paths = create_full_paths(NUMBER_OF_PATHS)
+  assert ([legacy_format_full_path(p,pf_interface) for p in paths[:1000]]
+    == PFStringManipuilation.format_full_paths(paths[:1000],pf_interface))
+  timings = {
+    "legacy format_full_path": lambda: [legacy_format_full_path(p,pf_interface) for p in paths],
+    "format_full_path": lambda: [PFStringManipuilation.format_full_path(p,pf_interface) for p in paths],
+    "format_full_paths (batch)": lambda: PFStringManipuilation.format_full_paths(paths,pf_interface),
+  }
+  results = {name:min(timeit.repeat(function,number=1,repeat=3))
+    for name,function in timings.items()}
+  legacy_time = results["legacy format_full_path"]
+  print(f"{NUMBER_OF_PATHS} paths:")
+  for name,seconds in results.items():
+    print(f"  {name:<28}{seconds*1e3:10.1f} ms  (speedup {legacy_time/seconds:5.1f}x)")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,57 @@
+"""Fixtures of the benchmark suite (see 'test_bench_scaling.py').
+
+The project sizes can be set with the environment variable
+POWFACPY_BENCHMARK_SIZES (comma separated number of objects), e.g.
+  POWFACPY_BENCHMARK_SIZES=1000,10000,100000,1000000
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0,os.path.join(os.path.dirname(__file__),"..","src"))
+sys.path.insert(0,os.path.dirname(__file__))
+from fake_powerfactory import FakeApplication, build_synthetic_project
+
+DEFAULT_SIZES = "1000,10000,100000"
+
+
+def get_project_sizes():
+  sizes = os.environ.get("POWFACPY_BENCHMARK_SIZES",DEFAULT_SIZES)
+  return [int(size) for size in sizes.split(",") if size.strip()]
+
+
+def pytest_generate_tests(metafunc):
+  if "project_size" in metafunc.fixturenames:
+    metafunc.parametrize("project_size",get_project_sizes(),scope="session")
+
+
+@pytest.fixture(scope="session")
+def synthetic_apps():
+  """Synthetic projects by size, built once per session (read-only
+  benchmarks share them).
+  """
+  return {}
+
+
+@pytest.fixture
+def app(synthetic_apps,project_size):
+  """Fake app with an active synthetic project of 'project_size' objects.
+  The project is shared and must not be changed by the benchmark.
+  """
+  if project_size not in synthetic_apps:
+    app = FakeApplication()
+    build_synthetic_project(app,project_size)
+    synthetic_apps[project_size] = app
+  return synthetic_apps[project_size]
+
+
+@pytest.fixture
+def new_app(project_size):
+  """Fake app with a new synthetic project (for benchmarks that change
+  the project).
+  """
+  app = FakeApplication()
+  build_synthetic_project(app,project_size)
+  return app
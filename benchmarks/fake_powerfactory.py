@@ -0,0 +1,484 @@
+"""In-memory fake of the PowerFactory Python API.
+
+The fake mimics the subset of the 'app' and 'DataObject' API that powfacpy
+uses, so that powfacpy's own overhead can be measured (and its code paths
+exercised) without a PowerFactory installation. It is not a simulator:
+results objects (ElmRes) only hold data that was written to them with
+'FakeDataObject.set_results'.
+
+Example:
+  app = FakeApplication()
+  build_synthetic_project(app,number_of_objects=10000)
+  pfbi = powfacpy.PFBaseInterface(app)
+"""
+
+from fnmatch import fnmatchcase
+from itertools import count
+
+
+# Default attributes of object classes (only classes used in powfacpy
+# and in the synthetic projects are listed).
+CLASS_DEFAULT_ATTRIBUTES = {
+  "ElmTerm": {"uknom": 110.0, "systype": 0, "outserv": 0, "iUsage": 0},
+  "ElmLne": {"dline": 1.0, "outserv": 0, "nlnum": 1},
+  "ElmLod": {"plini": 1.0, "qlini": 0.0, "outserv": 0},
+  "ElmVac": {"Unom": 110.0, "outserv": 0},
+  "ElmNet": {"frnom": 50.0, "pDiagram": None},
+  "StaCubic": {"obj_id": None, "cterm": None},
+  "IntGrfnet": {"pDataFolder": None},
+  "IntGrf": {"pDataObj": None},
+  "IntVec": {"V": []},
+  "BlkDef": {"sTitle": "", "desc": []},
+  "IntCase": {},
+  "IntScenario": {},
+  "IntScheme": {},
+}
+
+# Attributes that every object has
+COMMON_ATTRIBUTES = {"desc": [], "for_name": ""}
+
+CONTAINER_CLASSES = {"IntUser", "IntPrj", "IntPrjfolder", "IntFolder", "ElmNet",
+  "IntCase", "IntScenario", "IntScheme", "IntGrfnet", "SetDesktop", "ElmTerm",
+  "ElmSubstat", "SetFold", "IntLibrary", "IntEvt", "GrpPage"}
+
+
+def _split_name(name_incl_class):
+  """Splits 'name.Class' into (name,class). Names without class get an
+  empty class.
+  """
+  name, dot, class_name = name_incl_class.rpartition(".")
+  if not dot:
+    return name_incl_class, ""
+  return name, class_name
+
+
+class FakeDataObject:
+  """Fake of 'powerfactory.DataObject'.
+  """
+
+  _ids = count()
+
+  def __init__(self, app, class_name, loc_name, parent=None):
+    d = self.__dict__
+    d["_app"] = app
+    d["_class_name"] = class_name
+    d["_id"] = next(FakeDataObject._ids)
+    d["_parent"] = parent
+    d["_children"] = []
+    d["_children_by_name"] = {} # loc_name: children (like the name index of PF)
+    d["_deleted"] = False
+    d["_active"] = False
+    attrs = dict(COMMON_ATTRIBUTES)
+    attrs.update(CLASS_DEFAULT_ATTRIBUTES.get(class_name, {}))
+    attrs["loc_name"] = loc_name
+    d["_attrs"] = attrs
+    if parent is not None:
+      parent._children.append(self)
+      parent._children_by_name.setdefault(loc_name, []).append(self)
+
+  # Attribute access
+  def __getattr__(self, name):
+    try:
+      return self.__dict__["_attrs"][name]
+    except KeyError:
+      raise AttributeError(f"'{self._class_name}' object has no attribute '{name}'")
+
+  def __setattr__(self, name, value):
+    if name not in self._attrs and self._class_name not in ("ComRes", "ComInc",
+      "ComSim", "ComWr", "ElmRes"):
+      raise AttributeError(f"'{self._class_name}' object has no attribute '{name}'")
+    if name == "loc_name" and self._parent is not None:
+      self._parent._remove_from_name_index(self)
+      self._parent._children_by_name.setdefault(value, []).append(self)
+    self._attrs[name] = value
+
+  def GetAttribute(self, name):
+    name = name.split(":", 1)[1] if name[:2] in ("e:", "c:") else name
+    return self.__getattr__(name)
+
+  def SetAttribute(self, name, value):
+    name = name.split(":", 1)[1] if name[:2] in ("e:", "c:") else name
+    if name in self._attrs and isinstance(self._attrs[name], list) \
+      and not isinstance(value, list):
+      raise TypeError(f"Expected a list for attribute '{name}'")
+    self.__setattr__(name, value)
+
+  def HasAttribute(self, name):
+    if name == "contents":
+      return self._class_name in CONTAINER_CLASSES
+    return name in self._attrs
+
+  # Hierarchy
+  def GetClassName(self):
+    return self._class_name
+
+  def GetParent(self):
+    return self._parent
+
+  def GetFullName(self, type=0):
+    names = []
+    obj = self
+    while obj is not None:
+      names.append(f"{obj._attrs['loc_name']}.{obj._class_name}")
+      obj = obj._parent
+    return "\\" + "\\".join(reversed(names))
+
+  def __str__(self):
+    return self.GetFullName()
+
+  def __repr__(self):
+    return f"<FakeDataObject {self.GetFullName()}>"
+
+  @staticmethod
+  def _matches(obj, pattern):
+    name_pattern, class_pattern = _split_name(pattern)
+    if class_pattern and not fnmatchcase(obj._class_name, class_pattern):
+      return False
+    return fnmatchcase(obj._attrs["loc_name"], name_pattern or "*")
+
+  def _remove_from_name_index(self, child):
+    name = child._attrs["loc_name"]
+    children = self._children_by_name[name]
+    children.remove(child)
+    if not children:
+      del self._children_by_name[name]
+
+  def _get_matching_children(self, pattern):
+    name_pattern, class_pattern = _split_name(pattern)
+    if name_pattern and not any(c in name_pattern for c in "*?["):
+      # Exact name: use the name index instead of matching all children
+      return [child for child in self._children_by_name.get(name_pattern, ())
+        if not class_pattern or fnmatchcase(child._class_name, class_pattern)]
+    return [child for child in self._children if self._matches(child, pattern)]
+
+  def _iter_descendants(self):
+    stack = list(reversed(self._children))
+    while stack:
+      obj = stack.pop()
+      yield obj
+      stack.extend(reversed(obj._children))
+
+  def GetContents(self, pattern="*", recursive=0):
+    if not isinstance(pattern, str):
+      raise RuntimeError("Expected a string")
+    segments = pattern.split("\\")
+    folders = [self]
+    for segment in segments[:-1]:
+      folders = [child for folder in folders
+        for child in folder._get_matching_children(segment)]
+    if not recursive:
+      return [child for folder in folders
+        for child in folder._get_matching_children(segments[-1])]
+    candidates = []
+    for folder in folders:
+      candidates.extend(folder._iter_descendants())
+    return [obj for obj in candidates if self._matches(obj, segments[-1])]
+
+  def GetChildren(self, hidden_mode=0, pattern="*", subfolders=0):
+    return self.GetContents(pattern, subfolders)
+
+  # Creation, copying and deletion
+  def _unique_name(self, name, class_name):
+    def exists(name):
+      return any(c._class_name == class_name for c in self._children_by_name.get(name, ()))
+    if not exists(name):
+      return name
+    num = 1
+    while exists(f"{name}({num})"):
+      num += 1
+    return f"{name}({num})"
+
+  def CreateObject(self, class_name, name=""):
+    obj_type = FakeElmRes if class_name == "ElmRes" else FakeDataObject
+    return obj_type(self._app, class_name, self._unique_name(name, class_name), self)
+
+  def _copy_into(self, target, new_name=None):
+    name = target._unique_name(new_name or self._attrs["loc_name"], self._class_name)
+    copy = type(self)(self._app, self._class_name, name, target)
+    for key, value in self._attrs.items():
+      if key != "loc_name":
+        copy._attrs[key] = list(value) if isinstance(value, list) else value
+    for child in self._children:
+      child._copy_into(copy)
+    return copy
+
+  def AddCopy(self, obj, new_name=None):
+    if isinstance(obj, (list, tuple)):
+      return [o._copy_into(self) for o in obj][-1] if obj else None
+    return obj._copy_into(self, new_name)
+
+  def Delete(self):
+    if self._active and self._class_name == "IntCase":
+      # Like PowerFactory, the active study case cannot be deleted
+      # (and Delete() still returns 0).
+      return 0
+    if self._parent is not None:
+      self._parent._children.remove(self)
+      self._parent._remove_from_name_index(self)
+    self._mark_deleted()
+    return 0
+
+  def _mark_deleted(self):
+    self.__dict__["_deleted"] = True
+    for child in self._children:
+      child._mark_deleted()
+
+  def IsDeleted(self):
+    return int(self._deleted)
+
+  # Activation
+  def Activate(self):
+    self.__dict__["_active"] = True
+    if self._class_name == "IntCase":
+      previous = self._app._active_study_case
+      if previous is not None and previous is not self:
+        previous.__dict__["_active"] = False
+      self._app._active_study_case = self
+    elif self._class_name == "IntScenario":
+      self._app._active_scenario = self
+    return 0
+
+  def Deactivate(self):
+    self.__dict__["_active"] = False
+    if self._app._active_study_case is self:
+      self._app._active_study_case = None
+    if self._app._active_scenario is self:
+      self._app._active_scenario = None
+    return 0
+
+  def IsActive(self):
+    return int(self._active)
+
+  def Save(self):
+    return 0
+
+  def NewStage(self, name, time, activate):
+    return self.CreateObject("IntSstage", name)
+
+  def GetCalcRelevantCubicles(self):
+    return [c for c in self._children if c._class_name == "StaCubic"]
+
+
+class FakeElmRes(FakeDataObject):
+  """Fake of a results object (ElmRes).
+  """
+
+  def __init__(self, app, class_name, loc_name, parent=None):
+    super().__init__(app, class_name, loc_name, parent)
+    self.__dict__["_columns"] = []
+    self.__dict__["_time"] = []
+    self.__dict__["_data"] = []
+    self.__dict__["_loaded"] = False
+    self.__dict__["load_count"] = 0
+
+  def set_results(self, time, columns):
+    """Sets recorded data. 'columns' is a list of (element,variable,values).
+    """
+    self.__dict__["_time"] = list(time)
+    self.__dict__["_columns"] = [(element, variable) for element, variable, _ in columns]
+    self.__dict__["_data"] = [list(values) for _, _, values in columns]
+
+  def AddVariable(self, element, variable):
+    if (element, variable) not in self._columns:
+      self._columns.append((element, variable))
+      self._data.append([0.0] * len(self._time))
+    return 0
+
+  def Load(self):
+    self.__dict__["_loaded"] = True
+    self.__dict__["load_count"] += 1
+    return 0
+
+  def Release(self):
+    self.__dict__["_loaded"] = False
+    return 0
+
+  def FindColumn(self, element, variable=None):
+    for col, (column_element, column_variable) in enumerate(self._columns):
+      if column_element is element and column_variable == variable:
+        return col
+    return -1
+
+  def GetNumberOfColumns(self):
+    return len(self._columns)
+
+  def GetNumberOfRows(self):
+    return len(self._time)
+
+  def GetObject(self, col):
+    return self._columns[col][0]
+
+  def GetVariable(self, col):
+    return self._columns[col][1]
+
+  def _column(self, col):
+    if not self._loaded:
+      raise RuntimeError("ElmRes is not loaded")
+    return self._time if col == -1 else self._data[col]
+
+  def GetValue(self, row, col=-1):
+    try:
+      return [0, self._column(col)[row]]
+    except IndexError:
+      return [1, 0.0]
+
+  def GetColumnValues(self, vector, col):
+    vector.V = list(self._column(col))
+    return 0
+
+
+class FakeApplication:
+  """Fake of the PowerFactory application object.
+  """
+
+  def __init__(self, user_name="fake_user", language="en"):
+    self._language = language
+    self._root = FakeDataObject(self, "IntUser", user_name)
+    self._global_library = FakeDataObject(self, "IntLibrary", "Library")
+    self._active_project = None
+    self._active_study_case = None
+    self._active_scenario = None
+
+  def GetLanguage(self):
+    return self._language
+
+  def GetCurrentUser(self):
+    return self._root
+
+  def GetGlobalLibrary(self, class_name=None):
+    return self._global_library
+
+  def GetActiveProject(self):
+    return self._active_project
+
+  def ActivateProject(self, path):
+    project = self._root.GetContents(path.strip("\\"))
+    if not project:
+      return 1
+    self._active_project = project[0]
+    return 0
+
+  def GetActiveStudyCase(self):
+    return self._active_study_case
+
+  def GetActiveScenario(self):
+    return self._active_scenario
+
+  def GetProjectFolder(self, folder_type, create=0):
+    folder_names = {
+      "study": "Study Cases",
+      "scen": "Network Model\\Operation Scenarios",
+      "scheme": "Network Model\\Variations",
+      "netdat": "Network Model\\Network Data",
+      "lib": "Library",
+    }
+    folder = self._active_project.GetContents(folder_names[folder_type])
+    return folder[0] if folder else None
+
+  def GetFromStudyCase(self, name):
+    case = self._active_study_case
+    if case is None:
+      return None
+    if "." not in name:
+      name = "." + name
+    obj = case.GetContents(name)
+    if obj:
+      return obj[0]
+    obj_name, class_name = _split_name(name)
+    return case.CreateObject(class_name, obj_name or class_name)
+
+  def GetCalcRelevantObjects(self, pattern="*", include_out_of_service=1,
+    topology_elements_only=0, buses_only=0):
+    if pattern.startswith("."):
+      pattern = "*" + pattern
+    grids = [obj for obj in self._active_project._iter_descendants()
+      if obj._class_name == "ElmNet" and obj._active]
+    objects = list(grids)
+    for grid in grids:
+      objects.extend(grid._iter_descendants())
+    return [obj for obj in objects if FakeDataObject._matches(obj, pattern)]
+
+  def GetWorkspaceDirectory(self):
+    return ""
+
+  def GetInstallationDirectory(self):
+    return ""
+
+  def Show(self):
+    return 0
+
+
+def create_project(app, name="fake_project"):
+  """Creates and activates an empty project with the default project folders.
+  """
+  project = app.GetCurrentUser().CreateObject("IntPrj", name)
+  network_model = project.CreateObject("IntPrjfolder", "Network Model")
+  network_model.CreateObject("IntPrjfolder", "Network Data")
+  network_model.CreateObject("IntPrjfolder", "Operation Scenarios")
+  network_model.CreateObject("IntPrjfolder", "Variations")
+  project.CreateObject("IntPrjfolder", "Study Cases")
+  library = project.CreateObject("IntPrjfolder", "Library")
+  library.CreateObject("IntPrjfolder", "Dynamic Models")
+  settings = project.CreateObject("SetFold", "Settings")
+  settings.CreateObject("SetPrj", "Project Settings")
+  app.ActivateProject(name)
+  return project
+
+
+def build_synthetic_project(app, number_of_objects=1000, name="synthetic",
+  grids=None, terminals_per_substation=50):
+  """Creates a project with roughly 'number_of_objects' network elements.
+
+  The network data folder contains 'grids' grids (ElmNet). Each grid
+  contains substation folders with terminals, loads and lines. A diagram
+  (IntGrfnet) with one graphic object (IntGrf) per element is created
+  for every grid. A study case 'Study Case' (active) is created and all
+  grids are activated.
+
+  Returns the project.
+  """
+  project = create_project(app, name)
+  network_data = project.GetContents("Network Model\\Network Data")[0]
+  diagrams = project.GetContents("Network Model")[0].CreateObject(
+    "IntPrjfolder", "Diagrams")
+  if grids is None:
+    grids = max(1, number_of_objects // 10000)
+  elements_per_grid = max(1, number_of_objects // grids)
+  for grid_num in range(grids):
+    grid = network_data.CreateObject("ElmNet", f"Grid {grid_num}")
+    diagram = diagrams.CreateObject("IntGrfnet", f"Grid {grid_num}")
+    grid._attrs["pDiagram"] = diagram
+    diagram._attrs["pDataFolder"] = grid
+    created = 0
+    substation_num = 0
+    while created < elements_per_grid:
+      substation = grid.CreateObject("ElmSubstat", f"Substation {substation_num}")
+      previous_terminal = None
+      for terminal_num in range(terminals_per_substation):
+        if created >= elements_per_grid:
+          break
+        terminal = substation.CreateObject("ElmTerm", f"Terminal {terminal_num}")
+        terminal._attrs["uknom"] = (110.0, 20.0, 0.4)[terminal_num % 3]
+        terminal._attrs["outserv"] = int(terminal_num % 10 == 0)
+        cubicle = terminal.CreateObject("StaCubic", "Cub_1")
+        load = grid.CreateObject("ElmLod", f"Load {substation_num} {terminal_num}")
+        load._attrs["plini"] = float(terminal_num)
+        cubicle._attrs["obj_id"] = load
+        load._attrs["bus1"] = cubicle
+        cubicle._attrs["cterm"] = terminal
+        created += 3
+        for element in (terminal, load):
+          graphic = diagram.CreateObject("IntGrf", f"Graphic {element._id}")
+          graphic._attrs["pDataObj"] = element
+        if previous_terminal is not None:
+          line = grid.CreateObject("ElmLne",
+            f"Line {substation_num} {terminal_num}")
+          line._attrs["dline"] = float(terminal_num)
+          created += 1
+        previous_terminal = terminal
+      substation_num += 1
+    grid.Activate()
+  study_case = project.GetContents("Study Cases")[0].CreateObject(
+    "IntCase", "Study Case")
+  study_case.Activate()
+  return project
@@ -0,0 +1,110 @@
+"""Scaling benchmarks of powfacpy on synthetic projects of the fake
+PowerFactory application (see 'fake_powerfactory.py').
+
+Every benchmark is run for all project sizes (see 'conftest.py'), so that
+the growth of the run time with the project size can be compared (e.g. to
+catch an accidentally quadratic implementation).
+
+Run from the repository root (requires pytest-benchmark):
+  python -m pytest benchmarks --benchmark-group-by=func
+"""
+
+import csv
+import os
+from itertools import count
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import powfacpy
+
+NETWORK_DATA = "Network Model\\Network Data"
+
+
+def test_get_obj_single_path(benchmark,app):
+  pfbi = powfacpy.PFBaseInterface(app)
+  path = NETWORK_DATA + "\\Grid 0\\Substation 0\\Terminal 1"
+  objects = benchmark(pfbi.get_obj,path)
+  assert len(objects) == 1
+
+
+def test_get_obj_wildcards(benchmark,app):
+  pfbi = powfacpy.PFBaseInterface(app)
+  objects = benchmark(pfbi.get_obj,NETWORK_DATA + "\\*\\*\\*.ElmTerm")
+  assert objects
+
+
+def test_get_obj_include_subfolders(benchmark,app):
+  pfbi = powfacpy.PFBaseInterface(app)
+  objects = benchmark(pfbi.get_obj,"*.ElmLod",parent_folder=NETWORK_DATA,
+    include_subfolders=True)
+  assert objects
+
+
+def test_get_obj_with_condition(benchmark,app):
+  pfbi = powfacpy.PFBaseInterface(app)
+  objects = benchmark(pfbi.get_obj,NETWORK_DATA + "\\*\\*\\*.ElmTerm",
+    condition=powfacpy.Attr("uknom") == 110)
+  assert objects
+
+
+def test_create_directory(benchmark,new_app):
+  pfbi = powfacpy.PFBaseInterface(new_app)
+  directory_numbers = count()
+  def create_directory():
+    return pfbi.create_directory(
+      f"Library\\Benchmark\\Folder {next(directory_numbers)}\\a\\b\\c")
+  folder = benchmark(create_directory)
+  assert folder.GetClassName() == "IntFolder"
+
+
+def test_create_cases(benchmark,new_app):
+  terminal = NETWORK_DATA + "\\Grid 0\\Substation 0\\Terminal 1"
+  def create_cases():
+    pfsc = powfacpy.PFStudyCases(new_app)
+    pfsc.parameter_values = {
+      "region": ["north"]*10 + ["south"]*10,
+      "voltage": [float(v) for v in range(20)],
+    }
+    pfsc.parameter_paths = {"voltage": terminal + "\\uknom"}
+    pfsc.hierarchy = ["region"]
+    pfsc.create_cases()
+    return pfsc
+  pfsc = benchmark.pedantic(create_cases,rounds=5,iterations=1)
+  assert len(pfsc.study_cases) == 20
+
+
+def write_elmres_csv(pfbi,file_path,rows=100):
+  """Writes a csv file in the format of a PF results export (first row:
+  full paths of the objects, second row: variables with description) with
+  one column per terminal.
+  """
+  terminals = pfbi.get_obj(NETWORK_DATA + "\\*\\*\\*.ElmTerm")
+  with open(file_path,"w",newline="") as file:
+    writer = csv.writer(file)
+    writer.writerow(["All calculations"] + [t.GetFullName() for t in terminals])
+    writer.writerow(["b:tnow in s"] + ["m:u in p.u."]*len(terminals))
+    for row in range(rows):
+      writer.writerow([row*0.01] + [1.0]*len(terminals))
+
+
+def test_format_csv_for_elmres(benchmark,app,tmp_path):
+  pfbi = powfacpy.PFBaseInterface(app)
+  file_path = str(tmp_path / "results.csv")
+  def setup():
+    write_elmres_csv(pfbi,file_path)
+  benchmark.pedantic(pfbi.format_csv_for_elmres,args=(file_path,),setup=setup,
+    rounds=5,iterations=1)
+  with open(file_path) as file:
+    assert file.readline().startswith("Time,Network Model\\Network Data\\Grid 0")
+
+
+def test_copy_grid(benchmark,new_app):
+  pfni = powfacpy.PFNetworkInterface(new_app)
+  new_grid = benchmark.pedantic(pfni.copy_grid,
+    args=(NETWORK_DATA + "\\Grid 0",NETWORK_DATA,"Grid copy"),rounds=1,iterations=1)
+  graphics = pfni.get_obj("*.IntGrf",parent_folder=new_grid.pDiagram)
+  assert all(g.pDataObj.GetParent() is not None for g in graphics)
+  assert os.path.commonprefix([graphics[0].pDataObj.GetFullName(),
+    new_grid.GetFullName()]) == new_grid.GetFullName()
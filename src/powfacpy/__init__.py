@@ -1,12 +1,108 @@
 """
 Wrapper for the native API of PowerFactory.
+
+The core of the package (PFBaseInterface, the exceptions, caches and 
+instrumentation) is imported directly. The other submodules depend on heavy
+packages (NumPy, pandas, matplotlib) and are only imported when one of their
+attributes is accessed for the first time (PEP 562), e.g.
+  import powfacpy
+  pfbi = powfacpy.PFBaseInterface(app) # does not import pandas/matplotlib
+  pfplot = powfacpy.PFPlotInterface(app) # imports plot_interface
 """
 
+import importlib
+
 from .base_interface import *
 from .exceptions import *
-from .dyn_sim_interface import *
-from .plot_interface import *
-from .case_studies import *
-from .network_interface import *
-from .engineering_helpers import *
-from .results_interface import *
+from .caching import *
+from .object_index import *
+from .instrumentation import *
+
+# Attributes of the lazily imported submodules {attribute: submodule}
+_lazy_attributes = {
+  "PFCondition": "conditions",
+  "PFAttributeCondition": "conditions",
+  "PFLogicalCondition": "conditions",
+  "PFNotCondition": "conditions",
+  "Attr": "conditions",
+  "PFDynSimInterface": "dyn_sim_interface",
+  "PFPlotInterface": "plot_interface",
+  "PFListsOfDataSeriesOfPlot": "plot_interface",
+  "PFStudyCases": "case_studies",
+  "PFNetworkInterface": "network_interface",
+  "get_R_and_X_from_RX_ratio": "engineering_helpers",
+  "get_resistance_and_reactance_from_uk_and_copper_losses": "engineering_helpers",
+  "PFResultsInterface": "results_interface",
+  "PFResultsSession": "results_interface",
+  "PFResultsFrame": "results_interface",
+  "PFResultsCache": "results_cache",
+  "PFAPIRecorder": "recording",
+  "PFRecordingObject": "recording",
+  "PFAPIReplayer": "recording",
+  "PFReplayObject": "recording",
+  "PFSnapshot": "snapshot",
+  "write_snapshot": "snapshot",
+  "pyarrow_is_available": "snapshot",
+  "downsample": "downsampling",
+  "downsample_minmax": "downsampling",
+  "downsample_lttb": "downsampling",
+  "get_minmax_indices": "downsampling",
+  "compute_kpis": "kpis",
+  "get_overshoot": "kpis",
+  "get_rise_time": "kpis",
+  "get_settling_time": "kpis",
+  "align_cases": "case_comparison",
+  "get_case_statistics": "case_comparison",
+  "get_common_time_grid": "case_comparison",
+  "interpolate": "case_comparison",
+  "create_array": "case_comparison",
+}
+_lazy_submodules = set(_lazy_attributes.values())
+
+# Public names (also for 'from powfacpy import *', which imports the lazy 
+# submodules)
+__all__ = [
+  # base_interface
+  "PFBaseInterface",
+  "PFStringManipuilation",
+  "PFResultVariable",
+  "PFWriteBatch",
+  "PFTranslator",
+  # exceptions
+  "PFInterfaceError",
+  "PFAttributeError",
+  "PFAttributeTypeError",
+  "PFPathError",
+  "PFNotBelowObjectError",
+  "PFPathInputError",
+  "PFNonExistingObjectError",
+  "PFNotActiveError",
+  "PFNoPlotActivatedError",
+  "PFCaseStudyParameterValueDefinitionError",
+  "PFReplayMismatchError",
+  "PFResultsColumnNotFoundError",
+  # caching, object_index, instrumentation
+  "PFPathCache",
+  "PFCacheInfo",
+  "PFFolderTrie",
+  "PFObjectIndex",
+  "PFAPIStatistics",
+  "PFInstrumentedObject",
+  "unwrap",
+] + list(_lazy_attributes)
+
+
+def __getattr__(name):
+  if name in _lazy_attributes:
+    submodule = importlib.import_module("." + _lazy_attributes[name], __name__)
+    value = getattr(submodule, name)
+  elif name in _lazy_submodules:
+    value = importlib.import_module("." + name, __name__)
+  else:
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+  globals()[name] = value # __getattr__ is not called again for this name
+  return value
+
+
+def __dir__():
+  return sorted(set(globals()) | set(_lazy_attributes) | _lazy_submodules)
@@ -8,12 +8,30 @@ from argparse import ArgumentError
 import sys
 
 from powfacpy.exceptions import PFNotActiveError
-sys.path.insert(0,r'.\src')
+from powfacpy.caching import PFPathCache
+from powfacpy.object_index import PFObjectIndex
+from powfacpy.instrumentation import PFAPIStatistics, PFInstrumentedObject, unwrap
 import powfacpy
-from os import path as os_path
+import ntpath # PF paths always use "\\" as separator (also on Linux)
 from collections.abc import Iterable
+from collections import deque
 from os import getcwd, replace
+import os
+import json
+import locale
+import shutil
+from contextlib import contextmanager
 import math
+import re
+
+# Buffer size (bytes) for copying the data rows of csv files
+CSV_COPY_BUFFER_SIZE = 16*1024*1024
+# Suffix of the header map of csv files (see 'format_csv_for_elmres')
+HEADER_MAP_SUFFIX = ".header.json"
+# Classes of objects that can be (or contain) the active study case, scenario
+# or variations (see 'delete_objects')
+CLASSES_CONTAINING_ACTIVE_OBJECTS = frozenset(("IntCase","IntScenario","IntScheme",
+  "IntFolder","IntPrjfolder","IntPrj","IntUser"))
 
 # ToDo: get_active_networks, copy_graphics_pages
 
@@ -21,18 +39,28 @@ class PFBaseInterface:
   """Base interface for interaction with the PF database.
   """
   language = "en" 
+  # Incremented whenever results objects may have changed (see 'invalidate_results')
+  results_version = 0
 
-  def __init__(self,app,language=None):  
+  def __init__(self,app,language=None,instrument=False):  
     if app:
       self.app = app
     else:
       raise TypeError("The input app is of type 'NoneType'. Maybe the PowerFactory "
       "app was not loaded correctly.")  
+    self.api_statistics = None
+    if instrument:
+      self.enable_instrumentation()
     if not language:
       self.language = app.GetLanguage()
     else:
       self.language = language  
     self.export_dir = None
+    self.path_cache = None
+    self.object_index = None
+    self.write_batch = None
+    # (project,'<project name>.IntPrj\\') of the last active project (see 'get_project_prefix')
+    self._project_prefix = None
 
   def get_obj(self,path,condition=None,parent_folder=None,error_if_non_existent=True,
     include_subfolders=False):
@@ -41,6 +69,9 @@ class PFBaseInterface:
     A condition may be specified as a function, for example to check 
     certain attributes with lambda function:
       (eg. "condition = lambda x : getattr(x,"uknom")==110)".
+    For many objects, a declarative condition is faster, because it is
+    evaluated for all objects at once (see module 'conditions'):
+      (eg. "condition = Attr("uknom") == 110").
     By default, the 'path' is relative to the folder of the active project.
     Only if 'parent_folder' is specified, it is relative to that folder.
     The parent_folder can be a PF container object or a string:
@@ -61,21 +92,40 @@ class PFBaseInterface:
     Note that you can also use r" at the beginning of the string
     argument to use single "\".  
 
+    If the path cache is enabled (see 'enable_path_cache'), the objects
+    found are cached and repeated lookups of the same path are served
+    from the cache. If the object index is enabled (see 'enable_object_index'),
+    paths relative to the active project are resolved using the index.
+
     See also method 'get_single_obj'
     """
-    if not parent_folder:
-      parent_folder = self.get_active_project()
+    cache_key = (parent_folder,path,include_subfolders)
+    if self.path_cache:
+      obj = self.path_cache.get(cache_key)
     else:
-      parent_folder=self.handle_single_pf_object_or_path_input(parent_folder)  
-    if not include_subfolders:
-      try:  
-        obj = parent_folder.GetContents(path)
-      except(RuntimeError):
-        raise TypeError("Path must be of type string.")
-    else:
-      obj = self.handle_inclusion_of_subfolders(path,parent_folder,error_if_non_existent)
+      obj = None
+    if not obj and self.object_index and isinstance(path,str) and (
+      not parent_folder or isinstance(parent_folder,str)):
+      obj = self.object_index.get_obj(path,parent_path=parent_folder,
+        include_subfolders=include_subfolders)
+      if obj and self.path_cache:
+        self.path_cache.put(cache_key,obj)
     if not obj:
-      return self.handle_non_existing_obj(path,parent_folder,error_if_non_existent)
+      if not parent_folder:
+        parent_folder = self.get_active_project()
+      else:
+        parent_folder=self.handle_single_pf_object_or_path_input(parent_folder)  
+      if not include_subfolders:
+        try:  
+          obj = parent_folder.GetContents(path)
+        except(RuntimeError):
+          raise TypeError("Path must be of type string.")
+      else:
+        obj = self.handle_inclusion_of_subfolders(path,parent_folder,error_if_non_existent)
+      if not obj:
+        return self.handle_non_existing_obj(path,parent_folder,error_if_non_existent)
+      if self.path_cache:
+        self.path_cache.put(cache_key,obj)
     if condition:
       obj_with_condition = self.get_by_condition(obj,condition)
       if obj_with_condition:
@@ -85,13 +135,78 @@ class PFBaseInterface:
     else:
       return obj    
 
+  def iter_obj(self,path,condition=None,parent_folder=None,order="dfs",prune=None,
+    max_depth=None,limit=None):
+    """Generator that walks the folders below the folder(s) of 'path' and
+    yields the objects matching the last segment of 'path' as they are
+    found (like 'get_obj' with 'include_subfolders=True', but without
+    reading all objects into a list first).
+    Arguments:
+      path: path whose last segment (can contain wildcards) is searched
+        for in all subfolders, e.g. "Network Model\\Network Data\\*.ElmTerm"
+      condition, parent_folder: see 'get_obj'
+      order: "dfs" (depth-first, default, needs less memory) or "bfs"
+        (breadth-first, objects closer to the folder are yielded first)
+      prune: function that is called for every object before its contents
+        are searched. If it returns True, the contents are skipped
+        (the object itself can still be yielded).
+      max_depth: maximum depth of the yielded objects below the folder
+        (1: only the contents of the folder)
+      limit: maximum number of objects to yield
+
+    One 'GetContents' call is made per visited object (the contents are
+    matched against the last segment of 'path' in Python and reused to 
+    descend), so use 'prune' and 'max_depth' to skip objects that cannot
+    contain matches.
+
+    Example (first 10 terminals with 110 kV, without searching in the
+    terminals themselves):
+      for terminal in pfbi.iter_obj("Network Model\\Network Data\\*.ElmTerm",
+        condition=Attr("uknom") == 110,limit=10,
+        prune=lambda x: x.GetClassName() == "ElmTerm"):
+        ...
+    """
+    if order not in ("dfs","bfs"):
+      raise ValueError("'order' must be 'dfs' or 'bfs'.")
+    if limit is not None and limit < 1:
+      return
+    head,tail = ntpath.split(path)
+    if head:
+      folders = self.get_obj(head,parent_folder=parent_folder)
+    elif parent_folder:
+      folders = [self.handle_single_pf_object_or_path_input(parent_folder)]
+    else:
+      folders = [self.get_active_project()]
+    matches_tail = PFStringManipuilation.get_name_matcher(tail)
+    pending = deque((folder,1) for folder in folders)
+    get_next = pending.pop if order == "dfs" else pending.popleft
+    if order == "dfs":
+      pending.reverse()
+    number_of_objects = 0
+    while pending:
+      folder,depth = get_next()
+      contents = folder.GetContents()
+      matches = [obj for obj in contents if matches_tail(obj)]
+      if matches and condition:
+        matches = self.get_by_condition(matches,condition)
+      for obj in matches:
+        yield obj
+        number_of_objects += 1
+        if number_of_objects == limit:
+          return
+      if max_depth is None or depth < max_depth:
+        children = [child for child in contents if not (prune and prune(child))]
+        if order == "dfs":
+          children.reverse()
+        pending.extend((child,depth+1) for child in children)
+
   def handle_inclusion_of_subfolders(self,path,parent_folder,error_if_non_existent):
     """If subfolders are included, 'GetChildren' must
     be used instead of 'GetContents'. 'GetChildren'
     requires the input to be splitted between path and object name.
     """
     try:
-      head,tail = os_path.split(path)
+      head,tail = ntpath.split(path)
     except(TypeError):
       raise TypeError("Path must be of type string")  
     if head:
@@ -165,7 +280,7 @@ class PFBaseInterface:
     if not error_if_non_existent:
       return []
     else:
-      head,tail = os_path.split(path)
+      head,tail = ntpath.split(path)
       raise powfacpy.PFNonExistingObjectError(obj[0].GetParent(),tail,condition=True)
 
   def get_first_level_folder(self,folder):
@@ -188,30 +303,61 @@ class PFBaseInterface:
     If 'return_info' is True, information about where the path is
     corrupted is returned. 
     """
-    if not parent:
-      parent = self.get_active_project()
-    else:
-      parent = self.handle_single_pf_object_or_path_input(parent)
+    if (self.object_index and not return_info and isinstance(path,str) 
+      and (not parent or isinstance(parent,str)) and path[:1] != "\\"):
+      if self.object_index.exists(path,parent_path=parent):
+        return True
     splitted_path = path.split('\\')
     if path[0] == "\\" or not splitted_path:
       raise powfacpy.PFPathInputError(path)
+    resolved_objects = self._resolve_path_segments(splitted_path,parent)
+    if len(resolved_objects) == len(splitted_path):
+      return True
+    if not return_info:
+      return False
     existing_path=""
-    child = parent
-    for child_name in splitted_path:
-      child = child.GetContents(f"{child_name}")
-      if child:
+    for child in resolved_objects:
+      existing_path = f"{existing_path}\\{child.loc_name}"
+    parent_path = self._get_parent_folder_obj(parent).GetFullName()
+    parent_path = PFStringManipuilation.delete_classes(parent_path)
+    existing_path = f"{parent_path}{existing_path}" 
+    non_existent_child_name = splitted_path[len(resolved_objects)]
+    return False,existing_path,non_existent_child_name
+
+  def _get_parent_folder_obj(self,parent_folder):
+    """Returns the active project if 'parent_folder' is None, else
+    the PF object of 'parent_folder' (object or path).
+    """
+    if not parent_folder:
+      return self.get_active_project()
+    return self.handle_single_pf_object_or_path_input(parent_folder)
+
+  def _resolve_path_segments(self,segments,parent_folder):
+    """Resolves the segments of a path (relative to 'parent_folder') one
+    after another and returns the list of objects found. The list is 
+    shorter than 'segments' if a segment does not exist.
+    If the path cache is enabled, resolved segments are stored in its 
+    folder trie, so that each segment is only resolved once.
+    """
+    if self.path_cache:
+      resolved_objects = self.path_cache.folders.resolve(parent_folder,segments)
+    else:
+      resolved_objects = []
+    number_of_cached_objects = len(resolved_objects)
+    if number_of_cached_objects < len(segments):
+      if resolved_objects:
+        child = resolved_objects[-1]
+      else:
+        child = self._get_parent_folder_obj(parent_folder)
+      for child_name in segments[number_of_cached_objects:]:
+        child = child.GetContents(f"{child_name}")
+        if not child:
+          break
         child = child[0]
-        existing_path = f"{existing_path}\{child.loc_name}"
-      else: 
-        if not return_info:
-          return False
-        else:
-          parent_path = parent.GetFullName()
-          parent_path = PFStringManipuilation.delete_classes(parent_path)
-          existing_path = f"{parent_path}{existing_path}" 
-          non_existent_child_name = child_name
-          return False,existing_path,non_existent_child_name
-    return True    
+        resolved_objects.append(child)
+      if self.path_cache and len(resolved_objects) > number_of_cached_objects:
+        self.path_cache.folders.insert(parent_folder,segments,resolved_objects)
+    return resolved_objects
 
   def get_active_project(self):
     """Returns the currently active project and throws an
@@ -223,6 +369,109 @@ class PFBaseInterface:
     else:
       raise powfacpy.PFNotActiveError("a project")
 
+  def activate_project(self,path):
+    """Activates the project under 'path' (see 'app.ActivateProject')
+    and returns the project. 
+    Use this method instead of 'app.ActivateProject' if the path cache is
+    enabled, because the cache is cleared here.
+    """
+    self.clear_path_cache()
+    self.app.ActivateProject(path)
+    project = self.get_active_project()
+    if self.object_index:
+      self.object_index.rebuild(project)
+    return project
+
+  def invalidate_results(self):
+    """Marks the results of all results objects as changed (e.g. after a
+    simulation is run), so that open results sessions of all interfaces 
+    load their results objects again and do not use stamps of the results
+    cache that were computed from the previous results (see 
+    'PFResultsSession'). Called by 'PFDynSimInterface.initialize_sim' and
+    'PFDynSimInterface.run_sim'.
+    """
+    PFBaseInterface.results_version += 1
+
+  def enable_object_index(self):
+    """Builds an index of all objects of the active project (see 
+    'PFObjectIndex') that is used by 'get_obj', 'path_exists' and
+    'get_upstream_obj' to avoid walking the database.
+    The index is updated when objects are created, deleted, copied or
+    renamed with powfacpy methods and rebuilt when a project is activated
+    with 'activate_project'.
+
+    Warning: Objects that are created or renamed otherwise (directly with
+    the PF API, e.g. 'CreateObject', or in the GUI) are not in the index.
+    The database is only searched if the index returns no object, so these
+    objects are silently missing from the results of paths with wildcards
+    that match other (indexed) objects. Use 'object_index.update(folder)' 
+    or 'object_index.rebuild()' after such changes.
+    """
+    self.object_index = PFObjectIndex(self.get_active_project())
+    return self.object_index
+
+  def disable_object_index(self):
+    """Disables (and discards) the object index.
+    """
+    self.object_index = None
+
+  def enable_instrumentation(self):
+    """Wraps the PF app in a proxy that counts the calls of every PF API 
+    method, measures their latency and attributes them to the powfacpy
+    method that issued them (see module 'instrumentation'). The PF objects
+    returned by the app are wrapped as well.
+    Returns the statistics (PFAPIStatistics), which are also available as 
+    attribute 'api_statistics'.
+
+    Example:
+      pfbi.enable_instrumentation()
+      pfbi.get_obj("Network Model\\Network Data\\Grid\\*.ElmTerm")
+      pfbi.api_statistics.to_json("api_calls.json")
+    """
+    if self.api_statistics is None:
+      self.api_statistics = PFAPIStatistics()
+    if not isinstance(self.app,PFInstrumentedObject):
+      self.app = PFInstrumentedObject(self.app,self.api_statistics)
+    return self.api_statistics
+
+  def disable_instrumentation(self):
+    """Unwraps the PF app (the statistics are kept in 'api_statistics').
+    Objects that were obtained while the instrumentation was enabled still
+    record their calls.
+    """
+    self.app = unwrap(self.app)
+
+  def enable_path_cache(self,max_size=1024):
+    """Enables the cache for path lookups (see 'get_obj'). The 'max_size'
+    most recently used lookups are cached.
+    The cache is cleared automatically when objects are created, deleted 
+    or copied with powfacpy methods and when a project is activated with
+    'activate_project'. If the database is changed otherwise (e.g. with 
+    'app.ActivateProject' or 'Delete()'), use 'clear_path_cache'. 
+    """
+    self.path_cache = PFPathCache(max_size)
+
+  def disable_path_cache(self):
+    """Disables (and discards) the cache for path lookups.
+    """
+    self.path_cache = None
+
+  def clear_path_cache(self,folders=True):
+    """Discards all entries of the path cache (if enabled).
+    If 'folders' is False, the resolved folders (see '_resolve_path_segments')
+    are kept.
+    """
+    if self.path_cache:
+      self.path_cache.clear(folders=folders)
+
+  def get_path_cache_info(self):
+    """Returns the hit/miss statistics of the path cache (PFCacheInfo)
+    or None if the cache is disabled.
+    """
+    if self.path_cache:
+      return self.path_cache.info()
+    return None
+
   def get_active_user_folder(self):
     """Return the folder of the active user.
     """
@@ -244,9 +493,14 @@ class PFBaseInterface:
   def get_by_condition(self,objects,condition):
     """From a list of objects, get those for whom the 'condition' 
     (which is a function) returns 'True'.
+    The condition can also be a declarative condition (see 'Attr'), which
+    is evaluated for all objects at once.
     Example:
       pfbi.get_by_condition(list_of_objects,lambda x : getattr(x,"uknom")==110)
+      pfbi.get_by_condition(list_of_objects,Attr("uknom") == 110)
     """
+    if hasattr(condition,"filter_objects"):
+      return condition.filter_objects(objects,self)
     objects_true = []
     for obj in objects:
       try:
@@ -289,8 +543,197 @@ class PFBaseInterface:
     except(AttributeError) as e:
       raise powfacpy.PFAttributeError(obj,e,self)
 
+  def get_attr_table(self,obj_or_path,attributes,condition=None,parent_folder=None,
+    include_subfolders=False,as_dataframe=True,error_if_non_existent=True):
+    """Reads the attributes of many objects and returns them as a table
+    with one row per object and one column per attribute.
+    Arguments:
+      obj_or_path: list of PF objects or a path (can contain wildcards,
+        see 'get_obj')
+      attributes: list of attribute names
+      condition, parent_folder, include_subfolders, error_if_non_existent: 
+        see 'get_obj' (if 'error_if_non_existent' is False, an empty table
+        is returned if no object matches the path)
+      as_dataframe: If True, a pandas DataFrame indexed by the object paths
+        is returned. Otherwise a NumPy structured array with the field 'path'
+        and one field per attribute is returned.
+
+    The columns are typed (int, float or bool if all values of an attribute 
+    are of such a type, otherwise object/str).
+
+    Example:
+      pfbi.get_attr_table("Network Model\\Network Data\\Grid\\*.ElmTerm",
+        ["uknom","outserv"])
+
+    See also 'iter_attr_table' for reading the table in chunks.
+    """
+    return next(self.iter_attr_table(obj_or_path,attributes,chunk_size=None,
+      condition=condition,parent_folder=parent_folder,
+      include_subfolders=include_subfolders,as_dataframe=as_dataframe,
+      error_if_non_existent=error_if_non_existent))
+
+  def iter_attr_table(self,obj_or_path,attributes,chunk_size=10000,condition=None,
+    parent_folder=None,include_subfolders=False,as_dataframe=True,
+    error_if_non_existent=True):
+    """Generator that reads the attributes of many objects and yields
+    tables (see 'get_attr_table') with at most 'chunk_size' rows.
+    If 'chunk_size' is None, all rows are yielded in one table.
+    """
+    objects = self.handle_pf_object_or_path_input(obj_or_path,
+      condition=condition,
+      parent_folder=parent_folder,
+      error_if_non_existent=error_if_non_existent,
+      include_subfolders=include_subfolders)
+    if isinstance(attributes,str):
+      attributes = [attributes]
+    if not chunk_size:
+      chunk_size = max(len(objects),1)
+    for start in range(0,max(len(objects),1),chunk_size):
+      chunk = objects[start:start+chunk_size]
+      columns = self.get_attr_arrays(chunk,attributes)
+      paths = PFStringManipuilation.format_full_paths([str(obj) for obj in chunk],self)
+      yield PFBaseInterface._create_table(paths,attributes,
+        [columns[attr] for attr in attributes],as_dataframe)
+
+  def get_attr_arrays(self,objects,attributes):
+    """Reads the attributes of a list of objects in a single pass and 
+    returns a dictionary {attribute: NumPy array of values}. The arrays
+    are typed (see 'get_attr_table').
+    """
+    columns = [[None]*len(objects) for _ in attributes]
+    for row,obj in enumerate(objects):
+      try:
+        for col,attr in enumerate(attributes):
+          columns[col][row] = obj.GetAttribute(attr)
+      except(AttributeError) as e:
+        raise powfacpy.PFAttributeError(obj,e,self)
+    return {attr:PFBaseInterface._get_typed_array(values) 
+      for attr,values in zip(attributes,columns)}
+
+  @staticmethod
+  def _create_table(paths,attributes,arrays,as_dataframe):
+    """Creates a DataFrame or a NumPy structured array from arrays of
+    column values.
+    """
+    import numpy as np
+    if as_dataframe:
+      import pandas
+      return pandas.DataFrame(dict(zip(attributes,arrays)),
+        index=pandas.Index(paths,name="path"),columns=attributes)
+    path_length = max((len(path) for path in paths),default=1)
+    dtype = [("path",f"U{path_length}")]
+    for attr,array in zip(attributes,arrays):
+      if array.dtype == object and all(isinstance(v,str) for v in array):
+        array_dtype = f"U{max((len(v) for v in array),default=1)}"
+      else:
+        array_dtype = array.dtype
+      dtype.append((attr,array_dtype))
+    table = np.empty(len(paths),dtype=dtype)
+    table["path"] = paths
+    for attr,array in zip(attributes,arrays):
+      table[attr] = array
+    return table
+
+  @staticmethod
+  def _get_typed_array(values):
+    """Returns a NumPy array of the values with dtype bool, int64 or float64
+    if all values are of such a type, else with dtype object.
+    """
+    import numpy as np
+    types = set(map(type,values))
+    if types and types <= {bool}:
+      return np.array(values,dtype=bool)
+    elif types and types <= {int,bool}:
+      return np.array(values,dtype=np.int64)
+    elif types and types <= {int,float,bool}:
+      return np.array(values,dtype=np.float64)
+    array = np.empty(len(values),dtype=object)
+    array[:] = values
+    return array
+
+  def snapshot(self,file_path,classes=None,attributes=None,file_format=None):
+    """Walks the active project once and writes a columnar snapshot with
+    one table per class (columns 'path', 'full_name', 'parent' and the
+    attributes) that can be queried without PowerFactory (see 'PFSnapshot').
+    Arguments:
+      file_path: directory (Parquet, one file per class) or npz file
+      classes: list of class names (default: the keys of 'attributes')
+      attributes: dictionary {class name: list of attributes} or a list
+        of attributes that is used for all classes
+      file_format: "parquet" or "npz" (default: "parquet" if pyarrow is
+        installed and 'file_path' does not end with ".npz")
+    Returns the file format used.
+
+    Example:
+      pfbi.snapshot("network.snapshot",attributes={
+        "ElmTerm":["uknom","outserv"],"ElmLne":["dline","bus1"]})
+      snapshot = powfacpy.PFSnapshot("network.snapshot")
+      snapshot.get_obj("Network Model\\Network Data\\*\\*.ElmTerm")
+
+    References to PF objects are stored as their paths, other values that
+    are not numbers are stored as strings.
+    """
+    from powfacpy.snapshot import write_snapshot
+    if attributes is None:
+      attributes = {}
+    if classes is None:
+      if not isinstance(attributes,dict):
+        raise TypeError("Please specify 'classes' if 'attributes' is not a dictionary.")
+      classes = list(attributes)
+    if not isinstance(attributes,dict):
+      attributes = {class_name:list(attributes) for class_name in classes}
+    project = self.get_active_project()
+    objects_by_class = {class_name:[] for class_name in classes}
+    full_names_by_class = {class_name:[] for class_name in classes}
+    for obj in project.GetChildren(1,"*",1):
+      full_name = obj.GetFullName()
+      class_name = full_name.rpartition(".")[2]
+      if class_name in objects_by_class:
+        objects_by_class[class_name].append(obj)
+        full_names_by_class[class_name].append(full_name)
+    project_prefix = PFStringManipuilation.get_project_prefix(self)
+    tables = {}
+    for class_name in classes:
+      full_names = full_names_by_class[class_name]
+      paths = PFStringManipuilation.format_full_paths(full_names,self)
+      table = {
+        "path":PFBaseInterface._get_string_array(paths),
+        "full_name":PFBaseInterface._get_string_array([name[name.find(project_prefix)
+          +len(project_prefix):] for name in full_names]),
+        "parent":PFBaseInterface._get_string_array([path.rpartition("\\")[0]
+          for path in paths]),
+      }
+      columns = self.get_attr_arrays(objects_by_class[class_name],
+        attributes.get(class_name,[]))
+      for attr,array in columns.items():
+        table[attr] = self._get_storable_array(array)
+      tables[class_name] = table
+    return write_snapshot(file_path,tables,file_format=file_format)
+
+  def _get_storable_array(self,array):
+    """Converts an object array of attribute values to an array that can
+    be stored without pickling (floats with NaN for None if all values
+    are numbers, else strings with paths for PF objects).
+    """
+    import numpy as np
+    if array.dtype != object:
+      return array
+    values = array.tolist()
+    if all(v is None or type(v) in (int,float,bool) for v in values):
+      return np.array([np.nan if v is None else v for v in values],dtype=np.float64)
+    pf_objects = [v for v in values if hasattr(v,"GetFullName")]
+    paths = dict(zip(map(id,pf_objects),
+      PFStringManipuilation.format_full_paths([str(v) for v in pf_objects],self)))
+    return PFBaseInterface._get_string_array([paths[id(v)] if id(v) in paths
+      else "" if v is None else str(v) for v in values])
+
+  @staticmethod
+  def _get_string_array(values):
+    import numpy as np
+    return np.array(values,dtype=f"U{max((len(v) for v in values),default=1)}")
+
   def get_attr_by_path(self,path_with_attr):
-    head_tail = os_path.split(path_with_attr)
+    head_tail = ntpath.split(path_with_attr)
     return self.get_attr(head_tail[0],head_tail[1])
 
   def set_attr(self,obj,params,parent_folder=None):
@@ -300,7 +743,12 @@ class PFBaseInterface:
     If 'parent_folder' is specified, the path is relative to 
     this folder.
     params: dictionary {parameter1:value1, parameter2:value2,..}.
+    Inside 'batch_writes', the attributes are not set immediately but
+    queued until the end of the batch.
     """
+    if self.write_batch:
+      self.write_batch.add(obj,params,parent_folder=parent_folder)
+      return
     if isinstance(obj,str):
       obj = self.get_single_obj(obj,parent_folder=parent_folder)
     for attr, value in params.items():
@@ -310,6 +758,16 @@ class PFBaseInterface:
         raise powfacpy.PFAttributeTypeError(obj,attr,e,self)
       except(AttributeError) as e:
         raise powfacpy.PFAttributeError(obj,e,self)
+    if "loc_name" in params:
+      self._handle_renamed_objects([obj])
+
+  def _handle_renamed_objects(self,objects):
+    """Renamed objects invalidate cached paths and the object index.
+    """
+    self.clear_path_cache()
+    if self.object_index:
+      for obj in objects:
+        self.object_index.update(obj.GetParent())
 
   def set_attr_by_path(self,path_with_attr,value):
     """
@@ -319,9 +777,38 @@ class PFBaseInterface:
         "Library\\Dynamic Models\\Linear_interpolation\\desc",["description"])
       Here 'desc' is the name of the attribute.  
     """
-    head_tail = os_path.split(path_with_attr)
+    head_tail = ntpath.split(path_with_attr)
     self.set_attr(head_tail[0],{head_tail[1]:value})
 
+  @contextmanager
+  def batch_writes(self,use_write_cache=True):
+    """Context manager that queues all writes of 'set_attr' and 
+    'set_attr_by_path' and sets the attributes at the end of the 
+    'with' block. Each object path is resolved only once and repeated 
+    writes to the same attribute are coalesced (only the last value is set).
+    If 'use_write_cache' is True, the write cache of PowerFactory is
+    used while flushing (if available in the PF version).
+    If an exception is raised inside the block, the queued writes are 
+    discarded. Nested batches are merged into the outermost batch.
+    Note that 'get_attr' returns the old values until the batch is flushed.
+
+    Example:
+      with pfbi.batch_writes() as batch:
+        pfbi.set_attr_by_path("Network Model\\Network Data\\Grid\\Load\\plini",2)
+        pfbi.set_attr_by_path("Network Model\\Network Data\\Grid\\Load\\plini",3)
+      print(batch.coalesced_writes) # 1
+    """
+    if self.write_batch:
+      yield self.write_batch
+      return
+    batch = PFWriteBatch(self,use_write_cache=use_write_cache)
+    self.write_batch = batch
+    try:
+      yield batch
+    finally:
+      self.write_batch = None
+    batch.flush()
+
   def create_by_path(self,path,overwrite=True):
     """Create an object by specifying its path including its class and return the object.
     If overwrite is true, objects with the same name will be overwritten.
@@ -350,12 +837,19 @@ class PFBaseInterface:
     except(AttributeError):
       raise TypeError("The argument 'obj' must be of type string.")
     if overwrite:
-      self.delete_obj(obj,parent_folder=folder,error_if_non_existent=False)
+      # Collect all existing objects with the name and delete them in one batch
+      existing_objs = self.get_obj(obj,parent_folder=folder,error_if_non_existent=False)
+      if existing_objs:
+        self.delete_objects(existing_objs)
     elif use_existing:
       existing_obj = self.get_single_obj(obj,parent_folder=folder,error_if_non_existent=False)
       if existing_obj:
         return existing_obj 
-    return folder.CreateObject(class_name, obj_name)
+    self.clear_path_cache(folders=False)
+    new_obj = folder.CreateObject(class_name, obj_name)
+    if self.object_index and new_obj:
+      self.object_index.add(new_obj)
+    return new_obj
 
   def create_directory(self,directory,parent_folder=None):
     """Create a directory of folders ('IntFolder') if the 
@@ -366,21 +860,24 @@ class PFBaseInterface:
         is used.
 
     Returns the folder in the lowest subdirectory.  
+
+    Only the missing part of the directory is created (the existing part is
+    resolved segment by segment, see '_resolve_path_segments').
     """
-    if not self.path_exists(directory,parent=parent_folder):
-      if parent_folder:
-        folder = parent_folder
-      else:
-        folder = self.app.GetActiveProject()
-      folder_names = directory.split("\\")
-      for folder_name in folder_names:
-        if not self.path_exists(folder_name,parent=folder):
-          folder = self.create_in_folder(folder,folder_name+".IntFolder")
-        else:
-          folder = self.get_single_obj(folder_name,parent_folder=folder)
-      return folder     
+    folder_names = directory.split("\\")
+    folders = self._resolve_path_segments(folder_names,parent_folder)
+    if len(folders) == len(folder_names):
+      return folders[-1]
+    if folders:
+      folder = folders[-1]
     else:
-      return self.get_single_obj(directory,parent_folder=parent_folder)      
+      folder = self._get_parent_folder_obj(parent_folder)
+    for folder_name in folder_names[len(folders):]:
+      folder = self.create_in_folder(folder,folder_name+".IntFolder",overwrite=False)
+      folders.append(folder)
+    if self.path_cache:
+      self.path_cache.folders.insert(parent_folder,folder_names,folders)
+    return folder     
          
   def delete_obj(self,obj_or_path,condition=None,parent_folder=None,error_if_non_existent=True,
     include_subfolders=False):
@@ -389,36 +886,77 @@ class PFBaseInterface:
     arguments, see the `get_obj` method. 
     It is also checked whether the object was really deleted, otherwise it is tried
     to deactivate the object and then delete it.
+    See also 'delete_objects'.
     """
     obj = self.handle_pf_object_or_path_input(obj_or_path,
       condition=condition,
       parent_folder=parent_folder,
       error_if_non_existent=error_if_non_existent,
       include_subfolders=include_subfolders)
-    for o in obj:
-      success = o.Delete()
-      """
-      if not success == 0:
+    self.delete_objects(obj)
+
+  def delete_objects(self,objects):
+    """Deletes a list of PF objects in one batch:
+      - Objects inside other objects of the list are skipped, because
+        they are deleted together with their parents.
+      - The active study case, scenario and variations are deactivated
+        if they are deleted (or inside a deleted object). They are only
+        looked up if one of the objects is of a class that can contain
+        them (see 'CLASSES_CONTAINING_ACTIVE_OBJECTS').
+      - All objects are deleted and then checked in one sweep whether they
+        were really deleted. For objects that were not deleted, deactivation
+        and deletion is retried.
+    """
+    objects = list(objects)
+    if not objects:
+      return
+    full_names = [o.GetFullName() for o in objects]
+    names_set = set(full_names)
+    top_level_objects = []
+    top_level_names = set()
+    for o,full_name in zip(objects,full_names):
+      # Skip objects whose parent (or grandparent..) is deleted anyway
+      parent_name = full_name.rpartition("\\")[0]
+      while parent_name and parent_name not in names_set:
+        parent_name = parent_name.rpartition("\\")[0]
+      if not parent_name and full_name not in top_level_names:
+        top_level_objects.append(o)
+        top_level_names.add(full_name)
+    if any(o.GetClassName() in CLASSES_CONTAINING_ACTIVE_OBJECTS for o in top_level_objects):
+      self._deactivate_objects_to_be_deleted(top_level_names)
+    self.clear_path_cache()
+    for o in top_level_objects:
+      if self.object_index:
+        self.object_index.remove(o)
+      o.Delete()
+    # 'IsDeleted' seems to be the savest way to check whether an object has been deleted.
+    # Due to a PF bug, 'Delete' returns 0 even if it was not successful (e.g. for
+    # study cases).
+    not_deleted_objects = [o for o in top_level_objects if not o.IsDeleted()]
+    for o in not_deleted_objects:
+      try:
         o.Deactivate()
         o.Delete()
-      # Due to a PF bug, study cases need special treatment.
-      # Here, Delete() returns 0 even if it was not successful.  
-      elif o.GetClassName() == "IntCase":
-        try:
-          o.Deactivate()
-          o.Delete()
-        except:
-          pass  
-      """
-      # 'IsDeleted' seems to be the savest way to check whether an object has been deleted. 
-      if not o.IsDeleted():
-        try:
-          o.Deactivate()
-          o.Delete()
-        except:
-          raise ArgumentError(r"Object {o} cannot be deleted.")
-        if not o.IsDeleted():  
-          raise ArgumentError(r"Object {o} cannot be deleted.")
+      except:
+        raise ArgumentError(None,f"Object {o} cannot be deleted.")
+      if not o.IsDeleted():  
+        raise ArgumentError(None,f"Object {o} cannot be deleted.")
+
+  def _deactivate_objects_to_be_deleted(self,full_names_to_be_deleted):
+    """Deactivates the active study case, scenario and variations if they or
+    one of their parents are going to be deleted.
+    """
+    active_objects = [self.app.GetActiveStudyCase(),self.app.GetActiveScenario()]
+    if hasattr(self.app,"GetActiveNetworkVariations"):
+      active_objects.extend(self.app.GetActiveNetworkVariations())
+    for active_obj in active_objects:
+      if not active_obj:
+        continue
+      full_name = active_obj.GetFullName()
+      while full_name and full_name not in full_names_to_be_deleted:
+        full_name = full_name.rpartition("\\")[0]
+      if full_name:
+        active_obj.Deactivate()
 
   def handle_pf_object_or_path_input(self,obj_or_path,condition=None,parent_folder=None,
     error_if_non_existent=True,include_subfolders=False):
@@ -509,10 +1047,19 @@ class PFBaseInterface:
       include_subfolders=include_subfolders)
     target_folder = self.handle_single_pf_object_or_path_input(target_folder)
     if overwrite:
-      for object_to_be_copied in obj:
-        self.delete_obj(object_to_be_copied.GetAttribute("loc_name"),
-          parent_folder=target_folder,error_if_non_existent=False)
+      if len(obj) > 1:
+        # Get the contents of the target folder once instead of once per object
+        names = {object_to_be_copied.GetAttribute("loc_name") for object_to_be_copied in obj}
+        self.delete_objects([o for o in target_folder.GetContents() 
+          if o.GetAttribute("loc_name") in names])
+      else:
+        for object_to_be_copied in obj:
+          self.delete_obj(object_to_be_copied.GetAttribute("loc_name"),
+            parent_folder=target_folder,error_if_non_existent=False)
+    self.clear_path_cache(folders=False)
     target_folder.AddCopy(obj)
+    if self.object_index:
+      self.object_index.update(target_folder)
     if isinstance(obj,Iterable):
       return obj
     else:
@@ -545,10 +1092,14 @@ class PFBaseInterface:
       else:
         self.delete_obj(f"{new_name}.*",
           parent_folder=target_folder,error_if_non_existent=False)
+    self.clear_path_cache(folders=False)
     if new_name: 
-      return target_folder.AddCopy(obj,new_name)
+      copied_obj = target_folder.AddCopy(obj,new_name)
     else:
-      return target_folder.AddCopy(obj)
+      copied_obj = target_folder.AddCopy(obj)
+    if self.object_index and copied_obj:
+      self.object_index.add(copied_obj)
+    return copied_obj
   
   def is_container(self,obj):
     """Checks whether a PF object is a container. It is assumed
@@ -564,9 +1115,12 @@ class PFBaseInterface:
     study_case.Activate()
     return study_case
 
-  def add_results_variable(self,obj,variables,results_obj=None):
+  def add_results_variable(self,obj,variables,results_obj=None,load_elmres=True):
     """Adds variables of the object to the PowerFactory results object (ElmRes)
     obj: PowerFactory object or its path
+    load_elmres: If False, the results object is not loaded after adding
+      the variables (e.g. if variables of many objects are added before 
+      a simulation).
     """
     if not results_obj:
       results_obj_name = powfacpy.PFTranslator.get_default_result_object_name(self.language)
@@ -578,7 +1132,8 @@ class PFBaseInterface:
       variables = [variables]
     for var in variables:
       results_obj.AddVariable(obj,var)
-    results_obj.Load()
+    if load_elmres:
+      results_obj.Load()
     return results_obj
 
   def clear_elmres_from_objects_with_status_deleted(self,results_obj=None):
@@ -606,7 +1161,8 @@ class PFBaseInterface:
     results_obj=None,
     results_variables_lists=None,
     column_separator=',',
-    decimal_separator='.'
+    decimal_separator='.',
+    header_map=False
     ):
       """Exports simulation results to csv.
       Arguments:
@@ -618,6 +1174,8 @@ class PFBaseInterface:
         results_variables_lists: Lists of results variables (PFResultVariable) that 
           are added to ComRes if only selected variables should be exported. Note
           that results_obj is ignored if results_variables_lists is specified.
+        header_map: If True, the header of the exported csv file is not
+          rewritten, but written to a separate file (see 'format_csv_for_elmres').
       """
       comres = self.app.GetFromStudyCase("ComRes")
       if not results_obj:
@@ -651,7 +1209,7 @@ class PFBaseInterface:
       # If the result object(s) are ElmRes, the the csv file is formated.
       if (comres.pResult and comres.pResult.GetClassName() == "ElmRes") or (results_variables_lists and results_variables_lists.result_objects[0].GetClassName() == "ElmRes"):
         try:
-          self.format_csv_for_elmres(path)
+          self.format_csv_for_elmres(path,header_map=header_map)
         except(IndexError):
           raise Exception(f"Is the file \n" 
             f"'{path}' \nopen in another program?")
@@ -714,13 +1272,19 @@ class PFBaseInterface:
         row = read_file.readline()  
     replace(file_path + ".temp",file_path)  
 
-  def format_csv_for_elmres(self,file_path):
+  def format_csv_for_elmres(self,file_path,header_map=False):
     """Format the csv file that is exported from PF.
     The PF exported csv uses the first row for the full path 
     of the object and the second row for the variable name.
     The formated csv file uses only the first row as a header.
     This row contains the path of the object and the variable name
     without description.
+    Only the header is converted; the data rows are copied in large blocks
+    (without reading them line by line).
+    Arguments:
+      header_map: If True, the csv file is not changed (no copy of the 
+        data) and the formated headers are written to the JSON file
+        '<file_path>.header.json' instead (see 'read_elmres_csv').
 
     Example first row of some column before formating: 
       '\\username.IntUser\\powfacpy_base.IntPrj\\Network Model.IntPrjfolder\\Network Data.IntPrjfolder\\Grid.ElmNet\\AC Voltage Source.ElmVac\\s:u0'
@@ -729,22 +1293,64 @@ class PFBaseInterface:
     Example first row of the column after formating:
       'Network Model\\Network Data\\Grid\\AC Voltage Source\\s:u0'
     """
-    with open(file_path) as read_file, open(file_path + ".temp", "w") as write_file:
-      full_paths = read_file.readline().split(",")
-      variables = read_file.readline().split(",")
-      for col,path in enumerate(full_paths):
-          if col > 0:
-              formated_path = powfacpy.PFStringManipuilation.format_full_path(path,self)
-              variable_name = variables[col].split(" ", 1)[0].replace("\"","").replace("\n","") # get rid of description and quotation marks
-              row = row + formated_path + "\\" + variable_name + "," # consistently add headers to row
-          else:
-              row = "Time," # Header of first column
-      write_file.write(row+"\n")
-      # Write remaining data rows until end of file is reached
-      while row:
-          row = read_file.readline()
-          write_file.write(row)
-    replace(file_path + ".temp",file_path)  
+    encoding = locale.getpreferredencoding(False)
+    with open(file_path,"rb") as read_file:
+      full_paths_row = read_file.readline()
+      variables_row = read_file.readline()
+      columns = self._get_formated_elmres_csv_columns(
+        full_paths_row.decode(encoding),variables_row.decode(encoding))
+      if header_map:
+        with open(file_path + HEADER_MAP_SUFFIX,"w") as header_map_file:
+          json.dump({"columns":columns,"header_rows":2},header_map_file)
+        return
+      newline = b"\r\n" if full_paths_row.endswith(b"\r\n") else b"\n"
+      with open(file_path + ".temp","wb") as write_file:
+        write_file.write("".join(column + "," for column in columns).encode(encoding) + newline)
+        shutil.copyfileobj(read_file,write_file,CSV_COPY_BUFFER_SIZE)
+    replace(file_path + ".temp",file_path)
+    if os.path.exists(file_path + HEADER_MAP_SUFFIX):
+      os.remove(file_path + HEADER_MAP_SUFFIX) # header map of a previous export
+
+  def _get_formated_elmres_csv_columns(self,full_paths_row,variables_row):
+    """Returns the formated column names ("Time" and path of the object
+    with variable name) of the first two rows of a csv file exported from PF.
+    """
+    full_paths = full_paths_row.split(",")[1:]
+    variables = variables_row.split(",")[1:]
+    formated_paths = powfacpy.PFStringManipuilation.format_full_paths(full_paths,self)
+    columns = ["Time"]
+    for formated_path,variable in zip(formated_paths,variables):
+      # get rid of description, quotation marks and line breaks
+      variable_name = variable.split(" ",1)[0].replace("\"","").rstrip("\r\n")
+      columns.append(formated_path + "\\" + variable_name)
+    return columns
+
+  @staticmethod
+  def read_elmres_csv(file_path,columns=None):
+    """Reads a csv file formated with 'format_csv_for_elmres' (also with
+    a header map, see argument 'header_map') as pandas DataFrame.
+    Arguments:
+      columns: list of column names that are read (by default all)
+    """
+    import pandas
+    try:
+      with open(file_path + HEADER_MAP_SUFFIX) as header_map_file:
+        header_map = json.load(header_map_file)
+    except(FileNotFoundError):
+      return pandas.read_csv(file_path,usecols=columns)
+    names = header_map["columns"]
+    if columns is None:
+      column_numbers = list(range(len(names)))
+    else:
+      column_numbers_by_name = {name:column_num for column_num,name in enumerate(names)}
+      missing_columns = [column for column in columns if column not in column_numbers_by_name]
+      if missing_columns:
+        raise ValueError(f"The columns {missing_columns} are not contained in '{file_path}'.")
+      column_numbers = [column_numbers_by_name[column] for column in columns]
+    df = pandas.read_csv(file_path,skiprows=header_map["header_rows"],header=None,
+      usecols=column_numbers)
+    df.columns = [names[column_num] for column_num in df.columns]
+    return df
 
   @staticmethod
   def replace_headers_of_csv_file_with_number_of_colums(file_path):
@@ -791,47 +1397,254 @@ class PFBaseInterface:
     Arguments:
       obj_or_path: Object (or its path) to start from.
       condition: lamba function with condition for parent object.
+    Returns None if no upstream object meets the condition.
+    If the object index is enabled, the parents inside the project are
+    taken from the index.
+
+    See also 'get_upstream_objs' for many objects.
     """
     obj_or_path = self.handle_single_pf_object_or_path_input(obj_or_path)
-    obj_or_path = obj_or_path.GetParent()
-    if condition(obj_or_path):
-      return obj_or_path
-    else:
-      return self.get_upstream_obj(obj_or_path, condition)
+    return self.get_upstream_objs([obj_or_path], condition)[0]
+
+  def get_upstream_objs(self, objects_or_path, condition, parent_folder=None,
+    include_subfolders=False):
+    """Returns a list with the first upstream object that meets the
+    condition for every object (None if no upstream object meets it).
+    All objects are resolved in one pass: every parent is visited and
+    checked only once, because the result of the walk up from a parent
+    is memoized for all objects below it.
+    Arguments:
+      objects_or_path: list of objects or path (see 'get_obj')
+      condition: lamba function with condition for parent object.
+      parent_folder, include_subfolders: see 'get_obj' (if a path is used)
+
+    Example (grid of every load):
+      loads = pfbi.get_obj("*.ElmLod",parent_folder="Network Model\\Network Data",
+        include_subfolders=True)
+      grids = pfbi.get_upstream_objs(loads,lambda x: x.GetClassName() == "ElmNet")
+    """
+    objects = self.handle_pf_object_or_path_input(objects_or_path,
+      parent_folder=parent_folder,include_subfolders=include_subfolders)
+    upstream_objs_of_ancestors = {}
+    upstream_objs = []
+    for obj in objects:
+      visited_ancestors = []
+      upstream_obj = None
+      for ancestor in self._iter_ancestors(obj):
+        try:
+          upstream_obj = upstream_objs_of_ancestors[ancestor]
+          break
+        except(KeyError):
+          pass
+        except(TypeError): # unhashable object (not memoized)
+          pass
+        if condition(ancestor):
+          upstream_obj = ancestor
+          break
+        visited_ancestors.append(ancestor)
+      for ancestor in visited_ancestors:
+        try:
+          upstream_objs_of_ancestors[ancestor] = upstream_obj
+        except(TypeError):
+          break
+      if upstream_obj is not None:
+        try:
+          upstream_objs_of_ancestors.setdefault(upstream_obj,upstream_obj)
+        except(TypeError):
+          pass
+      upstream_objs.append(upstream_obj)
+    return upstream_objs
+
+  def _iter_ancestors(self, obj):
+    """Yields the parent, grandparent, ... of 'obj' (from the object
+    index inside the project if it is enabled).
+    """
+    if self.object_index:
+      ancestors = self.object_index.get_ancestors(obj)
+      yield from ancestors
+      if ancestors:
+        obj = ancestors[-1]
+    parent = obj.GetParent()
+    while parent is not None:
+      yield parent
+      parent = parent.GetParent()
 
   def get_path_between_objects(self, obj_high, obj_low):
     """Returns the path between two objects in the database.
     Arguments:
       object_high: Object higher in the hierarchy.
       object_low: Object lower in the hierarchy. 
+
+    See also 'get_paths_between_objects' for many objects.
     """
     obj_high = self.handle_single_pf_object_or_path_input(obj_high)
-    obj_high = PFStringManipuilation.format_full_path(str(obj_high),self)
     obj_low = self.handle_single_pf_object_or_path_input(obj_low)
-    obj_low = PFStringManipuilation.format_full_path(str(obj_low),self)
-    path = str(obj_low).split(str(obj_high))[1][1:] 
-    return path     
+    return self.get_paths_between_objects(obj_high,[obj_low])[0]
+
+  def get_paths_between_objects(self, obj_high, objects_low, include_classes=False):
+    """Returns the paths between an object and many objects below it.
+    The paths are built by walking up the parents of the lower objects
+    (instead of formatting and splitting their full names). The path of 
+    every visited parent is memoized, so each parent is visited only once.
+    Arguments:
+      obj_high: Object higher in the hierarchy (or its path).
+      objects_low: list of objects lower in the hierarchy.
+      include_classes: If True, the names in the paths include the classes
+        (e.g. 'Substation 1.ElmSubstat\\Terminal 1.ElmTerm').
+    """
+    obj_high = self.handle_single_pf_object_or_path_input(obj_high)
+    paths = self._get_relative_paths(obj_high,objects_low,include_classes)
+    for obj_low,path in zip(objects_low,paths):
+      if path is None:
+        raise powfacpy.PFNotBelowObjectError(obj_low,obj_high,self)
+    return paths
+
+  def get_corresponding_objs(self, objects, source_folder, target_folder):
+    """Returns the objects inside 'target_folder' that correspond to 
+    'objects' inside 'source_folder' (e.g. the objects of a copied grid 
+    that correspond to the objects of the original grid). None is returned
+    for objects that are not inside 'source_folder' or have no 
+    corresponding object.
+    The source and the target folder are traversed in parallel: the 
+    corresponding object of an object is the child of the corresponding
+    object of its parent with the same name and class. The mapping is
+    memoized per object, so every parent is visited once and the children
+    of every visited target object are read once (only the parts of the
+    target folder that contain corresponding objects are read).
+    """
+    source_folder = self.handle_single_pf_object_or_path_input(source_folder)
+    target_folder = self.handle_single_pf_object_or_path_input(target_folder)
+    get_key = self._get_object_key
+    corresponding_objs_of_sources = {get_key(source_folder):target_folder}
+    children_of_targets = {}
+    corresponding_objs = []
+    for obj in objects:
+      unresolved_objects = []
+      key = get_key(obj) if obj is not None else None
+      while obj is not None and key not in corresponding_objs_of_sources:
+        unresolved_objects.append((obj,key))
+        obj = obj.GetParent()
+        key = get_key(obj) if obj is not None else None
+      # None if the top of the database was reached (not inside 'source_folder')
+      corresponding_obj = corresponding_objs_of_sources[key] if obj is not None else None
+      for unresolved_obj,unresolved_key in reversed(unresolved_objects):
+        if corresponding_obj is not None:
+          target_key = get_key(corresponding_obj)
+          children = children_of_targets.get(target_key)
+          if children is None:
+            children = children_of_targets[target_key] = {
+              (child.loc_name,child.GetClassName()):child
+              for child in corresponding_obj.GetContents()}
+          corresponding_obj = children.get(
+            (unresolved_obj.loc_name,unresolved_obj.GetClassName()))
+        corresponding_objs_of_sources[unresolved_key] = corresponding_obj
+      corresponding_objs.append(corresponding_obj)
+    return corresponding_objs
+
+  def _get_relative_paths(self, obj_high, objects_low, include_classes):
+    """Returns the paths of 'objects_low' relative to 'obj_high' (None for 
+    objects that are not below 'obj_high').
+    """
+    relative_paths = {self._get_object_key(obj_high):""}
+    paths = []
+    for obj in objects_low:
+      unresolved_objects = []
+      key = self._get_object_key(obj) if obj is not None else None
+      while obj is not None and key not in relative_paths:
+        unresolved_objects.append((obj,key))
+        obj = obj.GetParent()
+        key = self._get_object_key(obj) if obj is not None else None
+      path = relative_paths[key] if obj is not None else None
+      for unresolved_obj,unresolved_key in reversed(unresolved_objects):
+        if path is not None:
+          name = unresolved_obj.loc_name
+          if include_classes:
+            name = name + "." + unresolved_obj.GetClassName()
+          path = path + "\\" + name if path else name
+        relative_paths[unresolved_key] = path
+      paths.append(path)
+    return paths
+
+  @staticmethod
+  def _get_object_key(obj):
+    """Returns 'obj' as dictionary key or its full name if the object is
+    not hashable.
+    """
+    try:
+      hash(obj)
+      return obj
+    except(TypeError):
+      return obj.GetFullName()
 
 
 class PFStringManipuilation:
+
+  # A class suffix starts with "." and ends before the next "\\" (or at the end)
+  _class_suffix_pattern = re.compile(r"\.[^\\]*")
   
   @staticmethod
   def replace_between_characters(char1,char2,replacement,string):
-    new_string = ""
+    new_characters = []
     is_between_chars = False
     for c in string:
       if c == char1:
         is_between_chars = True
       elif c == char2 and is_between_chars:
         is_between_chars = False
-        new_string = new_string + replacement
+        new_characters.append(replacement)
       elif not is_between_chars:
-        new_string = new_string + c
-    return new_string   
+        new_characters.append(c)
+    return "".join(new_characters)
 
   @staticmethod
   def delete_classes(path):
-    return PFStringManipuilation.replace_between_characters('.','\\','\\',path)
+    """Deletes the classes from a path, e.g. 
+      'Network Data.IntPrjfolder\\Grid.ElmNet' -> 'Network Data\\Grid'.
+    Equivalent to replace_between_characters('.','\\','\\',path) but uses
+    a precompiled regular expression.
+    """
+    return PFStringManipuilation._class_suffix_pattern.sub("",path)
+
+  @staticmethod
+  def wildcard_to_regex(pattern):
+    """Translates a PF name pattern (only '*' is a wildcard, all other 
+    characters such as '[' or '?' are literal) to a regular expression.
+    """
+    return ".*".join(re.escape(part) for part in pattern.split("*"))
+
+  @staticmethod
+  def get_name_matcher(pattern):
+    """Returns a function that checks whether a PF object matches the
+    pattern of a single path segment like 'GetContents' (e.g. 
+    'Terminal*', '*.ElmTerm', 'Grid.ElmNet'; patterns without class match
+    objects of any class). The name and class of an object are only read
+    if the pattern requires them.
+    """
+    name_pattern, dot, class_pattern = pattern.rpartition(".")
+    if not dot:
+      name_pattern, class_pattern = pattern, "*"
+    to_regex = PFStringManipuilation.wildcard_to_regex
+    name_regex = re.compile(to_regex(name_pattern)) if name_pattern not in ("","*") else None
+    class_regex = re.compile(to_regex(class_pattern)) if class_pattern != "*" else None
+    def matches(obj):
+      if class_regex and not class_regex.fullmatch(obj.GetClassName()):
+        return False
+      return name_regex is None or name_regex.fullmatch(obj.loc_name) is not None
+    return matches
+
+  @staticmethod
+  def get_project_prefix(pf_interface):
+    """Returns the string '<project name>.IntPrj\\' of the active project.
+    The active project is retrieved on every call (so that projects
+    activated with 'app.ActivateProject' or by other interfaces are
+    recognized), the string is cached per project object.
+    """
+    project = pf_interface.app.GetActiveProject()
+    cached_project, prefix = pf_interface._project_prefix or (None,None)
+    if cached_project is None or not cached_project == project:
+      prefix = project.loc_name + '.IntPrj\\'
+      pf_interface._project_prefix = (project,prefix)
+    return prefix
 
   @staticmethod
   def format_full_path(path,pf_interface):
@@ -842,9 +1655,31 @@ class PFStringManipuilation:
       input path:  \\username.IntUser\\powfacpy_base.IntPrj\\Network Model.IntPrjfolder\\Network Data.IntPrjfolder\\Grid.ElmNet\\Terminal 1.ElmTerm
       output: Network Model\\Network Data\\Grid\\Terminal 1 
     """
-    project_name = pf_interface.app.GetActiveProject().loc_name + '.IntPrj\\'
+    project_name = PFStringManipuilation.get_project_prefix(pf_interface)
     path = path[path.find(project_name)+len(project_name):]
-    return PFStringManipuilation.delete_classes(path)
+    return sys.intern(PFStringManipuilation.delete_classes(path))
+
+  @staticmethod
+  def format_full_paths(paths,pf_interface):
+    """Batch version of 'format_full_path' for a list of full paths.
+    The active project is retrieved once per batch and the parent folder of
+    each path is only converted once (paths usually share their folders).
+    The returned paths are interned strings.
+    """
+    project_name = PFStringManipuilation.get_project_prefix(pf_interface)
+    project_name_length = len(project_name)
+    delete_classes = PFStringManipuilation._class_suffix_pattern.sub
+    formated_folders = {}
+    formated_paths = []
+    for path in paths:
+      path = path[path.find(project_name)+project_name_length:]
+      folder, separator, name = path.rpartition("\\")
+      formated_folder = formated_folders.get(folder)
+      if formated_folder is None:
+        formated_folder = formated_folders[folder] = delete_classes("",folder)
+      formated_paths.append(sys.intern(
+        formated_folder + separator + name.partition(".")[0]))
+    return formated_paths
   
   @staticmethod
   def handle_path(path):
@@ -865,6 +1700,84 @@ class PFResultVariable:
     self.element = element
     self.variable = variable
 
+class PFWriteBatch:
+  """Queue of attribute writes that are set at once (see 
+  'PFBaseInterface.batch_writes').
+  Statistics:
+    queued_writes: number of writes added to the batch
+    coalesced_writes: number of writes that were overwritten by a later
+      write to the same attribute of the same object (and thus not set)
+    flushed_writes: number of attributes set when flushing
+  """
+
+  def __init__(self,pf_interface,use_write_cache=True):
+    self.pf_interface = pf_interface
+    self.use_write_cache = use_write_cache
+    self.queued_writes = 0
+    self.coalesced_writes = 0
+    self.flushed_writes = 0
+    self._resolved_paths = {}
+    self._writes = {}
+
+  def get_obj(self,path,parent_folder=None):
+    """Returns the object under 'path'. Every path is resolved only once
+    per batch.
+    """
+    key = (path,parent_folder)
+    try:
+      return self._resolved_paths[key]
+    except(KeyError):
+      obj = self.pf_interface.get_single_obj(path,parent_folder=parent_folder)
+      self._resolved_paths[key] = obj
+      return obj
+    except(TypeError): # unhashable parent folder
+      return self.pf_interface.get_single_obj(path,parent_folder=parent_folder)
+
+  def add(self,obj,params,parent_folder=None):
+    """Queues the writes of the 'params' dictionary for 'obj' (PF object
+    or path).
+    """
+    if isinstance(obj,str):
+      obj = self.get_obj(obj,parent_folder=parent_folder)
+    # The object (or its full name if it is not hashable) is part of the key
+    # and referenced by the queued write, so keys are not reused by other objects.
+    obj_key = self.pf_interface._get_object_key(obj)
+    for attr, value in params.items():
+      key = (obj_key,attr)
+      if key in self._writes:
+        self.coalesced_writes += 1
+        del self._writes[key] # the last write is set after all previous writes
+      self._writes[key] = (obj,attr,value)
+      self.queued_writes += 1
+
+  def flush(self):
+    """Sets all queued attributes.
+    """
+    app = self.pf_interface.app
+    use_write_cache = (self.use_write_cache and hasattr(app,"SetWriteCacheEnabled")
+      and not app.IsWriteCacheEnabled())
+    if use_write_cache:
+      app.SetWriteCacheEnabled(1)
+    writes = list(self._writes.values())
+    self._writes.clear()
+    try:
+      for obj,attr,value in writes:
+        try:
+          obj.SetAttribute(attr,value)
+        except(TypeError) as e:
+          raise powfacpy.PFAttributeTypeError(obj,attr,e,self.pf_interface)
+        except(AttributeError) as e:
+          raise powfacpy.PFAttributeError(obj,e,self.pf_interface)
+        self.flushed_writes += 1
+    finally:
+      if use_write_cache:
+        app.WriteChangesToDb()
+        app.SetWriteCacheEnabled(0)
+      renamed_objects = [obj for obj,attr,_ in writes if attr == "loc_name"]
+      if renamed_objects:
+        self.pf_interface._handle_renamed_objects(renamed_objects)
+
+
 class PFTranslator:
 
   @staticmethod
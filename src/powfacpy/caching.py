@@ -0,0 +1,126 @@
+"""Caches for the resolution of paths in the PF database.
+"""
+
+from collections import OrderedDict, namedtuple
+
+PFCacheInfo = namedtuple("PFCacheInfo", ["hits", "misses", "max_size", "size"])
+
+
+class PFPathCache:
+  """Least recently used (LRU) cache for the objects returned by path
+  lookups (see 'PFBaseInterface.get_obj').
+  The keys are tuples (parent folder, path, include_subfolders), where the
+  parent folder is None if the path is relative to the active project.
+  Keys that are not hashable (e.g. if a PF object cannot be hashed) are
+  not cached.
+
+  Additionally, the folders resolved segment by segment (see 'path_exists'
+  and 'create_directory') are stored in a trie ('folders').
+
+  The cache does not notice changes that are made to the database outside
+  of powfacpy, so it must be cleared (see 'clear') in that case.
+  """
+
+  def __init__(self,max_size=1024):
+    if max_size < 1:
+      raise ValueError("The size of the path cache must be at least 1.")
+    self.max_size = max_size
+    self.hits = 0
+    self.misses = 0
+    self._entries = OrderedDict()
+    self.folders = PFFolderTrie()
+
+  def get(self,key):
+    """Returns a copy of the cached list of objects or None if the key
+    is not cached.
+    """
+    try:
+      objects = self._entries[key]
+    except KeyError:
+      self.misses += 1
+      return None
+    except TypeError: # unhashable key
+      return None
+    self._entries.move_to_end(key)
+    self.hits += 1
+    return list(objects)
+
+  def put(self,key,objects):
+    """Caches a copy of the list of objects. If the cache is full,
+    the least recently used entry is discarded.
+    """
+    try:
+      self._entries[key] = list(objects)
+    except TypeError: # unhashable key
+      return
+    self._entries.move_to_end(key)
+    if len(self._entries) > self.max_size:
+      self._entries.popitem(last=False)
+
+  def clear(self,folders=True):
+    """Discards all entries (the hit/miss statistics are kept).
+    If 'folders' is False, the folder trie is kept (e.g. if objects 
+    were only created and no object was deleted or renamed).
+    """
+    self._entries.clear()
+    if folders:
+      self.folders.clear()
+
+  def info(self):
+    """Returns the hit/miss statistics and the size of the cache.
+    """
+    return PFCacheInfo(self.hits,self.misses,self.max_size,len(self._entries))
+
+
+class PFFolderTrie:
+  """Trie of path segments that were resolved to PF objects. 
+  The trie has one root per parent folder (None for the active project),
+  so that every segment of a path (e.g. in deep folder hierarchies) is 
+  resolved only once with 'GetContents'.
+  Segments with wildcards are not stored.
+  """
+
+  def __init__(self):
+    self.hits = 0
+    self.misses = 0
+    self._roots = {}
+
+  def resolve(self,parent_folder,segments):
+    """Returns the objects of the longest prefix of 'segments' that
+    is stored in the trie.
+    """
+    try:
+      node = self._roots[parent_folder]
+    except(KeyError,TypeError):
+      self.misses += 1
+      return []
+    objects = []
+    for segment in segments:
+      entry = node.get(segment)
+      if entry is None:
+        break
+      obj,node = entry
+      objects.append(obj)
+    self.hits += len(objects)
+    if len(objects) < len(segments):
+      self.misses += 1
+    return objects
+
+  def insert(self,parent_folder,segments,objects):
+    """Stores the objects that the segments were resolved to.
+    """
+    try:
+      node = self._roots.setdefault(parent_folder,{})
+    except(TypeError): # unhashable parent folder
+      return
+    for segment,obj in zip(segments,objects):
+      if "*" in segment or "?" in segment:
+        return
+      entry = node.get(segment)
+      if entry is None or entry[0] is not obj:
+        entry = (obj,{})
+        node[segment] = entry
+      node = entry[1]
+
+  def clear(self):
+    self._roots.clear()
@@ -0,0 +1,170 @@
+"""Comparison of results of many study cases.
+
+Variable step size simulations of different cases produce different time
+grids. The results of the cases are interpolated linearly onto a common
+time grid and stacked into an array (cases x time x signals), which is a
+memory map of a .npy file if it is larger than 'memmap_threshold' bytes.
+The statistics over the cases (envelope, percentiles, deviation from a
+reference case) are then computed with vectorized NumPy operations along
+the case axis.
+
+Example:
+  time,aligned = powfacpy.align_cases(times,results_of_cases)
+  statistics = powfacpy.get_case_statistics(aligned,reference=0)
+  upper_envelope = statistics["maximum"] # time x signals
+See also 'PFResultsInterface.get_aligned_results'.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+# Size (bytes) above which the aligned array is memory-mapped
+MEMMAP_THRESHOLD = 2**28
+# Size (bytes) of the blocks of the aligned array for the statistics
+CHUNK_SIZE = 2**26
+
+
+def get_common_time_grid(times,step=None,number_of_points=None):
+  """Returns a uniform time grid over the time range that is covered by
+  all cases (latest start to earliest end).
+  Arguments:
+    times: list of 1-D arrays (time of every case)
+    step: time step of the grid. By default, the grid has
+      'number_of_points' points.
+    number_of_points: number of points (by default the largest number
+      of samples of the cases)
+  """
+  start = max(float(time[0]) for time in times)
+  end = min(float(time[-1]) for time in times)
+  if end < start:
+    raise ValueError("The time ranges of the cases do not overlap.")
+  if step:
+    return np.arange(start,end + 0.5*step,step)
+  if number_of_points is None:
+    number_of_points = max(len(time) for time in times)
+  return np.linspace(start,end,number_of_points)
+
+
+def interpolate(time,values,time_grid):
+  """Interpolates the values (1-D or time x signals) linearly onto
+  'time_grid' (all signals at once). Values outside the time range of
+  'time' are the first/last value.
+  """
+  time = np.asarray(time,dtype=np.float64)
+  values = np.asarray(values,dtype=np.float64)
+  rows = np.clip(np.searchsorted(time,time_grid,side="right"),1,len(time) - 1)
+  previous_time = time[rows - 1]
+  dt = time[rows] - previous_time
+  # Zero steps occur at events (two samples at the same time)
+  weights = np.clip(np.divide(time_grid - previous_time,dt,
+    out=np.ones_like(dt),where=dt > 0),0,1)
+  if values.ndim == 2:
+    weights = weights[:,np.newaxis]
+  return values[rows - 1]*(1 - weights) + values[rows]*weights
+
+
+def align_cases(times,values_of_cases,time_grid=None,memmap_path=None,
+  memmap_threshold=MEMMAP_THRESHOLD):
+  """Interpolates the results of all cases onto a common time grid and
+  returns (time grid, array cases x time x signals).
+  Arguments:
+    times: list of 1-D arrays (time of every case)
+    values_of_cases: list of arrays (time x signals or 1-D) of the cases
+      (the signals must be in the same order for all cases)
+    time_grid: common time grid (by default 'get_common_time_grid')
+    memmap_path: path of a .npy file for the array. By default, the
+      array is only memory-mapped (to a temporary file, which is not 
+      deleted automatically, see 'aligned.filename') if it is larger
+      than 'memmap_threshold' bytes.
+  """
+  if len(times) != len(values_of_cases):
+    raise ValueError(f"The number of time arrays ({len(times)}) does not match "
+      f"the number of cases ({len(values_of_cases)}).")
+  if time_grid is None:
+    time_grid = get_common_time_grid(times)
+  time_grid = np.asarray(time_grid,dtype=np.float64)
+  first_values = np.asarray(values_of_cases[0])
+  number_of_signals = first_values.shape[1] if first_values.ndim == 2 else 1
+  shape = (len(times),len(time_grid),number_of_signals)
+  aligned = create_array(shape,memmap_path,memmap_threshold)
+  for case_num,(time,values) in enumerate(zip(times,values_of_cases)):
+    values = np.asarray(values,dtype=np.float64)
+    if values.ndim == 1:
+      values = values[:,np.newaxis]
+    if values.shape[1] != number_of_signals:
+      raise ValueError(f"Case {case_num} has {values.shape[1]} signals "
+        f"(expected {number_of_signals}).")
+    aligned[case_num] = interpolate(time,values,time_grid)
+  if isinstance(aligned,np.memmap):
+    aligned.flush()
+  return time_grid,aligned
+
+
+def create_array(shape,memmap_path=None,memmap_threshold=MEMMAP_THRESHOLD):
+  """Returns an empty float64 array or (if 'memmap_path' is given or the
+  array is larger than 'memmap_threshold' bytes) a memory map of a .npy
+  file.
+  """
+  if memmap_path is None and np.prod(shape)*8 > memmap_threshold:
+    file_descriptor,memmap_path = tempfile.mkstemp(suffix=".npy",prefix="powfacpy_")
+    os.close(file_descriptor)
+  if memmap_path is None:
+    return np.empty(shape,dtype=np.float64)
+  return np.lib.format.open_memmap(memmap_path,mode="w+",dtype=np.float64,shape=shape)
+
+
+def get_case_statistics(aligned,percentiles=(5,50,95),reference=None,
+  chunk_size=CHUNK_SIZE):
+  """Returns statistics over the cases of an aligned array (cases x time
+  x signals) as a dictionary:
+    minimum, maximum, mean: envelope and mean (time x signals)
+    percentiles: array (percentiles x time x signals)
+    max_deviation: maximum absolute deviation from the reference over
+      time (cases x signals), if 'reference' is given
+    max_deviation_time: index of the time step of the maximum deviation
+      (cases x signals), if 'reference' is given
+  The statistics are computed for blocks of time steps of about 
+  'chunk_size' bytes (all cases at once), so that the memory use is
+  bounded for memory-mapped arrays.
+  Arguments:
+    percentiles: percentiles (0 to 100) over the cases
+    reference: index of the reference case or array (time x signals)
+  """
+  number_of_cases,number_of_rows,number_of_signals = aligned.shape
+  statistics = {
+    "minimum":np.empty((number_of_rows,number_of_signals)),
+    "maximum":np.empty((number_of_rows,number_of_signals)),
+    "mean":np.empty((number_of_rows,number_of_signals)),
+  }
+  if percentiles is not None and len(percentiles):
+    statistics["percentiles"] = np.empty((len(percentiles),number_of_rows,number_of_signals))
+  if reference is not None:
+    if np.ndim(reference) == 0:
+      reference = aligned[int(reference)]
+    reference = np.asarray(reference,dtype=np.float64)
+    if reference.ndim == 1:
+      reference = reference[:,np.newaxis]
+    max_deviation = np.full((number_of_cases,number_of_signals),-np.inf)
+    max_deviation_time = np.zeros((number_of_cases,number_of_signals),dtype=np.int64)
+  rows_per_chunk = max(1,chunk_size//max(1,8*number_of_cases*number_of_signals))
+  for first_row in range(0,number_of_rows,rows_per_chunk):
+    rows = slice(first_row,min(first_row + rows_per_chunk,number_of_rows))
+    block = np.asarray(aligned[:,rows])
+    statistics["minimum"][rows] = block.min(axis=0)
+    statistics["maximum"][rows] = block.max(axis=0)
+    statistics["mean"][rows] = block.mean(axis=0)
+    if "percentiles" in statistics:
+      statistics["percentiles"][:,rows] = np.percentile(block,percentiles,axis=0)
+    if reference is not None:
+      deviation = np.abs(block - reference[rows])
+      block_max_rows = deviation.argmax(axis=1)
+      block_max = np.take_along_axis(deviation,block_max_rows[:,np.newaxis,:],axis=1)[:,0,:]
+      larger = block_max > max_deviation
+      max_deviation[larger] = block_max[larger]
+      max_deviation_time[larger] = block_max_rows[larger] + first_row
+  if reference is not None:
+    statistics["max_deviation"] = max_deviation
+    statistics["max_deviation_time"] = max_deviation_time
+  return statistics
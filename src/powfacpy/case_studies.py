@@ -1,5 +1,3 @@
-import sys
-sys.path.insert(0,r'.\src')
 import powfacpy
 from itertools import product
 
@@ -201,12 +199,14 @@ class PFStudyCases(powfacpy.PFBaseInterface):
   def set_parameters(self,case_obj_or_case_num):
     """Set the parameters according to paths specified in 'parameter_paths'
     and values specified in 'parameter_values'. 
+    The parameters are written in one batch (see 'batch_writes').
     """
     case_num = self.handle_case_input(case_obj_or_case_num)
-    for par_name,path in self.parameter_paths.items():
-      value = self.get_value_of_parameter_for_case(par_name,case_num)
-      if value:
-        self.set_attr_by_path(path,value)  
+    with self.batch_writes():
+      for par_name,path in self.parameter_paths.items():
+        value = self.get_value_of_parameter_for_case(par_name,case_num)
+        if value:
+          self.set_attr_by_path(path,value)  
 
   def get_study_cases(self,conditions):
     """Retrieve study case objects depending on parameter values.
@@ -312,16 +312,19 @@ class PFStudyCases(powfacpy.PFBaseInterface):
       - self.parent_folder_scenarios
       - self.parent_folder_variations
     if theses attributes are defined.  
+    Only the objects directly inside the folders are deleted (their contents
+    are deleted with them) in one batch (see 'delete_objects').
     """
     parent_folders = [
       self.get_study_cases_parent_folder(),
       self.get_scenarios_parent_folder(),
       self.get_variations_parent_folder(),
     ]
+    objects_to_be_deleted = []
     for parent_folder in parent_folders:
       if parent_folder:
-        self.delete_obj("*",
+        objects_to_be_deleted.extend(self.get_obj("*",
           parent_folder=parent_folder,
-          error_if_non_existent=False,
-          include_subfolders=True)  
+          error_if_non_existent=False))
+    self.delete_objects(objects_to_be_deleted)
 
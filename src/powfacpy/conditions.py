@@ -0,0 +1,195 @@
+"""Declarative conditions for filtering PF objects by their attributes.
+
+Instead of a function that is called for every object, e.g.
+  condition = lambda x : getattr(x,"uknom")==110
+a declarative condition can be used:
+  condition = Attr("uknom") == 110
+Every attribute that is referenced in the condition is read once per object
+into a NumPy array and the condition is then evaluated for all objects at
+once. Conditions can be combined with '&' (and), '|' (or) and '~' (not):
+  condition = (Attr("uknom") == 110) & ~Attr("outserv").isin([1])
+  condition = Attr("uknom").between(20,110) | (Attr("loc_name") == "Terminal 1")
+Note that the comparisons must be put in brackets when they are combined and
+that chained comparisons (e.g. '20 < Attr("uknom") < 110') are not supported
+(use 'between' instead).
+"""
+
+import operator
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class PFCondition(ABC):
+  """Base class of declarative conditions (see 'Attr').
+  """
+
+  def __and__(self,other):
+    return PFLogicalCondition(np.logical_and,"&",self,other)
+
+  def __or__(self,other):
+    return PFLogicalCondition(np.logical_or,"|",self,other)
+
+  def __invert__(self):
+    return PFNotCondition(self)
+
+  @abstractmethod
+  def get_attributes(self):
+    """Returns the set of attribute names used in the condition.
+    """
+
+  @abstractmethod
+  def evaluate(self,columns):
+    """Evaluates the condition for arrays of attribute values.
+    Arguments:
+      columns: dictionary {attribute name: array of values}
+    Returns a boolean NumPy array.
+    """
+
+  def filter_objects(self,objects,pf_interface):
+    """Returns the objects for which the condition is met. The attributes
+    are read with 'pf_interface.get_attr_arrays'.
+    """
+    objects = list(objects)
+    if not objects:
+      return []
+    columns = pf_interface.get_attr_arrays(objects,sorted(self.get_attributes()))
+    mask = self.evaluate(columns)
+    return [obj for obj,is_true in zip(objects,mask) if is_true]
+
+  def __call__(self,obj):
+    """Evaluates the condition for a single object, so that a condition
+    can be used wherever a function is expected.
+    """
+    columns = {}
+    for attr in self.get_attributes():
+      column = np.empty(1,dtype=object)
+      column[0] = obj.GetAttribute(attr)
+      columns[attr] = column
+    return bool(self.evaluate(columns)[0])
+
+
+class PFAttributeCondition(PFCondition):
+  """Condition on the values of one attribute.
+  """
+
+  def __init__(self,attribute,function,description):
+    self.attribute = attribute
+    self.function = function
+    self.description = description
+
+  def get_attributes(self):
+    return {self.attribute}
+
+  def evaluate(self,columns):
+    column = columns[self.attribute]
+    try:
+      mask = np.asarray(self.function(column),dtype=bool)
+    except(TypeError) as e:
+      raise TypeError(f"{e}. Maybe an unexpected type is used for attribute "
+        f"'{self.attribute}' in condition '{self}'.")
+    if mask.shape != column.shape: # e.g. comparison of numbers with a string
+      mask = np.broadcast_to(mask,column.shape)
+    return mask
+
+  def __repr__(self):
+    return self.description
+
+
+class PFLogicalCondition(PFCondition):
+  """Combination of two conditions with a logical operator.
+  """
+
+  def __init__(self,function,symbol,condition_1,condition_2):
+    if not (isinstance(condition_1,PFCondition) and isinstance(condition_2,PFCondition)):
+      raise TypeError(f"Conditions can only be combined with conditions (use "
+        f"brackets around comparisons, e.g. '(Attr(\"a\") == 1) {symbol} (Attr(\"b\") == 2)').")
+    self.function = function
+    self.symbol = symbol
+    self.conditions = (condition_1,condition_2)
+
+  def get_attributes(self):
+    return self.conditions[0].get_attributes() | self.conditions[1].get_attributes()
+
+  def evaluate(self,columns):
+    return self.function(self.conditions[0].evaluate(columns),
+      self.conditions[1].evaluate(columns))
+
+  def __repr__(self):
+    return f"({self.conditions[0]} {self.symbol} {self.conditions[1]})"
+
+
+class PFNotCondition(PFCondition):
+  """Negation of a condition.
+  """
+
+  def __init__(self,condition):
+    self.condition = condition
+
+  def get_attributes(self):
+    return self.condition.get_attributes()
+
+  def evaluate(self,columns):
+    return np.logical_not(self.condition.evaluate(columns))
+
+  def __repr__(self):
+    return f"~{self.condition}"
+
+
+class Attr:
+  """Attribute of PF objects that is used in a declarative condition.
+  Comparisons (==, !=, <, <=, >, >=) and the methods 'isin' and 'between'
+  return conditions (PFCondition).
+
+  Example:
+    pfbi.get_obj("Network Model\\Network Data\\Grid\\*.ElmTerm",
+      condition=Attr("uknom") == 110)
+  """
+
+  def __init__(self,name):
+    self.name = name
+
+  def _compare(self,function,symbol,value):
+    return PFAttributeCondition(self.name,lambda column: function(column,value),
+      f"Attr('{self.name}') {symbol} {value!r}")
+
+  def __eq__(self,value):
+    return self._compare(operator.eq,"==",value)
+
+  def __ne__(self,value):
+    return self._compare(operator.ne,"!=",value)
+
+  def __lt__(self,value):
+    return self._compare(operator.lt,"<",value)
+
+  def __le__(self,value):
+    return self._compare(operator.le,"<=",value)
+
+  def __gt__(self,value):
+    return self._compare(operator.gt,">",value)
+
+  def __ge__(self,value):
+    return self._compare(operator.ge,">=",value)
+
+  __hash__ = None
+
+  def isin(self,values):
+    """Condition that the attribute value is one of 'values'.
+    """
+    values = list(values)
+    def is_in(column):
+      if column.dtype == object:
+        return [value in values for value in column]
+      return np.isin(column,values)
+    return PFAttributeCondition(self.name,is_in,f"Attr('{self.name}').isin({values!r})")
+
+  def between(self,lower,upper,inclusive=True):
+    """Condition that the attribute value is between 'lower' and 'upper'
+    (including the bounds if 'inclusive' is True).
+    """
+    if inclusive:
+      function = lambda column: (column >= lower) & (column <= upper)
+    else:
+      function = lambda column: (column > lower) & (column < upper)
+    return PFAttributeCondition(self.name,function,
+      f"Attr('{self.name}').between({lower!r},{upper!r})")
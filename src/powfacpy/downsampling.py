@@ -0,0 +1,122 @@
+"""Downsampling of result series for plotting.
+
+Plotting every sample of long simulations (e.g. millions of points per
+curve) is slow and uses a lot of memory, although a plot can only show
+about as many points as it is wide in pixels. The functions reduce a
+series (x: time, y: values) to about 'max_points' points while keeping
+its shape:
+  minmax: The series is divided into buckets of equal size and the
+    minimum and maximum of every bucket are kept (in the original order).
+    All peaks are kept, so fault transients stay visible.
+  lttb: Largest-Triangle-Three-Buckets (S. Steinarsson, 2013). One point
+    per bucket is kept that forms the largest triangle with the point
+    kept in the previous bucket and the mean of the next bucket.
+The first and last point of a series are always kept. If a series has
+not more than 'max_points' points, it is returned unchanged.
+
+Example:
+  time, voltage = powfacpy.downsample(time, voltage, max_points=2000)
+"""
+
+import numpy as np
+
+METHODS = ("minmax","lttb")
+
+
+def downsample(x,y,max_points,method="minmax"):
+  """Returns the downsampled series (x,y) as NumPy arrays.
+  Arguments:
+    x: time (1-D array-like)
+    y: values (1-D array-like or 2-D with one column per signal; with
+      'minmax', the points kept for any of the signals are kept for all
+      of them)
+    max_points: approximate number of points after downsampling (e.g. the
+      width of the plot in pixels)
+    method: "minmax" or "lttb" (see module docstring)
+  """
+  if method == "minmax":
+    return downsample_minmax(x,y,max_points)
+  elif method == "lttb":
+    return downsample_lttb(x,y,max_points)
+  raise ValueError(f"Unknown downsampling method '{method}' (use one of {METHODS}).")
+
+
+def downsample_minmax(x,y,max_points):
+  """Keeps the minimum and maximum of buckets of equal size (see module
+  docstring). At most 'max_points' points are returned for 1-D series.
+  """
+  x = np.asarray(x)
+  y = np.asarray(y)
+  indices = get_minmax_indices(y,max_points)
+  if indices is None:
+    return x,y
+  return x[indices],y[indices]
+
+
+def get_minmax_indices(y,max_points):
+  """Returns the sorted indices of the points kept by 'downsample_minmax'
+  or None if no points need to be removed.
+  """
+  if max_points < 4:
+    raise ValueError("At least 4 points must be kept with 'minmax'.")
+  y = np.asarray(y)
+  n = len(y)
+  if n <= max_points:
+    return None
+  # Two points per bucket; the first and last point are kept additionally
+  number_of_buckets = (max_points - 2) // 2
+  bucket_size = -(-(n - 2) // number_of_buckets)
+  number_of_buckets = -(-(n - 2) // bucket_size)
+  values = y[1:-1]
+  padding = number_of_buckets*bucket_size - len(values)
+  if padding:
+    # Pad with the last value; argmin/argmax return the first occurrence,
+    # so padded indices are never selected.
+    values = np.concatenate([values,np.repeat(values[-1:],padding,axis=0)])
+  values = values.reshape((number_of_buckets,bucket_size) + values.shape[1:])
+  offsets = np.arange(number_of_buckets)*bucket_size + 1
+  if values.ndim == 3:
+    offsets = offsets[:,np.newaxis]
+  indices = np.concatenate([
+    [0],
+    (np.argmin(values,axis=1) + offsets).ravel(),
+    (np.argmax(values,axis=1) + offsets).ravel(),
+    [n - 1]])
+  return np.unique(indices)
+
+
+def downsample_lttb(x,y,max_points):
+  """Largest-Triangle-Three-Buckets downsampling to 'max_points' points
+  (see module docstring). Only 1-D series are supported.
+  """
+  if max_points < 3:
+    raise ValueError("At least 3 points must be kept with 'lttb'.")
+  x = np.asarray(x)
+  y = np.asarray(y)
+  if y.ndim != 1:
+    raise ValueError("'lttb' only supports 1-D series (use 'minmax' for 2-D).")
+  n = len(y)
+  if n <= max_points:
+    return x,y
+  x_float = x.astype(np.float64)
+  y_float = y.astype(np.float64)
+  # Bucket edges of the points between the first and the last point
+  edges = np.linspace(1,n - 1,max_points - 1).astype(np.int64)
+  # Mean of every bucket (the mean of the next bucket is the third point
+  # of the triangle); the last point is the "bucket" after the last bucket.
+  counts = np.diff(edges)
+  mean_x = np.append(np.add.reduceat(x_float[1:n - 1],edges[:-1] - 1)/counts,x_float[-1])
+  mean_y = np.append(np.add.reduceat(y_float[1:n - 1],edges[:-1] - 1)/counts,y_float[-1])
+  indices = np.empty(max_points,dtype=np.int64)
+  indices[0] = 0
+  indices[-1] = n - 1
+  selected = 0
+  for bucket in range(max_points - 2):
+    start,stop = edges[bucket],edges[bucket + 1]
+    # Twice the area of the triangles (selected point, candidate, next mean)
+    areas = np.abs(
+      (x_float[selected] - mean_x[bucket + 1])*(y_float[start:stop] - y_float[selected])
+      - (x_float[selected] - x_float[start:stop])*(mean_y[bucket + 1] - y_float[selected]))
+    selected = start + int(np.argmax(areas))
+    indices[bucket + 1] = selected
+  return x[indices],y[indices]
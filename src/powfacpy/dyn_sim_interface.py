@@ -1,5 +1,3 @@
-import sys
-sys.path.insert(0,r'.\src')
 import powfacpy
 
 
@@ -18,6 +16,7 @@ class PFDynSimInterface(powfacpy.PFBaseInterface):
     if param is not None:
       self.set_attr(cominc,param)
     cominc.Execute()
+    self.invalidate_results()
 
   def run_sim(self,param=None):
     """
@@ -28,6 +27,7 @@ class PFDynSimInterface(powfacpy.PFBaseInterface):
     if param is not None:
       self.set_attr(comsim,param)
     comsim.Execute()
+    self.invalidate_results()
 
   def initialize_and_run_sim(self):
     """Initialize and perform time domain simulation."""
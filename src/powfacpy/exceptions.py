@@ -1,7 +1,5 @@
 """Custom exceptions for powfacpy.
 """
-import sys
-sys.path.insert(0,r'.\src')
 import powfacpy
 
 class PFInterfaceError(Exception):
@@ -34,6 +32,15 @@ class PFPathError(PFInterfaceError):
     self.message = f"'{non_existing_child}' does not exist in '{existing_path}'"
     super().__init__(self.message)
 
+class PFNotBelowObjectError(PFPathError):
+  """An object is not below another object in the PF database.
+  """
+  def __init__(self,obj_low,obj_high,pf_base_interface):
+    obj_low_str = powfacpy.PFStringManipuilation.format_full_path(str(obj_low),pf_base_interface)
+    obj_high_str = powfacpy.PFStringManipuilation.format_full_path(str(obj_high),pf_base_interface)
+    self.message = f"'{obj_low_str}' is not below '{obj_high_str}'"
+    PFInterfaceError.__init__(self,self.message)
+
 class PFPathInputError(PFInterfaceError):
   """Invalid input for a PF path.
   """
@@ -79,4 +86,23 @@ class PFCaseStudyParameterValueDefinitionError(PFInterfaceError):
   def __init__(self,par_name,values):
     self.message = (f"Incorrect number of values defined for parameter '{par_name}'. "
     f"Only {len(values)} values were defined.")
-    super().__init__(self.message)
\ No newline at end of file
+    super().__init__(self.message)
+
+class PFReplayMismatchError(PFInterfaceError):
+  """A PF API call that is replayed was not recorded (see 'PFAPIReplayer').
+  """
+  def __init__(self,oid,method,args,details=None):
+    self.message = (f"The call of '{method}' of object {oid} with arguments {args} "
+      "does not match the recorded calls.")
+    if details:
+      self.message = self.message + " " + details
+    super().__init__(self.message)
+
+class PFResultsColumnNotFoundError(PFInterfaceError):
+  """Attempt to read a variable that is not recorded in a results object (ElmRes).
+  """
+  def __init__(self,obj,variable,pf_base_interface):
+    object_str = powfacpy.PFStringManipuilation.format_full_path(str(obj),pf_base_interface)
+    self.message = (f"The variable '{variable}' of object '{object_str}' is not "
+      "recorded in the results object.")
+    super().__init__(self.message)
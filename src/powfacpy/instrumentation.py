@@ -0,0 +1,238 @@
+"""Instrumentation of the calls to the PowerFactory API.
+
+The PF app and the PF objects it returns are wrapped in proxies
+(PFInstrumentedObject) that count the calls of every API method
+(e.g. 'GetContents', 'SetAttribute', 'Execute'), measure their latency and
+attribute them to the powfacpy method that issued them. Reading and setting
+attributes directly (e.g. 'obj.loc_name') is counted as 'getattr'/'setattr'.
+
+Example:
+  pfbi = powfacpy.PFBaseInterface(app,instrument=True)
+  pfbi.get_obj("Network Model\\Network Data\\Grid\\*.ElmTerm")
+  print(pfbi.api_statistics.to_dataframe())
+
+The overhead is one Python function call, one timer call and a dictionary
+update per API call, so the instrumentation can be left enabled in
+production runs.
+"""
+
+import json
+import math
+import sys
+from time import perf_counter
+
+# Latency histogram: bucket i counts the calls with a latency in
+# [2**(i-1), 2**i) microseconds (bucket 0: < 1 microsecond)
+NUMBER_OF_HISTOGRAM_BUCKETS = 32
+
+
+class PFAPIStatistics:
+  """Call counts and latency histograms of the PF API methods per
+  calling powfacpy method.
+  """
+
+  def __init__(self):
+    self._calls = {}
+    self._callers = {}
+
+  def record(self,method,caller,duration):
+    """Records one call of 'method' by 'caller' that took 'duration' seconds.
+    """
+    key = (method,caller)
+    entry = self._calls.get(key)
+    if entry is None:
+      entry = self._calls[key] = [0,0.0,math.inf,0.0,[0]*NUMBER_OF_HISTOGRAM_BUCKETS]
+    entry[0] += 1
+    entry[1] += duration
+    if duration < entry[2]:
+      entry[2] = duration
+    if duration > entry[3]:
+      entry[3] = duration
+    bucket = math.frexp(duration*1e6)[1] if duration >= 1e-6 else 0
+    entry[4][min(bucket,NUMBER_OF_HISTOGRAM_BUCKETS-1)] += 1
+
+  def get_caller(self):
+    """Returns the name of the nearest powfacpy method in the call stack
+    (e.g. 'PFBaseInterface.get_obj') or '<user code>'.
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+      code = frame.f_code
+      caller = self._callers.get(code)
+      if caller is None:
+        module_name = frame.f_globals.get("__name__","")
+        # Comprehensions are attributed to the enclosing method
+        if (module_name.startswith("powfacpy.")
+            and module_name != "powfacpy.instrumentation"
+            and not code.co_name.startswith("<")):
+          caller = getattr(code,"co_qualname",code.co_name)
+        else:
+          caller = ""
+        self._callers[code] = caller
+      if caller:
+        return caller
+      frame = frame.f_back
+    return "<user code>"
+
+  def reset(self):
+    self._calls.clear()
+
+  @property
+  def number_of_calls(self):
+    return sum(entry[0] for entry in self._calls.values())
+
+  @property
+  def total_time(self):
+    return sum(entry[1] for entry in self._calls.values())
+
+  def get_records(self):
+    """Returns a list of dictionaries (one per API method and caller),
+    sorted by the total time in descending order. The histogram maps the
+    upper bound of each bucket (in microseconds) to the number of calls.
+    """
+    records = []
+    for (method,caller),(calls,total,minimum,maximum,histogram) in self._calls.items():
+      records.append({
+        "method":method,
+        "caller":caller,
+        "calls":calls,
+        "total_time":total,
+        "mean_time":total/calls,
+        "min_time":minimum,
+        "max_time":maximum,
+        "histogram":{2**bucket:count for bucket,count in enumerate(histogram) if count},
+      })
+    records.sort(key=lambda record: record["total_time"],reverse=True)
+    return records
+
+  def to_json(self,file_path=None,indent=2):
+    """Returns the records as a JSON string and writes it to 'file_path'
+    if specified. Times are in seconds.
+    """
+    report = json.dumps({"number_of_calls":self.number_of_calls,
+      "total_time":self.total_time,"records":self.get_records()},indent=indent)
+    if file_path:
+      with open(file_path,"w") as file:
+        file.write(report)
+    return report
+
+  def to_dataframe(self,by=None):
+    """Returns the records as a pandas DataFrame (times in seconds).
+    Arguments:
+      by: None for one row per API method and caller, "method" or "caller"
+        to aggregate the rows by API method or by caller.
+    """
+    import pandas
+    columns = ["method","caller","calls","total_time","mean_time","min_time",
+      "max_time","histogram"]
+    df = pandas.DataFrame(self.get_records(),columns=columns)
+    if by is None:
+      return df
+    if by not in ("method","caller"):
+      raise ValueError("'by' must be None, 'method' or 'caller'.")
+    df = df.groupby(by).agg(calls=("calls","sum"),total_time=("total_time","sum"),
+      min_time=("min_time","min"),max_time=("max_time","max"))
+    df["mean_time"] = df["total_time"]/df["calls"]
+    return df.sort_values("total_time",ascending=False)
+
+  def __repr__(self):
+    return (f"PFAPIStatistics(number_of_calls={self.number_of_calls}, "
+      f"total_time={self.total_time:.6f})")
+
+
+class PFInstrumentedObject:
+  """Proxy of the PF app or of a PF object that records its API calls in
+  a PFAPIStatistics object. PF objects returned by the calls are wrapped
+  as well and proxies passed as arguments are unwrapped.
+  """
+  __slots__ = ("_obj","_statistics")
+
+  def __init__(self,obj,statistics):
+    object.__setattr__(self,"_obj",obj)
+    object.__setattr__(self,"_statistics",statistics)
+
+  def __getattr__(self,name):
+    statistics = self._statistics
+    start = perf_counter()
+    value = getattr(self._obj,name)
+    duration = perf_counter() - start
+    if callable(value) and not _is_pf_object(value):
+      return _instrument_method(value,name,statistics)
+    statistics.record("getattr",statistics.get_caller(),duration)
+    return _wrap(value,statistics)
+
+  def __setattr__(self,name,value):
+    statistics = self._statistics
+    value = unwrap(value)
+    start = perf_counter()
+    try:
+      setattr(self._obj,name,value)
+    finally:
+      statistics.record("setattr",statistics.get_caller(),perf_counter() - start)
+
+  def __eq__(self,other):
+    return self._obj == unwrap(other)
+
+  def __hash__(self):
+    return hash(self._obj)
+
+  def __bool__(self):
+    return bool(self._obj)
+
+  def __dir__(self):
+    return dir(self._obj)
+
+  def __str__(self):
+    return str(self._obj)
+
+  def __repr__(self):
+    return f"PFInstrumentedObject({self._obj!r})"
+
+
+_pf_types = {}
+
+
+def _is_pf_object(value):
+  value_type = type(value)
+  try:
+    return _pf_types[value_type]
+  except(KeyError):
+    is_pf_object = (value_type is not PFInstrumentedObject
+      and hasattr(value_type,"GetClassName"))
+    _pf_types[value_type] = is_pf_object
+    return is_pf_object
+
+
+def _wrap(value,statistics):
+  if _is_pf_object(value):
+    return PFInstrumentedObject(value,statistics)
+  if type(value) is list:
+    return [PFInstrumentedObject(v,statistics) if _is_pf_object(v) else v for v in value]
+  return value
+
+
+def unwrap(value):
+  """Returns the PF object (or app) wrapped by a PFInstrumentedObject or
+  'value' itself if it is not wrapped (lists and tuples are unwrapped
+  elementwise).
+  """
+  value_type = type(value)
+  if value_type is PFInstrumentedObject:
+    return object.__getattribute__(value,"_obj")
+  if value_type is list or value_type is tuple:
+    return value_type(unwrap(v) for v in value)
+  return value
+
+
+def _instrument_method(method,name,statistics):
+  def instrumented_method(*args,**kwargs):
+    args = [unwrap(arg) for arg in args]
+    if kwargs:
+      kwargs = {key:unwrap(value) for key,value in kwargs.items()}
+    start = perf_counter()
+    try:
+      result = method(*args,**kwargs)
+    finally:
+      statistics.record(name,statistics.get_caller(),perf_counter() - start)
+    return _wrap(result,statistics)
+  return instrumented_method
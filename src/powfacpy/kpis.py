@@ -0,0 +1,195 @@
+"""Dynamic performance indicators (KPIs) of simulation results.
+
+The KPIs are computed for all signals of a (time x signals) matrix at once
+(e.g. from 'PFResultsInterface.get_results_matrix') with vectorized NumPy
+operations. Time steps do not need to be uniform (variable step size
+simulations); integrals are computed with the trapezoidal rule.
+
+Available KPIs (see 'KPIS'):
+  minimum, maximum: minimum/maximum value
+  rms: root mean square over time
+  overshoot: overshoot beyond the final value in percent of the step
+    (final value - initial value)
+  rise_time: time between 10 % and 90 % of the step (NaN if not reached)
+  settling_time: time after the start until the signal stays within
+    'settling_band' (relative to the step) around the final value
+  steady_state_error: reference - final value (requires 'reference')
+  time_outside_band: time during which the signal is outside the band
+    (lower, upper), e.g. a voltage band (requires 'band')
+The initial value is the value at the start (first sample at or after
+'start_time'), the final value is the value of the last sample.
+
+Example:
+  matrix = pfri.get_results_matrix(elements_and_variables,include_time=True)
+  kpis = powfacpy.compute_kpis(matrix[:,0],matrix[:,1:],
+    kpis=["overshoot","settling_time","time_outside_band"],band=(0.9,1.1))
+"""
+
+import numpy as np
+
+KPIS = ("minimum","maximum","rms","overshoot","rise_time","settling_time",
+  "steady_state_error","time_outside_band")
+
+
+def compute_kpis(time,values,signal_names=None,kpis=None,start_time=None,
+  band=None,reference=None,settling_band=0.02,rise_levels=(0.1,0.9),
+  as_dataframe=True):
+  """Computes KPIs (see module docstring) for all signals.
+  Arguments:
+    time: 1-D array (n) of the time (non-uniform steps are allowed)
+    values: 2-D array (n x signals) or 1-D array (single signal)
+    signal_names: names of the signals (by default their column numbers)
+    kpis: list of KPIs (see 'KPIS'). By default, all KPIs are computed
+      for which the required arguments are given.
+    start_time: Only the samples at or after 'start_time' are evaluated
+      (e.g. the time of the disturbance).
+    band: tuple (lower, upper) for 'time_outside_band'
+    reference: reference value (scalar or one value per signal) for
+      'steady_state_error'
+    settling_band: band around the final value for 'settling_time'
+      relative to the step (e.g. 0.02: 2 %)
+    rise_levels: levels of the step between which the rise time is
+      measured
+    as_dataframe: If True, a tidy pandas DataFrame with the columns
+      'signal', 'kpi' and 'value' is returned, else a dictionary
+      {kpi: array with one value per signal}.
+  """
+  time = np.asarray(time,dtype=np.float64)
+  values = np.asarray(values,dtype=np.float64)
+  if values.ndim == 1:
+    values = values[:,np.newaxis]
+  if values.shape[0] != len(time):
+    raise ValueError(f"The number of rows of 'values' ({values.shape[0]}) does not "
+      f"match the length of 'time' ({len(time)}).")
+  if start_time is not None:
+    first_row = np.searchsorted(time,start_time)
+    time = time[first_row:]
+    values = values[first_row:]
+  if len(time) < 2:
+    raise ValueError("At least two samples are required to compute KPIs.")
+  if kpis is None:
+    kpis = [kpi for kpi in KPIS if not (kpi == "steady_state_error" and reference is None)
+      and not (kpi == "time_outside_band" and band is None)]
+  elif isinstance(kpis,str):
+    kpis = [kpis]
+  signals = _PFSignals(time,values)
+  results = {}
+  for kpi in kpis:
+    if kpi == "minimum":
+      results[kpi] = values.min(axis=0)
+    elif kpi == "maximum":
+      results[kpi] = values.max(axis=0)
+    elif kpi == "rms":
+      results[kpi] = np.sqrt(np.einsum("i,ij,ij->j",signals.weights,values,values)
+        /(time[-1] - time[0]))
+    elif kpi == "overshoot":
+      results[kpi] = get_overshoot(signals)
+    elif kpi == "rise_time":
+      results[kpi] = get_rise_time(signals,rise_levels)
+    elif kpi == "settling_time":
+      results[kpi] = get_settling_time(signals,settling_band)
+    elif kpi == "steady_state_error":
+      if reference is None:
+        raise ValueError("The KPI 'steady_state_error' requires a 'reference'.")
+      results[kpi] = np.asarray(reference,dtype=np.float64) - signals.final
+    elif kpi == "time_outside_band":
+      if band is None:
+        raise ValueError("The KPI 'time_outside_band' requires a 'band' (lower, upper).")
+      lower,upper = band
+      outside = (values < lower) | (values > upper)
+      results[kpi] = signals.integrate(outside)
+    else:
+      raise ValueError(f"Unknown KPI '{kpi}' (use one of {KPIS}).")
+  if not as_dataframe:
+    return results
+  import pandas
+  number_of_signals = values.shape[1]
+  if signal_names is None:
+    signal_names = np.arange(number_of_signals)
+  return pandas.DataFrame({
+    "signal":np.tile(np.asarray(signal_names,dtype=object),len(results)),
+    "kpi":np.repeat(np.asarray(list(results),dtype=object),number_of_signals),
+    "value":np.concatenate([np.broadcast_to(result,(number_of_signals,))
+      for result in results.values()]) if results else np.empty(0)})
+
+
+class _PFSignals:
+  """Quantities that are shared by several KPIs (computed once).
+  """
+
+  def __init__(self,time,values):
+    self.time = time
+    self.values = values
+    # Weights of the samples for the trapezoidal rule (non-uniform steps)
+    dt = np.diff(time)
+    self.weights = np.zeros(len(time))
+    self.weights[:-1] += 0.5*dt
+    self.weights[1:] += 0.5*dt
+    self.initial = values[0]
+    self.final = values[-1]
+    step = self.final - self.initial
+    # Relative KPIs are NaN for signals without a step
+    self.step = np.where(step != 0,step,np.nan)
+    self.direction = np.where(step < 0,-1.0,1.0)
+    self._oriented_values = None
+
+  def integrate(self,values):
+    """Integral over time (trapezoidal rule) of every column.
+    """
+    return self.weights @ values
+
+  def get_oriented_values(self):
+    """Values multiplied by the direction of the step, so that every
+    step is positive.
+    """
+    if self._oriented_values is None:
+      self._oriented_values = self.values*self.direction
+    return self._oriented_values
+
+
+def get_overshoot(signals):
+  """Overshoot beyond the final value in percent of the step.
+  """
+  peak = np.where(signals.direction > 0,signals.values.max(axis=0),
+    -signals.values.min(axis=0))
+  return 100*np.maximum(peak - signals.direction*signals.final,0)/np.abs(signals.step)
+
+
+def get_rise_time(signals,rise_levels=(0.1,0.9)):
+  """Time between the first crossings of the levels of the step (the
+  crossing times are interpolated linearly between the samples).
+  """
+  lower_time = _get_first_crossing_time(signals,rise_levels[0])
+  upper_time = _get_first_crossing_time(signals,rise_levels[1])
+  return upper_time - lower_time
+
+
+def _get_first_crossing_time(signals,level):
+  oriented_values = signals.get_oriented_values()
+  direction = signals.direction
+  threshold = direction*(signals.initial + level*signals.step)
+  reached = oriented_values >= threshold
+  rows = np.argmax(reached,axis=0)
+  columns = np.arange(oriented_values.shape[1])
+  previous_rows = np.maximum(rows - 1,0)
+  previous_values = oriented_values[previous_rows,columns]
+  delta = oriented_values[rows,columns] - previous_values
+  fraction = np.where(delta > 0,(threshold - previous_values)/np.where(delta > 0,delta,1),0)
+  time = signals.time
+  crossing_time = time[previous_rows] + fraction*(time[rows] - time[previous_rows])
+  return np.where(reached[rows,columns],crossing_time,np.nan)
+
+
+def get_settling_time(signals,settling_band=0.02):
+  """Time after the start until the signal stays within 'settling_band'
+  (relative to the step) around the final value.
+  """
+  values = signals.values
+  tolerance = settling_band*np.abs(signals.step)
+  outside = (values > signals.final + tolerance) | (values < signals.final - tolerance)
+  number_of_rows = values.shape[0]
+  last_outside_rows = number_of_rows - 1 - np.argmax(outside[::-1],axis=0)
+  settled_rows = np.where(outside.any(axis=0),
+    np.minimum(last_outside_rows + 1,number_of_rows - 1),0)
+  settling_time = signals.time[settled_rows] - signals.time[0]
+  return np.where(np.isnan(signals.step),np.nan,settling_time)
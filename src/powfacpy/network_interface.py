@@ -1,5 +1,3 @@
-import sys
-sys.path.insert(0,r'.\src')
 import powfacpy
 
 class PFNetworkInterface(powfacpy.PFBaseInterface):
@@ -50,6 +48,9 @@ class PFNetworkInterface(powfacpy.PFBaseInterface):
     error_if_non_existent=True):
     """Copying a grid is not trivial in PF because the graphical network objects
     need to be copied and assigned manually as this is not done automatically.
+    Raises PFNotBelowObjectError if a graphical object refers to an element
+    outside of the grid and PFNonExistingObjectError if an element has no
+    corresponding element in the copied grid.
     """
     grid_to_be_copied = self.handle_single_pf_object_or_path_input(grid_or_path)
     new_grid = self.copy_single_obj(grid_to_be_copied,target_folder,
@@ -60,16 +61,45 @@ class PFNetworkInterface(powfacpy.PFBaseInterface):
     new_network_diagram = self.copy_single_obj(grid_to_be_copied.pDiagram,
       grid_to_be_copied.pDiagram.GetParent(),new_name=new_name,overwrite=True)
     graphical_net_objects = self.get_obj("*.IntGrf",
-      parent_folder=new_network_diagram,include_subfolders=True)
-    for graphical_net_obj in graphical_net_objects:
-      element = graphical_net_obj.pDataObj
-      path_in_grid = self.get_path_between_objects(grid_to_be_copied,element)
-      graphical_net_obj.pDataObj = self.get_single_obj(path_in_grid,parent_folder=new_grid)
+      parent_folder=new_network_diagram,include_subfolders=True,
+      error_if_non_existent=False)
+    elements = [graphical_net_obj.pDataObj for graphical_net_obj in graphical_net_objects]
+    new_elements = self.get_corresponding_objs(elements,grid_to_be_copied,new_grid)
+    for element,new_element in zip(elements,new_elements):
+      if element is not None and new_element is None:
+        # Raises PFNotBelowObjectError if the element is outside of the grid
+        path_in_grid = self.get_path_between_objects(grid_to_be_copied,element)
+        raise powfacpy.PFNonExistingObjectError(new_grid,path_in_grid)
+    for graphical_net_obj,element,new_element in zip(graphical_net_objects,elements,
+      new_elements):
+      # Graphical objects without element (e.g. annotations) are not changed
+      if element is not None:
+        graphical_net_obj.pDataObj = new_element
     new_network_diagram.pDataFolder = new_grid
     new_grid.pDiagram = new_network_diagram
     return new_grid
 
   def get_parent_grid(self,obj_or_path):
+    """Returns the grid (ElmNet) that contains the object.
+    """
     obj_or_path = self.handle_single_pf_object_or_path_input(obj_or_path)
-    return self.get_upstream_obj(obj_or_path,lambda x: x.GetClassName == "IntNet")    
+    return self.get_upstream_obj(obj_or_path,lambda x: x.GetClassName() == "ElmNet")    
+
+  def get_parent_grids(self,objects_or_path,parent_folder=None,include_subfolders=False):
+    """Returns the grids (ElmNet) that contain the objects (in one pass,
+    see 'get_upstream_objs').
+    """
+    return self.get_upstream_objs(objects_or_path,
+      lambda x: x.GetClassName() == "ElmNet",
+      parent_folder=parent_folder,include_subfolders=include_subfolders)
+
+  def get_parent_substations(self,objects_or_path,parent_folder=None,
+    include_subfolders=False):
+    """Returns the substations (ElmSubstat or ElmTrfstat) that contain the
+    objects (e.g. terminals) in one pass (see 'get_upstream_objs').
+    None is returned for objects that are not inside a substation.
+    """
+    return self.get_upstream_objs(objects_or_path,
+      lambda x: x.GetClassName() in ("ElmSubstat","ElmTrfstat"),
+      parent_folder=parent_folder,include_subfolders=include_subfolders)
 
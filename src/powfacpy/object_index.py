@@ -0,0 +1,209 @@
+"""In-memory index of the objects of the active project.
+"""
+
+from functools import lru_cache
+import re
+
+import powfacpy
+
+
+class PFObjectIndex:
+  """Index of all objects of a project. It is built with one call of
+  'GetChildren' and one call of 'GetFullName' per object and contains
+    - the objects by full name (hash map)
+    - the children of every object (parent links)
+    - the objects partitioned by class name
+  so that paths (including wildcards) can be resolved without calls to
+  the PowerFactory API.
+
+  The index is kept up to date by the powfacpy methods that create, delete,
+  copy or rename objects (see 'add', 'remove' and 'update').
+  Warning: Changes of the database that are not made with powfacpy (e.g. 
+  objects created or renamed directly with the PF API or in the GUI) are
+  not in the index. 'PFBaseInterface.get_obj' only falls back to the 
+  database if the index returns no object, so such objects are silently
+  missing from non-empty results. Use 'update' (for a folder) or 'rebuild'
+  after such changes.
+  Wildcards have the same meaning as in PowerFactory: only "*" is a 
+  wildcard, all other characters (e.g. "[" or "?") are literal.
+
+  See also 'PFBaseInterface.enable_object_index'.
+  """
+
+  def __init__(self,project):
+    self.rebuild(project)
+
+  def rebuild(self,project=None):
+    """Rebuilds the index (for 'project' if specified, else for the
+    project of the index).
+    """
+    if project is not None:
+      self.project = project
+    self.project_name = self.project.GetFullName()
+    self._objects = {self.project_name:self.project}
+    self._children = {}
+    self._objects_by_class = {}
+    self._names = {}
+    self._add_objects(self.project.GetChildren(1,"*",1))
+
+  def _add_objects(self,objects):
+    for obj in objects:
+      self._add_full_name(obj.GetFullName(),obj)
+
+  def _add_full_name(self,full_name,obj):
+    if full_name in self._objects:
+      return
+    parent_name, _, name_incl_class = full_name.rpartition("\\")
+    loc_name, _, class_name = name_incl_class.rpartition(".")
+    self._objects[full_name] = obj
+    self._children.setdefault(parent_name,[]).append(full_name)
+    self._objects_by_class.setdefault(class_name,[]).append(full_name)
+    self._names.setdefault((parent_name,loc_name),[]).append(full_name)
+
+  def _remove_full_name(self,full_name):
+    for descendant in self._get_descendants(full_name):
+      self._remove_single_full_name(descendant)
+    self._remove_single_full_name(full_name)
+
+  def _remove_single_full_name(self,full_name):
+    if self._objects.pop(full_name,None) is None:
+      return
+    parent_name, _, name_incl_class = full_name.rpartition("\\")
+    loc_name, _, class_name = name_incl_class.rpartition(".")
+    self._children.pop(full_name,None)
+    self._discard(self._children,parent_name,full_name)
+    self._discard(self._objects_by_class,class_name,full_name)
+    self._discard(self._names,(parent_name,loc_name),full_name)
+
+  @staticmethod
+  def _discard(mapping,key,full_name):
+    full_names = mapping.get(key)
+    if full_names:
+      full_names.remove(full_name)
+      if not full_names:
+        del mapping[key]
+
+  def add(self,obj):
+    """Adds an object (and its contents) to the index.
+    """
+    self._add_full_name(obj.GetFullName(),obj)
+    self._add_objects(obj.GetChildren(1,"*",1))
+
+  def remove(self,obj):
+    """Removes an object (and its contents) from the index. This must
+    be called before the object is deleted.
+    """
+    self._remove_full_name(obj.GetFullName())
+
+  def update(self,folder):
+    """Reindexes the contents of a folder (e.g. after objects were copied
+    into the folder).
+    """
+    full_name = folder.GetFullName()
+    for descendant in self._get_descendants(full_name):
+      self._remove_single_full_name(descendant)
+    self._add_objects(folder.GetChildren(1,"*",1))
+
+  def _get_descendants(self,full_name):
+    descendants = []
+    stack = list(self._children.get(full_name,()))
+    while stack:
+      child = stack.pop()
+      descendants.append(child)
+      stack.extend(self._children.get(child,()))
+    return descendants
+
+  def get_objects_of_class(self,class_name):
+    """Returns all objects of a class (e.g. 'ElmTerm').
+    """
+    return [self._objects[name] for name in self._objects_by_class.get(class_name,())]
+
+  def get_obj(self,path,parent_path=None,include_subfolders=False):
+    """Returns the objects under 'path' (relative to the project or, if
+    specified, to 'parent_path', which is a path relative to the project).
+    Wildcards ("*") can be used in every segment of the path.
+    A segment matches an object if it matches its name or its name
+    including the class (e.g. 'Terminal*' or '*.ElmTerm').
+    If 'include_subfolders' is True, the last segment is matched against
+    all objects below the folder specified by the other segments.
+    """
+    if parent_path:
+      path = parent_path.strip("\\") + "\\" + path.lstrip("\\")
+    segments = path.lstrip("\\").split("\\")
+    folders = [self.project_name]
+    for segment in segments[:-1]:
+      folders = self._match_children(folders,segment)
+      if not folders:
+        return []
+    if not include_subfolders:
+      full_names = self._match_children(folders,segments[-1])
+    else:
+      full_names = self._match_descendants(folders,segments[-1])
+    return [self._objects[name] for name in full_names]
+
+  def exists(self,path,parent_path=None):
+    """Checks whether 'path' exists in the index.
+    """
+    return bool(self.get_obj(path,parent_path=parent_path))
+
+  def get_ancestors(self,obj):
+    """Returns the parent, grandparent, ... of 'obj' up to the project.
+    Returns an empty list if 'obj' is not in the index.
+    """
+    full_name = obj.GetFullName()
+    if full_name not in self._objects:
+      return []
+    ancestors = []
+    while full_name != self.project_name:
+      full_name = full_name.rpartition("\\")[0]
+      ancestors.append(self._objects[full_name])
+    return ancestors
+
+  def _match_children(self,folders,segment):
+    matches = []
+    if "*" not in segment:
+      for folder in folders:
+        full_name = folder + "\\" + segment
+        if full_name in self._objects:
+          matches.append(full_name)
+        matches.extend(name for name in self._names.get((folder,segment),())
+          if name != full_name)
+      return matches
+    for folder in folders:
+      matches.extend(name for name in self._children.get(folder,())
+        if self._matches(name,segment))
+    return matches
+
+  def _match_descendants(self,folders,segment):
+    _, dot, class_pattern = segment.rpartition(".")
+    if dot and class_pattern in self._objects_by_class:
+      # Use the class partition instead of walking the folders
+      candidates = self._objects_by_class[class_pattern]
+      prefixes = tuple(folder + "\\" for folder in folders)
+      return [name for name in candidates
+        if name.startswith(prefixes) and self._matches(name,segment)]
+    matches = []
+    for folder in folders:
+      matches.extend(name for name in self._get_descendants(folder)
+        if self._matches(name,segment))
+    return matches
+
+  @staticmethod
+  def _matches(full_name,segment):
+    name_incl_class = full_name.rpartition("\\")[2]
+    regex, includes_class = PFObjectIndex._compile_segment(segment)
+    if not includes_class:
+      return regex.fullmatch(name_incl_class.rpartition(".")[0]) is not None
+    return regex.fullmatch(name_incl_class) is not None
+
+  @staticmethod
+  @lru_cache(maxsize=256)
+  def _compile_segment(segment):
+    """Returns (regular expression, whether the segment includes a class)
+    of a path segment (see 'PFStringManipuilation.wildcard_to_regex').
+    """
+    to_regex = powfacpy.PFStringManipuilation.wildcard_to_regex
+    name_pattern, dot, class_pattern = segment.rpartition(".")
+    if not dot:
+      return re.compile(to_regex(segment)),False
+    return re.compile(to_regex(name_pattern or "*") + "\\." + to_regex(class_pattern)),True
@@ -1,12 +1,9 @@
 """Plotting interface.
 """
 
-import sys
-from unittest import result
-
 from powfacpy.base_interface import PFTranslator
 from powfacpy.dyn_sim_interface import PFDynSimInterface
-sys.path.insert(0,r'.\src')
+from powfacpy.downsampling import downsample
 import powfacpy
 import pandas
 from matplotlib import pyplot
@@ -150,7 +147,7 @@ class PFPlotInterface(powfacpy.PFBaseInterface):
       results_obj = kwargs["results_obj"]
     else:
       results_obj = None
-    self.add_results_variable(obj,variables,results_obj=results_obj)
+    self.add_results_variable(obj,variables,results_obj=results_obj,load_elmres=False)
     self.plot_monitored_variables(obj,variables,
       graphics_page=graphics_page,plot=plot,**kwargs) 
   
@@ -388,28 +385,41 @@ class PFPlotInterface(powfacpy.PFBaseInterface):
       clear_target_graphics_board=clear_target_graphics_board)
 
   @staticmethod
-  def plot_from_csv(csv_path,variables,offset=0,plot_interface=None):
+  def plot_from_csv(csv_path,variables,offset=0,plot_interface=None,max_points=None,
+    downsampling="minmax"):
     """Plot results from csv file using pyplot.
     Arguments:
       csv_path: path of csv file
       variables: path of variables to be plotted
       offset: time offset
+      max_points: If specified, every curve is downsampled to about 
+        'max_points' points before plotting (e.g. the width of the plot
+        in pixels), see module 'downsampling'.
+      downsampling: downsampling method ("minmax" keeps all peaks, "lttb")
 
     Returns the plot.
 
     Example:
       plot_from_csv("results.csv",
         ["Network Model\\Network Data\\Grid\\AC Voltage Source\\s:u0",
-        "Network Model\\Network Data\\Grid\\AC Voltage Source\\m:Psum:bus1"])  
+        "Network Model\\Network Data\\Grid\\AC Voltage Source\\m:Psum:bus1"],
+        max_points=2000)  
     """
     if not plot_interface:
       plot_interface = pyplot
     if isinstance(variables, str):
       variables = [variables]
-    with open(csv_path) as file:
-      csv_file = pandas.read_csv(file)
-      for var in variables:
-        plot = plot_interface.plot(csv_file["Time"]+offset, csv_file[var], label = var)   
+    # Only the plotted columns are parsed
+    csv_file = powfacpy.PFBaseInterface.read_elmres_csv(csv_path,
+      columns=["Time"] + list(variables))
+    time = csv_file["Time"].to_numpy() + offset
+    for var in variables:
+      values = csv_file[var].to_numpy()
+      if max_points:
+        time_downsampled,values = downsample(time,values,max_points,method=downsampling)
+      else:
+        time_downsampled = time
+      plot = plot_interface.plot(time_downsampled, values, label = var)   
     return plot
 
   def get_data_series_from_plot(self,plot=None,indexes=None,include_curve_options=False):
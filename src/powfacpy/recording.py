@@ -0,0 +1,338 @@
+"""Record and replay of PowerFactory API sessions.
+
+A recorder wraps the PF app and logs every API call (including reading and
+setting attributes) with its arguments, return value (or raised error) and
+latency. PF objects are stored as object ids, so the identity of objects is
+preserved. The trace is saved as gzip compressed msgpack (if the package
+'msgpack' is installed) or JSON.
+
+A replayer serves the recorded calls without PowerFactory, so that powfacpy
+code paths can be profiled and optimized offline with real call sequences.
+
+Example (with PowerFactory):
+  recorder = powfacpy.PFAPIRecorder(app)
+  pfsc = powfacpy.PFStudyCases(recorder.app)
+  ...
+  pfsc.create_cases()
+  recorder.save("create_cases.trace")
+Example (without PowerFactory):
+  replayer = powfacpy.PFAPIReplayer("create_cases.trace")
+  pfsc = powfacpy.PFStudyCases(replayer.app)
+  ...
+  pfsc.create_cases()
+
+By default, the replayer serves the results of a call from the recorded
+calls with the same object, method and arguments in the recorded order
+(and repeats the last result if a call is made more often than recorded),
+so that the replay also works if powfacpy makes fewer or reordered calls.
+With 'strict=True', the calls must be made in exactly the recorded order.
+"""
+
+import builtins
+import gzip
+import json
+import time
+from collections import deque
+
+from powfacpy.exceptions import PFReplayMismatchError
+
+try:
+  import msgpack
+except ImportError:
+  msgpack = None
+
+TRACE_FORMAT = "powfacpy-api-trace"
+TRACE_VERSION = 1
+# Marker of PF objects in the trace ({"__pfobj__": object id})
+OBJECT_MARKER = "__pfobj__"
+# Event kinds
+RESULT = 0
+ERROR = 1
+# Pseudo methods for attribute access and special methods
+GETATTR = "__getattr__"
+SETATTR = "__setattr__"
+STR = "__str__"
+
+
+class PFAPIRecorder:
+  """Records the PF API calls made through 'app' (the wrapped PF app).
+  Arguments:
+    app: PF app
+  """
+
+  def __init__(self,app):
+    self.events = []
+    self.methods = set()
+    self._objects = []
+    self._oids = {}
+    self._oids_by_id = {}
+    self.app = PFRecordingObject(self,app,self._get_oid(app))
+
+  def _get_oid(self,obj):
+    """Returns the object id of a PF object. Objects that are equal
+    (e.g. different Python wrappers of the same PF object) get the same id.
+    """
+    try:
+      oid = self._oids.get(obj)
+    except(TypeError): # unhashable object
+      oid = self._oids_by_id.get(id(obj))
+    if oid is None:
+      oid = len(self._objects)
+      self._objects.append(obj) # keep a reference so that the id is not reused
+      try:
+        self._oids[obj] = oid
+      except(TypeError):
+        self._oids_by_id[id(obj)] = oid
+    return oid
+
+  def _encode(self,value):
+    value_type = type(value)
+    if value is None or value_type in (bool,int,float,str):
+      return value
+    if value_type is PFRecordingObject:
+      return {OBJECT_MARKER:value._oid}
+    if value_type is list or value_type is tuple:
+      return [self._encode(v) for v in value]
+    if hasattr(value_type,"GetClassName"):
+      return {OBJECT_MARKER:self._get_oid(value)}
+    return repr(value)
+
+  def _wrap(self,value):
+    if hasattr(type(value),"GetClassName") and type(value) is not PFRecordingObject:
+      return PFRecordingObject(self,value,self._get_oid(value))
+    if type(value) is list:
+      return [self._wrap(v) for v in value]
+    return value
+
+  def add_event(self,oid,name,args,kind,value,duration):
+    self.events.append([oid,name,self._encode(list(args)),kind,value,duration])
+
+  def record(self,oid,name,args,function):
+    """Calls 'function' and records the call as an event.
+    """
+    start = time.perf_counter()
+    try:
+      result = function()
+    except Exception as e:
+      self.add_event(oid,name,args,ERROR,[type(e).__name__,str(e)],
+        time.perf_counter() - start)
+      raise
+    duration = time.perf_counter() - start
+    self.add_event(oid,name,args,RESULT,self._encode(result),duration)
+    return self._wrap(result)
+
+  def save(self,file_path):
+    """Saves the trace to 'file_path' (gzip compressed msgpack if 
+    available, else JSON).
+    """
+    trace = {
+      "format":TRACE_FORMAT,
+      "version":TRACE_VERSION,
+      "number_of_objects":len(self._objects),
+      "methods":sorted(self.methods),
+      "events":self.events,
+    }
+    if msgpack is not None:
+      data = msgpack.packb(trace,use_bin_type=True)
+    else:
+      data = json.dumps(trace,separators=(",",":")).encode("utf-8")
+    with gzip.open(file_path,"wb") as file:
+      file.write(data)
+
+
+class PFRecordingObject:
+  """Proxy of the PF app or of a PF object that records its API calls
+  (see 'PFAPIRecorder').
+  """
+  __slots__ = ("_recorder","_obj","_oid")
+
+  def __init__(self,recorder,obj,oid):
+    object.__setattr__(self,"_recorder",recorder)
+    object.__setattr__(self,"_obj",obj)
+    object.__setattr__(self,"_oid",oid)
+
+  def __getattr__(self,name):
+    recorder = self._recorder
+    start = time.perf_counter()
+    try:
+      value = getattr(self._obj,name)
+    except Exception as e:
+      recorder.add_event(self._oid,GETATTR,[name],ERROR,[type(e).__name__,str(e)],
+        time.perf_counter() - start)
+      raise
+    duration = time.perf_counter() - start
+    if callable(value) and not hasattr(type(value),"GetClassName"):
+      recorder.methods.add(name)
+      def recorded_method(*args):
+        native_args = [_unwrap(arg) for arg in args]
+        return recorder.record(self._oid,name,args,lambda: value(*native_args))
+      return recorded_method
+    recorder.add_event(self._oid,GETATTR,[name],RESULT,recorder._encode(value),duration)
+    return recorder._wrap(value)
+
+  def __setattr__(self,name,value):
+    obj = self._obj
+    self._recorder.record(self._oid,SETATTR,[name,value],
+      lambda: setattr(obj,name,_unwrap(value)))
+
+  def __str__(self):
+    return self._recorder.record(self._oid,STR,[],lambda: str(self._obj))
+
+  def __eq__(self,other):
+    return self._obj == _unwrap(other)
+
+  def __hash__(self):
+    return hash(self._oid)
+
+  def __repr__(self):
+    return f"PFRecordingObject({self._obj!r})"
+
+
+def _unwrap(value):
+  value_type = type(value)
+  if value_type is PFRecordingObject:
+    return value._obj
+  if value_type is list or value_type is tuple:
+    return value_type(_unwrap(v) for v in value)
+  return value
+
+
+class PFAPIReplayer:
+  """Serves the PF API calls of a recorded trace (see 'PFAPIRecorder')
+  through 'app' (replay app).
+  Arguments:
+    file_path: path of the trace
+    strict: If True, the calls must be made in the recorded order.
+    simulate_latency: If True, every call takes as long as it took
+      when it was recorded (e.g. to compare the run time with PF).
+  """
+
+  def __init__(self,file_path,strict=False,simulate_latency=False):
+    trace = self.read_trace(file_path)
+    if trace.get("format") != TRACE_FORMAT:
+      raise ValueError(f"'{file_path}' is not a powfacpy API trace.")
+    self.strict = strict
+    self.simulate_latency = simulate_latency
+    self.methods = set(trace["methods"])
+    self.events = trace["events"]
+    self.number_of_calls = 0
+    self._position = 0
+    self._objects = {}
+    self._results = {}
+    for event in self.events:
+      self._results.setdefault(self._get_key(event[0],event[1],event[2]),
+        deque()).append(event)
+    self.app = self._get_object(0)
+
+  @staticmethod
+  def read_trace(file_path):
+    with gzip.open(file_path,"rb") as file:
+      data = file.read()
+    if data[:1] == b"{":
+      return json.loads(data)
+    if msgpack is None:
+      raise ImportError(f"The package 'msgpack' is required to read '{file_path}'.")
+    return msgpack.unpackb(data,raw=False,strict_map_key=False)
+
+  def _get_object(self,oid):
+    obj = self._objects.get(oid)
+    if obj is None:
+      obj = self._objects[oid] = PFReplayObject(self,oid)
+    return obj
+
+  def _get_key(self,oid,name,encoded_args):
+    return (oid,name,json.dumps(encoded_args,separators=(",",":")))
+
+  def _encode(self,value):
+    value_type = type(value)
+    if value_type is PFReplayObject:
+      return {OBJECT_MARKER:value._oid}
+    if value_type is list or value_type is tuple:
+      return [self._encode(v) for v in value]
+    if value is None or value_type in (bool,int,float,str):
+      return value
+    return repr(value)
+
+  def _decode(self,value):
+    value_type = type(value)
+    if value_type is dict and OBJECT_MARKER in value:
+      return self._get_object(value[OBJECT_MARKER])
+    if value_type is list:
+      return [self._decode(v) for v in value]
+    return value
+
+  def has_method(self,name):
+    return name in self.methods
+
+  def has_attribute(self,oid,name):
+    return (oid,GETATTR,json.dumps([name],separators=(",",":"))) in self._results
+
+  def replay(self,oid,name,args):
+    """Returns the recorded result of a call (or raises the recorded error).
+    """
+    encoded_args = self._encode(list(args))
+    if self.strict:
+      event = self._get_next_event(oid,name,encoded_args)
+    else:
+      events = self._results.get(self._get_key(oid,name,encoded_args))
+      if not events:
+        raise PFReplayMismatchError(oid,name,encoded_args)
+      event = events.popleft() if len(events) > 1 else events[0]
+    self.number_of_calls += 1
+    if self.simulate_latency:
+      time.sleep(event[5])
+    if event[3] == ERROR:
+      error_name,message = event[4]
+      error_type = getattr(builtins,error_name,None)
+      if not (isinstance(error_type,type) and issubclass(error_type,Exception)):
+        error_type = RuntimeError
+      raise error_type(message)
+    return self._decode(event[4])
+
+  def _get_next_event(self,oid,name,encoded_args):
+    if self._position >= len(self.events):
+      raise PFReplayMismatchError(oid,name,encoded_args,
+        "The call was made after the end of the trace.")
+    event = self.events[self._position]
+    if event[0] != oid or event[1] != name or event[2] != encoded_args:
+      raise PFReplayMismatchError(oid,name,encoded_args,
+        f"Expected call of '{event[1]}' of object {event[0]} with arguments "
+        f"{event[2]} (call number {self._position}).")
+    self._position += 1
+    return event
+
+
+class PFReplayObject:
+  """Replay of the PF app or of a PF object (see 'PFAPIReplayer').
+  """
+  __slots__ = ("_replayer","_oid")
+
+  def __init__(self,replayer,oid):
+    object.__setattr__(self,"_replayer",replayer)
+    object.__setattr__(self,"_oid",oid)
+
+  def GetClassName(self):
+    return self._replayer.replay(self._oid,"GetClassName",[])
+
+  def __getattr__(self,name):
+    replayer = self._replayer
+    if replayer.has_method(name):
+      return lambda *args: replayer.replay(self._oid,name,args)
+    if not replayer.has_attribute(self._oid,name):
+      raise AttributeError(f"The attribute '{name}' was not recorded.")
+    return replayer.replay(self._oid,GETATTR,[name])
+
+  def __setattr__(self,name,value):
+    self._replayer.replay(self._oid,SETATTR,[name,value])
+
+  def __str__(self):
+    return self._replayer.replay(self._oid,STR,[])
+
+  def __eq__(self,other):
+    return type(other) is PFReplayObject and self._oid == other._oid
+
+  def __hash__(self):
+    return hash(self._oid)
+
+  def __repr__(self):
+    return f"PFReplayObject({self._oid})"
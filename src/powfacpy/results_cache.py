@@ -0,0 +1,195 @@
+"""On-disk cache of results columns extracted from results objects (ElmRes).
+
+Every column is stored as a .npy file in the cache directory, so that
+later reads (also from other Python processes) return read-only memory
+maps of the files, which share the memory of the operating system's page
+cache instead of holding a copy of the results in every process. The 
+entries are keyed by
+  (study case, results object, element, variable)
+(full names of the PF objects) and stamped with a fingerprint of the
+results object and a checksum of all values of the column (see 
+'PFResultsSession.get_column_stamp'). An entry is only returned if its 
+stamp matches, so that results of another simulation (also on the same
+time grid, run by another process or in the GUI) are never returned.
+Note that the column is therefore read from PowerFactory (once per 
+results session) to verify the entry.
+
+The directory contains an index file ('index.json') with the keys, stamps
+and sizes of the entries. It is written after every 'put' or, when many 
+columns are added, once by 'flush'. The time of the last access of an entry is the
+modification time of its file. If the total size of the files exceeds
+'max_size', the least recently used entries are deleted.
+
+Example:
+  pfri.enable_results_cache("C:\\results_cache",max_size=2*1024**3)
+  with pfri.get_results_session() as session:
+    voltage = session.get_array("Network Model\\Network Data\\Grid\\Terminal","m:u")
+"""
+
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from powfacpy.caching import PFCacheInfo
+
+INDEX_FILE = "index.json"
+
+
+class PFResultsCache:
+  """Cache of results columns in a directory (see module docstring).
+  Arguments:
+    cache_dir: directory of the cache (created if it does not exist)
+    max_size: maximum total size of the cached files in bytes
+  """
+
+  def __init__(self,cache_dir,max_size=2**30):
+    if max_size < 1:
+      raise ValueError("The size of the results cache must be at least 1 byte.")
+    self.cache_dir = cache_dir
+    self.max_size = max_size
+    self.hits = 0
+    self.misses = 0
+    os.makedirs(cache_dir,exist_ok=True)
+    self._index = self._read_index()
+    self._size = sum(entry["size"] for entry in self._index.values())
+    self._index_changed = False
+
+  @staticmethod
+  def get_file_name(key):
+    """Returns the name of the file of a key (tuple of strings).
+    """
+    key_str = json.dumps(list(key),separators=(",",":"))
+    return hashlib.sha1(key_str.encode("utf-8")).hexdigest() + ".npy"
+
+  def get(self,key,stamp):
+    """Returns a read-only memory map of the cached column or None if the
+    key is not cached or the stamp does not match.
+    """
+    file_name = self.get_file_name(key)
+    entry = self._index.get(file_name)
+    if entry is None or entry["stamp"] != list(stamp):
+      self.misses += 1
+      return None
+    path = os.path.join(self.cache_dir,file_name)
+    try:
+      array = np.load(path,mmap_mode="r")
+      os.utime(path)
+    except(OSError,ValueError): # file was deleted or is corrupt
+      self._size -= self._index.pop(file_name)["size"]
+      self._index_changed = True
+      self.misses += 1
+      return None
+    self.hits += 1
+    return array
+
+  def put(self,key,stamp,array,write_index=True):
+    """Writes a column to the cache and returns a read-only memory map of
+    it. If the cache is full, the least recently used entries are deleted.
+    If the file cannot be written (e.g. because an old version is still
+    mapped on Windows), the array is returned and not cached.
+    If 'write_index' is False, the index file is only written by 'flush'
+    (e.g. after adding many columns).
+    """
+    array = np.ascontiguousarray(array,dtype=np.float64)
+    file_name = self.get_file_name(key)
+    path = os.path.join(self.cache_dir,file_name)
+    temp_path = path + f".{os.getpid()}.tmp"
+    try:
+      with open(temp_path,"wb") as file:
+        np.save(file,array)
+      os.replace(temp_path,path)
+    except(OSError):
+      if os.path.exists(temp_path):
+        os.remove(temp_path)
+      return array
+    old_entry = self._index.get(file_name)
+    if old_entry is not None:
+      self._size -= old_entry["size"]
+    self._index[file_name] = {"key":list(key),"stamp":list(stamp),
+      "size":os.path.getsize(path)}
+    self._size += self._index[file_name]["size"]
+    self._index_changed = True
+    self.evict(keep=file_name)
+    if write_index:
+      self.flush()
+    return np.load(path,mmap_mode="r")
+
+  def flush(self):
+    """Writes the index file if entries were added or removed.
+    """
+    if self._index_changed:
+      self._write_index()
+
+  def evict(self,keep=None):
+    """Deletes the least recently used entries until the total size is not
+    larger than 'max_size' (the entry with file name 'keep' is not deleted).
+    """
+    size = self.get_size()
+    if size <= self.max_size:
+      return
+    entries = sorted((self._get_last_access(file_name),file_name)
+      for file_name in self._index if file_name != keep)
+    for _,file_name in entries:
+      if size <= self.max_size:
+        break
+      size -= self._index[file_name]["size"]
+      self._remove(file_name)
+
+  def clear(self):
+    """Deletes all entries (the hit/miss statistics are kept).
+    """
+    for file_name in list(self._index):
+      self._remove(file_name)
+    self.flush()
+
+  def get_size(self):
+    """Returns the total size of the cached files in bytes.
+    """
+    return self._size
+
+  def info(self):
+    """Returns the hit/miss statistics and the size of the cache in bytes
+    (PFCacheInfo).
+    """
+    return PFCacheInfo(self.hits,self.misses,self.max_size,self.get_size())
+
+  def _get_last_access(self,file_name):
+    try:
+      return os.path.getmtime(os.path.join(self.cache_dir,file_name))
+    except(OSError):
+      return 0.0
+
+  def _remove(self,file_name):
+    self._size -= self._index.pop(file_name)["size"]
+    self._index_changed = True
+    try:
+      os.remove(os.path.join(self.cache_dir,file_name))
+    except(OSError): # already deleted or still mapped (Windows)
+      pass
+
+  def _read_index(self):
+    try:
+      with open(os.path.join(self.cache_dir,INDEX_FILE)) as file:
+        index = json.load(file)
+    except(OSError,ValueError):
+      return {}
+    return {file_name:entry for file_name,entry in index.items()
+      if os.path.exists(os.path.join(self.cache_dir,file_name))}
+
+  def _write_index(self):
+    """Writes the index. Entries that were added to the index file by
+    other processes (and whose files exist) are kept.
+    """
+    for file_name,entry in self._read_index().items():
+      if file_name not in self._index:
+        self._index[file_name] = entry
+        self._size += entry["size"]
+    path = os.path.join(self.cache_dir,INDEX_FILE)
+    temp_path = path + f".{os.getpid()}.{time.time_ns()}.tmp"
+    with open(temp_path,"w") as file:
+      json.dump(self._index,file)
+    os.replace(temp_path,path)
+    self._index_changed = False
@@ -1,13 +1,21 @@
-import sys
-sys.path.insert(0,r'.\src')
+from collections import OrderedDict
+import hashlib
+
 import powfacpy
 import numpy as np
 
+from powfacpy.results_cache import PFResultsCache
+
 
 class PFResultsInterface(powfacpy.PFBaseInterface):
 
   def __init__(self, app):
     super().__init__(app)
+    self._intvec_pool = {}
+    self._results_sessions = OrderedDict()
+    # Maximum number of results sessions kept open (see 'get_results_session')
+    self.max_results_sessions = 4
+    self.results_cache = None
 
   def get_list_with_results_of_variable(self,obj,variable,results_obj=None,load_elmres=True):
     if not results_obj:
@@ -21,17 +29,712 @@ class PFResultsInterface(powfacpy.PFBaseInterface):
       results_obj = self.app.GetFromStudyCase("ElmRes")
     if load_elmres:  
       results_obj.Load()   
-    intvec = self.create_in_folder(results_obj.GetParent(),"test.IntVec",overwrite=True) 
+    intvec = self.get_pooled_intvec(results_obj.GetParent())
     results_obj.GetColumnValues(intvec,column) 
-    list = intvec.V
-    intvec.Delete()
-    return list
+    values = intvec.V
+    self._clear_unused_intvec_pool()
+    return values
+
+  def get_results_matrix(self,elements_and_variables,results_obj=None,load_elmres=True,
+    include_time=False):
+    """Returns the results of many variables as a 2-D NumPy array (float64)
+    with one row per time step and one column per variable.
+    The results object is loaded only once, every column is found with
+    'FindColumn' and all columns are read with the same (pooled) IntVec.
+    Arguments:
+      elements_and_variables: list of tuples (object or path, variable) or
+        dictionary {object or path: variable or list of variables}
+      results_obj: results object (ElmRes, object or path). By default,
+        the ElmRes of the active study case is used.
+      load_elmres: If False, the results object must already be loaded.
+      include_time: If True, the first column contains the time.
+
+    Example:
+      matrix = pfri.get_results_matrix([
+        ("Network Model\\Network Data\\Grid\\Terminal 1","m:u"),
+        ("Network Model\\Network Data\\Grid\\Terminal 2","m:u")],
+        include_time=True)
+
+    Raises PFResultsColumnNotFoundError if a variable is not recorded.
+    """
+    results_obj = self._get_results_obj(results_obj)
+    if load_elmres:
+      results_obj.Load()
+    columns = self.get_results_columns(elements_and_variables,results_obj)
+    if include_time:
+      columns = [-1] + columns
+    return self.read_results_columns(results_obj,columns)
+
+  def get_results_kpis(self,elements_and_variables,results_obj=None,load_elmres=True,
+    **kwargs):
+    """Returns dynamic performance KPIs of the variables (see module 
+    'kpis') as a tidy pandas DataFrame. The signals are named like the
+    columns of 'to_dataframe' (path of the element and variable).
+    Arguments:
+      elements_and_variables: see 'get_results_matrix'
+      kwargs: arguments of 'powfacpy.kpis.compute_kpis' (e.g. 'kpis', 
+        'start_time', 'band')
+
+    Example:
+      kpis = pfri.get_results_kpis(
+        {"Network Model\\Network Data\\Grid\\Terminal":"m:u"},
+        kpis=["overshoot","settling_time","time_outside_band"],band=(0.9,1.1))
+    """
+    from powfacpy.kpis import compute_kpis
+    elements_and_variables = self._get_elements_and_variables(elements_and_variables)
+    matrix = self.get_results_matrix(elements_and_variables,results_obj=results_obj,
+      load_elmres=load_elmres,include_time=True)
+    paths = powfacpy.PFStringManipuilation.format_full_paths(
+      [element.GetFullName() for element,_ in elements_and_variables],self)
+    signal_names = [path + "\\" + variable
+      for path,(_,variable) in zip(paths,elements_and_variables)]
+    return compute_kpis(matrix[:,0],matrix[:,1:],signal_names=signal_names,**kwargs)
+
+  def get_aligned_results(self,study_cases,elements_and_variables,results_obj_name=None,
+    time_grid=None,memmap_path=None):
+    """Reads the results of the variables from the results objects of
+    many study cases and interpolates them onto a common time grid (see
+    module 'case_comparison'). Returns (time grid, array cases x time x 
+    signals), which can be evaluated with 'powfacpy.get_case_statistics'.
+    Arguments:
+      study_cases: list of study cases (objects or paths, e.g. 
+        'PFStudyCases.study_cases')
+      elements_and_variables: see 'get_results_matrix'
+      results_obj_name: name of the results object in the study cases
+        (by default 'All calculations')
+      time_grid, memmap_path: see 'powfacpy.align_cases'
+
+    Example:
+      time,aligned = pfri.get_aligned_results(pfsc.study_cases,
+        {"Network Model\\Network Data\\Grid\\Terminal":"m:u"})
+      statistics = powfacpy.get_case_statistics(aligned,reference=0)
+    """
+    from powfacpy.case_comparison import align_cases
+    if not results_obj_name:
+      results_obj_name = powfacpy.PFTranslator.get_default_result_object_name(self.language)
+    elements_and_variables = self._get_elements_and_variables(elements_and_variables)
+    times = []
+    values_of_cases = []
+    for study_case in study_cases:
+      results_obj = self.get_single_obj(results_obj_name,parent_folder=study_case)
+      # The session is closed (and the results object released) after reading
+      with self.get_results_session(results_obj) as session:
+        matrix = session.get_matrix(elements_and_variables,include_time=True)
+      times.append(matrix[:,0])
+      values_of_cases.append(matrix[:,1:])
+    return align_cases(times,values_of_cases,time_grid=time_grid,memmap_path=memmap_path)
+
+  def read_results_columns(self,results_obj,columns):
+    """Returns the columns (indices) of a loaded results object as a 2-D
+    NumPy array (float64) with one row per time step.
+    """
+    matrix = np.empty((results_obj.GetNumberOfRows(),len(columns)),dtype=np.float64)
+    intvec = self.get_pooled_intvec(results_obj.GetParent())
+    for col_num,column in enumerate(columns):
+      results_obj.GetColumnValues(intvec,column)
+      matrix[:,col_num] = intvec.V
+    self._clear_unused_intvec_pool()
+    return matrix
+
+  def iter_results_chunks(self,elements_and_variables,chunk_size=65536,results_obj=None,
+    load_elmres=True,include_time=False,start_row=0,stop_row=None):
+    """Yields the results of many variables in chunks of rows, so that
+    the memory use is bounded independent of the length of the simulation.
+    Each chunk is a tuple (first row, 2-D NumPy array (float64) with up to
+    'chunk_size' rows and one column per variable).
+    The values are read with 'GetValue' row by row (one API call per value),
+    because 'GetColumnValues' always returns complete columns. For results
+    that fit into memory, 'get_results_matrix' is faster.
+    Arguments:
+      elements_and_variables: see 'get_results_matrix'
+      chunk_size: number of rows per chunk
+      include_time: If True, the first column contains the time.
+      start_row, stop_row: range of rows that is read (by default all)
+
+    Example:
+      for first_row,chunk in pfri.iter_results_chunks(
+        [("Network Model\\Network Data\\Grid\\Terminal","m:u")]):
+        max_voltage = max(max_voltage,chunk.max())
+    """
+    if chunk_size < 1:
+      raise ValueError("The chunk size must be at least 1.")
+    results_obj = self._get_results_obj(results_obj)
+    if load_elmres:
+      results_obj.Load()
+    columns = self.get_results_columns(elements_and_variables,results_obj)
+    if include_time:
+      columns = [-1] + columns
+    return self._iter_column_chunks(results_obj,columns,chunk_size,start_row,stop_row)
+
+  @staticmethod
+  def _iter_column_chunks(results_obj,columns,chunk_size,start_row=0,stop_row=None):
+    number_of_rows = results_obj.GetNumberOfRows()
+    if stop_row is None or stop_row > number_of_rows:
+      stop_row = number_of_rows
+    get_value = results_obj.GetValue
+    for first_row in range(start_row,stop_row,chunk_size):
+      last_row = min(first_row + chunk_size,stop_row)
+      chunk = np.empty((last_row - first_row,len(columns)),dtype=np.float64)
+      for chunk_row,row in enumerate(range(first_row,last_row)):
+        chunk[chunk_row] = [get_value(row,column)[1] for column in columns]
+      yield first_row,chunk
+
+  def read_results_to_memmap(self,elements_and_variables,file_path,results_obj=None,
+    load_elmres=True,include_time=False,chunk_size=None):
+    """Writes the results of many variables to a .npy file and returns
+    it as a memory map (rows: time steps, columns: variables), so that
+    the results do not need to fit into memory.
+    By default, the file is filled column by column with 'GetColumnValues'
+    (the peak memory use is one column as a Python list). If 'chunk_size'
+    is given, the values are read in chunks of rows (see 
+    'iter_results_chunks'), so that the memory use is bounded for 
+    arbitrarily long columns (but one API call per value is made).
+    Arguments:
+      elements_and_variables: see 'get_results_matrix'
+      file_path: path of the .npy file
+
+    Example:
+      results = pfri.read_results_to_memmap(
+        [("Network Model\\Network Data\\Grid\\Terminal","m:u")],"results.npy",
+        include_time=True)
+    """
+    results_obj = self._get_results_obj(results_obj)
+    if load_elmres:
+      results_obj.Load()
+    columns = self.get_results_columns(elements_and_variables,results_obj)
+    if include_time:
+      columns = [-1] + columns
+    memmap = np.lib.format.open_memmap(file_path,mode="w+",dtype=np.float64,
+      shape=(results_obj.GetNumberOfRows(),len(columns)))
+    if chunk_size:
+      for first_row,chunk in self._iter_column_chunks(results_obj,columns,chunk_size):
+        memmap[first_row:first_row + len(chunk)] = chunk
+    else:
+      intvec = self.get_pooled_intvec(results_obj.GetParent())
+      for col_num,column in enumerate(columns):
+        results_obj.GetColumnValues(intvec,column)
+        memmap[:,col_num] = intvec.V
+      self._clear_unused_intvec_pool()
+    memmap.flush()
+    return memmap
+
+  def get_results_columns(self,elements_and_variables,results_obj):
+    """Returns the column indices of the variables in a (loaded) results
+    object (see 'get_results_matrix' for the format of 
+    'elements_and_variables').
+    """
+    columns = []
+    for element,variable in self._get_elements_and_variables(elements_and_variables):
+      column = results_obj.FindColumn(element,variable)
+      if column < 0:
+        raise powfacpy.PFResultsColumnNotFoundError(element,variable,self)
+      columns.append(column)
+    return columns
+
+  def to_dataframe(self,results_obj=None,variables=None,lazy=False):
+    """Returns the results as a pandas DataFrame with the time (b:tnow)
+    as index ("Time") and one column per variable. The columns are named
+    like the headers of the csv files formatted by 'format_csv_for_elmres'
+    (path of the element relative to the project and variable, e.g.
+    'Network Model\\Network Data\\Grid\\Terminal\\m:u'), so that the
+    values are not converted to text and back as with 'export_to_csv'.
+    Arguments:
+      results_obj: results object (ElmRes, object or path). By default,
+        the ElmRes of the active study case is used.
+      variables: None (all recorded variables), variable name or list of
+        variable names (e.g. "m:u", all elements) or elements and 
+        variables in the format of 'get_results_matrix'
+      lazy: If True, a PFResultsFrame is returned that reads the columns 
+        from the results object when they are first accessed.
+
+    Example:
+      df = pfri.to_dataframe(variables="m:u")
+      frame = pfri.to_dataframe(lazy=True)
+      voltage = frame["Network Model\\Network Data\\Grid\\Terminal\\m:u"]
+    """
+    frame = PFResultsFrame(self.get_results_session(results_obj),variables)
+    if lazy:
+      return frame
+    return frame.to_dataframe()
+
+  def get_results_session(self,results_obj=None):
+    """Returns a session (PFResultsSession) for reading results from
+    'results_obj' (ElmRes, object or path; by default the ElmRes of the
+    active study case). The sessions are kept open, so that a results
+    object is loaded only once and the column indices are found only once
+    when results are read repeatedly. If more than 'max_results_sessions'
+    sessions are open, the least recently used session is closed (and its
+    results object released).
+
+    Example:
+      session = pfri.get_results_session()
+      voltage = session.get_list("Network Model\\Network Data\\Grid\\Terminal","m:u")
+      power = session.get_list("Network Model\\Network Data\\Grid\\Load","m:P:bus1")
+      session.close()
+    """
+    results_obj = self._get_results_obj(results_obj)
+    try:
+      session = self._results_sessions.get(results_obj)
+    except(TypeError): # unhashable results object
+      return PFResultsSession(results_obj,self)
+    if session is None:
+      session = PFResultsSession(results_obj,self)
+    self._add_results_session(session)
+    return session
+
+  def enable_results_cache(self,cache_dir,max_size=2**30):
+    """Enables the on-disk cache of results columns (see module 
+    'results_cache'). Results sessions (see 'get_results_session') then 
+    return the columns as read-only memory maps of files in 'cache_dir'
+    and extract them from PowerFactory only if they are not cached or if
+    the results object changed. If the total size of the cached files
+    exceeds 'max_size' (bytes), the least recently used files are deleted.
+    """
+    self.results_cache = PFResultsCache(cache_dir,max_size=max_size)
+    return self.results_cache
+
+  def disable_results_cache(self):
+    """Disables the on-disk cache of results columns (the cached files
+    are kept).
+    """
+    self.results_cache = None
+
+  def close_results_sessions(self):
+    """Closes all open results sessions (see 'get_results_session').
+    """
+    sessions = list(self._results_sessions.values())
+    self._results_sessions.clear()
+    for session in sessions:
+      session.release()
+    self.clear_intvec_pool()
+
+  def _add_results_session(self,session):
+    """Adds a session to the open sessions (or marks it as most recently
+    used) and closes the least recently used sessions if there are more
+    than 'max_results_sessions'.
+    """
+    try:
+      open_session = self._results_sessions.get(session.results_obj)
+    except(TypeError): # unhashable results object
+      return
+    if open_session is not None and open_session is not session:
+      open_session.release()
+    self._results_sessions[session.results_obj] = session
+    self._results_sessions.move_to_end(session.results_obj)
+    while len(self._results_sessions) > max(self.max_results_sessions,1):
+      _, evicted_session = self._results_sessions.popitem(last=False)
+      evicted_session.release()
+
+  def _remove_results_session(self,session):
+    try:
+      if self._results_sessions.get(session.results_obj) is session:
+        del self._results_sessions[session.results_obj]
+    except(TypeError):
+      pass
+    self._clear_unused_intvec_pool()
+
+  def _get_elements_and_variables(self,elements_and_variables):
+    """Returns a list of tuples (object,variable).
+    """
+    if isinstance(elements_and_variables,dict):
+      pairs = []
+      for element,variables in elements_and_variables.items():
+        if isinstance(variables,str):
+          variables = [variables]
+        pairs.extend((element,variable) for variable in variables)
+    else:
+      pairs = elements_and_variables
+    objects = {}
+    elements_and_objects = []
+    for element,variable in pairs:
+      if isinstance(element,str):
+        if element not in objects:
+          objects[element] = self.get_single_obj(element)
+        element = objects[element]
+      elements_and_objects.append((element,variable))
+    return elements_and_objects
+
+  def _get_results_obj(self,results_obj):
+    if not results_obj:
+      return self.app.GetFromStudyCase("ElmRes")
+    return self.handle_single_pf_object_or_path_input(results_obj)
+
+  def get_pooled_intvec(self,folder):
+    """Returns an IntVec in 'folder' that is reused for reading results
+    columns (instead of creating and deleting a vector for every column).
+    The vectors are deleted when the last open results session is closed
+    or, if no session is open, after the results are read, so that the
+    project is not left modified. See also 'clear_intvec_pool'.
+    """
+    try:
+      hash(folder)
+      key = folder
+    except(TypeError): # unhashable folder
+      key = folder.GetFullName()
+    intvec = self._intvec_pool.get(key)
+    if intvec is None or intvec.IsDeleted():
+      intvec = self.create_in_folder(folder,"powfacpy_results.IntVec",overwrite=False,
+        use_existing=True)
+      self._intvec_pool[key] = intvec
+    return intvec
+
+  def clear_intvec_pool(self):
+    """Deletes the pooled IntVec objects (see 'get_pooled_intvec').
+    """
+    intvecs = [intvec for intvec in self._intvec_pool.values() if not intvec.IsDeleted()]
+    self._intvec_pool.clear()
+    if intvecs:
+      self.delete_objects(intvecs)
+
+  def _clear_unused_intvec_pool(self):
+    """Deletes the pooled IntVec objects if no results session is open.
+    """
+    if self._intvec_pool and not self._results_sessions:
+      self.clear_intvec_pool()
+
+
+class PFResultsSession:
+  """Reads results from a results object (ElmRes) that is loaded only once.
+  The session tracks whether the results object is loaded and caches the
+  column index of every (element, variable), so that reading many signals
+  requires a single 'Load' and one 'FindColumn' per variable. The results
+  object is released only when the session is closed (or evicted, see
+  'PFResultsInterface.get_results_session').
+  If the results change (e.g. a simulation is run again), use 'reload'.
+  Simulations run with 'PFDynSimInterface' reload the results of all 
+  sessions automatically (see 'PFBaseInterface.invalidate_results').
+  If the results cache of the interface is enabled (see 
+  'PFResultsInterface.enable_results_cache'), 'get_array' and 'get_matrix'
+  return the cached columns (every column is read and compared with the
+  cached column once per session).
+  Arguments:
+    results_obj: results object (ElmRes)
+    pf_interface: PFResultsInterface used to resolve paths and read columns
+
+  Example:
+    with pfri.get_results_session() as session:
+      time = session.get_time()
+      voltage = session.get_list("Network Model\\Network Data\\Grid\\Terminal","m:u")
+  """
+
+  def __init__(self,results_obj,pf_interface):
+    self.results_obj = results_obj
+    self.pf_interface = pf_interface
+    self.is_loaded = False
+    self._columns = {}
+    self._objects = {}
+    self._full_names = {}
+    self._cache_key_prefix = None
+    self._stamp = None
+    self._arrays = {}
+    self._results_version = powfacpy.PFBaseInterface.results_version
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self,exc_type,exc_value,traceback):
+    self.close()
+
+  def load(self):
+    """Loads the results object (if it is not loaded yet).
+    """
+    self._check_results_version()
+    if not self.is_loaded:
+      self.pf_interface._add_results_session(self)
+      self.results_obj.Load()
+      self.is_loaded = True
+
+  def reload(self):
+    """Loads the results object again and discards the cached column
+    indices (e.g. after a new simulation).
+    """
+    self.release()
+    self._columns.clear()
+    self._arrays.clear()
+    self._stamp = None
+    self.load()
+
+  def release(self):
+    """Releases the loaded results object (the cached column indices are
+    kept).
+    """
+    if self.is_loaded:
+      self.results_obj.Release()
+      self.is_loaded = False
+
+  def close(self):
+    """Releases the results object and removes the session from the open
+    sessions of the interface.
+    """
+    self.release()
+    self.pf_interface._remove_results_session(self)
+
+  def get_column(self,element,variable):
+    """Returns the column index of the variable of 'element' (object or
+    path). Raises PFResultsColumnNotFoundError if the variable is not
+    recorded.
+    """
+    self._check_results_version()
+    element = self._get_object(element)
+    try:
+      return self._columns[(element,variable)]
+    except(KeyError):
+      pass
+    except(TypeError): # unhashable object
+      return self._find_column(element,variable)
+    column = self._columns[(element,variable)] = self._find_column(element,variable)
+    return column
+
+  def get_columns(self,elements_and_variables):
+    """Returns the column indices of the variables (see
+    'PFResultsInterface.get_results_matrix' for the format of
+    'elements_and_variables').
+    """
+    if isinstance(elements_and_variables,dict):
+      elements_and_variables = [(element,variable)
+        for element,variables in elements_and_variables.items()
+        for variable in ([variables] if isinstance(variables,str) else variables)]
+    return [self.get_column(element,variable) for element,variable in elements_and_variables]
+
+  def get_list(self,element,variable):
+    """Returns the results of the variable of 'element' as a list.
+    """
+    column = self.get_column(element,variable)
+    return self.get_column_values(column)
+
+  def get_time(self):
+    """Returns the time (first column of the results) as a list.
+    """
+    return self.get_column_values(-1)
+
+  def get_array(self,element,variable,write_index=True):
+    """Returns the results of the variable of 'element' as a 1-D NumPy 
+    array (a read-only memory map if the results cache is enabled).
+    The column is read from the results object once per session and its
+    checksum is compared with the cached column (see 'get_column_stamp'),
+    so that results of another simulation are never returned.
+    Arguments:
+      write_index: If False, the index of the results cache is not 
+        written (use 'PFResultsCache.flush' after reading many columns).
+    """
+    cache = self.pf_interface.results_cache
+    if not cache:
+      return np.array(self.get_list(element,variable),dtype=np.float64)
+    self._check_results_version()
+    element = self._get_object(element)
+    key = self.get_cache_key(element,variable)
+    array = self._arrays.get(key)
+    if array is None:
+      values = np.array(self.get_list(element,variable),dtype=np.float64)
+      stamp = self.get_column_stamp(values)
+      array = cache.get(key,stamp)
+      if array is None:
+        array = cache.put(key,stamp,values,write_index=write_index)
+      self._arrays[key] = array
+    return array
+
+  def get_matrix(self,elements_and_variables,include_time=False):
+    """Returns the results of the variables as a 2-D NumPy array (see
+    'PFResultsInterface.get_results_matrix').
+    """
+    if self.pf_interface.results_cache:
+      if isinstance(elements_and_variables,dict):
+        elements_and_variables = self.pf_interface._get_elements_and_variables(
+          elements_and_variables)
+      arrays = [self.get_array(element,variable,write_index=False)
+        for element,variable in elements_and_variables]
+      self.pf_interface.results_cache.flush()
+      if include_time:
+        arrays = [np.array(self.get_time(),dtype=np.float64)] + arrays
+      matrix = np.empty((self.get_stamp()[0],len(arrays)),dtype=np.float64)
+      for col_num,array in enumerate(arrays):
+        matrix[:,col_num] = array
+      return matrix
+    columns = self.get_columns(elements_and_variables)
+    if include_time:
+      columns = [-1] + columns
+    self.load()
+    return self.pf_interface.read_results_columns(self.results_obj,columns)
+
+  def get_stamp(self):
+    """Returns a fingerprint of the loaded results [number of rows, number
+    of columns, first time, last time] (see 'get_column_stamp').
+    """
+    self._check_results_version()
+    if self._stamp is None:
+      self.load()
+      rows = self.results_obj.GetNumberOfRows()
+      stamp = [rows,self.results_obj.GetNumberOfColumns()]
+      if rows > 0:
+        stamp.append(self.results_obj.GetValue(0,-1)[1])
+        stamp.append(self.results_obj.GetValue(rows - 1,-1)[1])
+      self._stamp = stamp
+    return self._stamp
+
+  def get_column_stamp(self,values):
+    """Returns the stamp of a column in the results cache: the fingerprint
+    of the results object ('get_stamp') and a checksum (SHA-1) of all
+    values of the column. PowerFactory does not provide a modification 
+    time of results objects, so only the values themselves can tell 
+    whether a cached column is still valid (e.g. after a simulation with
+    changed parameters on the same time grid, possibly run by another
+    process or in the GUI).
+    """
+    values = np.ascontiguousarray(values,dtype=np.float64)
+    return self.get_stamp() + [hashlib.sha1(values.tobytes()).hexdigest()]
+
+  def get_cache_key(self,element,variable):
+    """Returns the key of a column in the results cache (study case that
+    contains the results object, results object, element, variable).
+    """
+    if self._cache_key_prefix is None:
+      study_case = self.results_obj.GetParent()
+      while study_case is not None and study_case.GetClassName() != "IntCase":
+        study_case = study_case.GetParent()
+      self._cache_key_prefix = (study_case.GetFullName() if study_case else "",
+        self.results_obj.GetFullName())
+    try:
+      full_name = self._full_names.get(element)
+    except(TypeError): # unhashable object
+      return self._cache_key_prefix + (element.GetFullName(),variable)
+    if full_name is None:
+      full_name = self._full_names[element] = element.GetFullName()
+    return self._cache_key_prefix + (full_name,variable)
+
+  def get_column_values(self,column):
+    """Returns the values of a column (index) as a list.
+    """
+    self.load()
+    intvec = self.pf_interface.get_pooled_intvec(self.results_obj.GetParent())
+    self.results_obj.GetColumnValues(intvec,column)
+    return intvec.V
+
+  def _check_results_version(self):
+    """Discards the loaded results, column indices and stamp if results
+    were invalidated (see 'PFBaseInterface.invalidate_results') since they
+    were read.
+    """
+    if self._results_version != powfacpy.PFBaseInterface.results_version:
+      self._results_version = powfacpy.PFBaseInterface.results_version
+      self.release()
+      self._columns.clear()
+      self._arrays.clear()
+      self._stamp = None
+
+  def _find_column(self,element,variable):
+    self.load()
+    column = self.results_obj.FindColumn(element,variable)
+    if column < 0:
+      raise powfacpy.PFResultsColumnNotFoundError(element,variable,self.pf_interface)
+    return column
+
+  def _get_object(self,element):
+    if not isinstance(element,str):
+      return element
+    obj = self._objects.get(element)
+    if obj is None:
+      obj = self._objects[element] = self.pf_interface.get_single_obj(element)
+    return obj
+
+
+class PFResultsFrame:
+  """Results of a results object (ElmRes) with lazily read columns (see
+  'PFResultsInterface.to_dataframe'). The column names and the time are 
+  read when the frame is created; the values of a column are read (with
+  a results session) when the column is first accessed and then kept.
+  Arguments:
+    session: PFResultsSession of the results object
+    variables: see 'PFResultsInterface.to_dataframe'
+
+  Example:
+    frame = pfri.to_dataframe(lazy=True)
+    voltages = frame[[name for name in frame.columns if name.endswith("m:u")]]
+  """
+
+  def __init__(self,session,variables=None):
+    self.session = session
+    self._values = {}
+    elements_variables_and_columns = self._get_elements_variables_and_columns(variables)
+    full_names = [element.GetFullName() for element,_,_ in elements_variables_and_columns]
+    paths = powfacpy.PFStringManipuilation.format_full_paths(full_names,session.pf_interface)
+    self.columns = [path + "\\" + variable
+      for path,(_,variable,_) in zip(paths,elements_variables_and_columns)]
+    self._columns = dict(zip(self.columns,elements_variables_and_columns))
+    self._index = None
+
+  def _get_elements_variables_and_columns(self,variables):
+    """Returns a list of tuples (element, variable, column index).
+    """
+    session = self.session
+    session.load()
+    results_obj = session.results_obj
+    if variables is None or isinstance(variables,str) or (isinstance(variables,list)
+      and all(isinstance(variable,str) for variable in variables)):
+      if isinstance(variables,str):
+        variables = [variables]
+      elements_variables_and_columns = []
+      for column in range(results_obj.GetNumberOfColumns()):
+        variable = results_obj.GetVariable(column)
+        if variables is None or variable in variables:
+          elements_variables_and_columns.append(
+            (results_obj.GetObject(column),variable,column))
+      return elements_variables_and_columns
+    elements_and_variables = session.pf_interface._get_elements_and_variables(variables)
+    return [(element,variable,session.get_column(element,variable))
+      for element,variable in elements_and_variables]
+
+  @property
+  def index(self):
+    """Time (b:tnow) as pandas Index.
+    """
+    if self._index is None:
+      import pandas
+      self._index = pandas.Index(self.session.get_time(),name="Time")
+    return self._index
+
+  def __len__(self):
+    return len(self.index)
+
+  def __contains__(self,column_name):
+    return column_name in self._columns
 
-  
+  def __iter__(self):
+    return iter(self.columns)
 
-""" class ElmRes2NumPyArray():
+  def __getitem__(self,column_names):
+    """Returns a column as pandas Series or a list of columns as 
+    DataFrame.
+    """
+    if isinstance(column_names,str):
+      import pandas
+      return pandas.Series(self.get_values(column_names),index=self.index,
+        name=column_names)
+    return self.to_dataframe(column_names)
 
-  def __init__(self) -> None:
-    self.time_series = None # np.empty(1,dtype=float)
+  def get_values(self,column_name,write_index=True):
+    """Returns the values of a column as NumPy array (read on first access).
+    For 'write_index' see 'PFResultsSession.get_array'.
+    """
+    values = self._values.get(column_name)
+    if values is None:
+      try:
+        element,variable,column = self._columns[column_name]
+      except(KeyError):
+        raise KeyError(f"The results do not contain the column '{column_name}'.")
+      if self.session.pf_interface.results_cache:
+        values = self.session.get_array(element,variable,write_index=write_index)
+      else:
+        values = np.array(self.session.get_column_values(column),dtype=np.float64)
+      self._values[column_name] = values
+    return values
 
-  def get(element,variable): """
+  def to_dataframe(self,column_names=None):
+    """Returns the columns (by default all) as pandas DataFrame.
+    """
+    import pandas
+    if column_names is None:
+      column_names = self.columns
+    values = {name:self.get_values(name,write_index=False) for name in column_names}
+    if self.session.pf_interface.results_cache:
+      self.session.pf_interface.results_cache.flush()
+    return pandas.DataFrame(values,index=self.index,columns=list(column_names))
@@ -0,0 +1,203 @@
+"""Columnar snapshots of the active project for offline querying.
+
+A snapshot (see 'PFBaseInterface.snapshot') contains one table per class
+with the columns
+  path: path of the object relative to the project (without classes)
+  full_name: path relative to the project including the classes
+  parent: path of the parent folder (without classes)
+and one column per requested attribute. References to PF objects are
+stored as their paths. The tables are written as Parquet files (one file
+per class in a directory, requires pyarrow) or to a single npz file.
+
+PFSnapshot reads a snapshot and answers 'get_obj'-style queries (with
+wildcards and declarative conditions, see 'Attr') without PowerFactory:
+  snapshot = powfacpy.PFSnapshot("network.snapshot")
+  snapshot.get_obj("Network Model\\Network Data\\*\\*.ElmTerm",
+    condition=Attr("uknom") == 110)
+"""
+
+import os
+import re
+
+import numpy as np
+
+from powfacpy.base_interface import PFBaseInterface
+
+# Columns that every table contains (in addition to the attributes)
+PATH_COLUMNS = ("path","full_name","parent")
+
+
+def pyarrow_is_available():
+  try:
+    import pyarrow
+  except ImportError:
+    return False
+  return True
+
+
+def write_snapshot(file_path,tables,file_format=None):
+  """Writes tables {class name: {column name: NumPy array}} to 'file_path'.
+  Arguments:
+    file_format: "parquet" (directory with one file per class) or "npz".
+      By default, "parquet" is used if pyarrow is installed (and 'file_path'
+      does not end with ".npz"), else "npz".
+  """
+  if file_format is None:
+    if pyarrow_is_available() and not file_path.endswith(".npz"):
+      file_format = "parquet"
+    else:
+      file_format = "npz"
+  if file_format == "parquet":
+    import pyarrow
+    import pyarrow.parquet
+    os.makedirs(file_path,exist_ok=True)
+    for class_name,columns in tables.items():
+      pyarrow.parquet.write_table(pyarrow.table(columns),
+        os.path.join(file_path,class_name + ".parquet"))
+  elif file_format == "npz":
+    arrays = {f"{class_name}/{column_name}":array
+      for class_name,columns in tables.items()
+      for column_name,array in columns.items()}
+    with open(file_path,"wb") as file:
+      np.savez_compressed(file,**arrays)
+  else:
+    raise ValueError(f"Unknown snapshot format '{file_format}' "
+      "(use 'parquet' or 'npz').")
+  return file_format
+
+
+class PFSnapshot:
+  """Reader of a snapshot (see module docstring). The tables are loaded
+  when they are first queried.
+  """
+
+  def __init__(self,file_path):
+    self.file_path = file_path
+    self._tables = {}
+    if os.path.isdir(file_path):
+      self.file_format = "parquet"
+      self.classes = sorted(name[:-len(".parquet")] for name in os.listdir(file_path)
+        if name.endswith(".parquet"))
+      self._npz = None
+    else:
+      self.file_format = "npz"
+      self._npz = np.load(file_path,allow_pickle=False)
+      self.classes = sorted({key.partition("/")[0] for key in self._npz.files})
+
+  def get_table(self,class_name):
+    """Returns the table of a class as a dictionary {column name: array}.
+    """
+    table = self._tables.get(class_name)
+    if table is None:
+      if class_name not in self.classes:
+        raise KeyError(f"The snapshot does not contain objects of class '{class_name}'.")
+      if self.file_format == "parquet":
+        import pyarrow.parquet
+        arrow_table = pyarrow.parquet.read_table(
+          os.path.join(self.file_path,class_name + ".parquet"))
+        table = {name:np.asarray(arrow_table.column(name).to_numpy(zero_copy_only=False))
+          for name in arrow_table.column_names}
+      else:
+        prefix = class_name + "/"
+        table = {key[len(prefix):]:self._npz[key] for key in self._npz.files
+          if key.startswith(prefix)}
+      for column in PATH_COLUMNS:
+        table[column] = table[column].astype(str)
+      self._tables[class_name] = table
+    return table
+
+  def get_obj(self,path,condition=None,parent_folder=None,include_subfolders=False):
+    """Returns the paths (relative to the project, without classes) of
+    the objects under 'path'. The arguments are the same as for
+    'PFBaseInterface.get_obj', but 'parent_folder' must be a path and
+    'condition' a declarative condition (see 'Attr'). Only objects of 
+    the classes contained in the snapshot are found.
+
+    Example:
+      snapshot.get_obj("Network Model\\Network Data\\*\\*.ElmTerm",
+        condition=Attr("uknom") == 110)
+    """
+    paths = []
+    for class_name,rows in self._query(path,condition,parent_folder,include_subfolders):
+      paths.extend(self.get_table(class_name)["path"][rows].tolist())
+    return paths
+
+  def get_attr_table(self,path,attributes,condition=None,parent_folder=None,
+    include_subfolders=False,as_dataframe=True):
+    """Returns the attributes of the objects under 'path' as a table (see
+    'PFBaseInterface.get_attr_table').
+    """
+    if isinstance(attributes,str):
+      attributes = [attributes]
+    paths = []
+    columns = {attr:[] for attr in attributes}
+    for class_name,rows in self._query(path,condition,parent_folder,include_subfolders):
+      table = self.get_table(class_name)
+      paths.extend(table["path"][rows].tolist())
+      for attr in attributes:
+        columns[attr].append(self._get_column(table,attr,class_name)[rows])
+    arrays = [np.concatenate(columns[attr]) if columns[attr] else np.empty(0)
+      for attr in attributes]
+    return PFBaseInterface._create_table(paths,attributes,arrays,as_dataframe)
+
+  def _query(self,path,condition,parent_folder,include_subfolders):
+    """Returns a list of (class name, indices of the matching rows).
+    """
+    if condition is not None and not hasattr(condition,"evaluate"):
+      raise TypeError("Only declarative conditions (see 'Attr') can be "
+        "evaluated on a snapshot.")
+    path = path.strip("\\")
+    if parent_folder:
+      path = parent_folder.strip("\\") + "\\" + path
+    pattern = PFSnapshot._compile_path_pattern(path,include_subfolders)
+    _, dot, class_pattern = path.rpartition("\\")[2].rpartition(".")
+    class_regex = re.compile(PFSnapshot._translate(class_pattern if dot else "*"))
+    results = []
+    for class_name in self.classes:
+      if not class_regex.fullmatch(class_name):
+        continue
+      table = self.get_table(class_name)
+      rows = np.array([i for i,full_name in enumerate(table["full_name"])
+        if pattern.fullmatch(full_name)],dtype=np.int64)
+      if condition is not None and len(rows):
+        columns = {attr:self._get_column(table,attr,class_name)[rows]
+          for attr in condition.get_attributes()}
+        rows = rows[np.asarray(condition.evaluate(columns),dtype=bool)]
+      if len(rows):
+        results.append((class_name,rows))
+    return results
+
+  @staticmethod
+  def _get_column(table,attr,class_name):
+    try:
+      return table[attr]
+    except KeyError:
+      raise KeyError(f"The attribute '{attr}' of class '{class_name}' is not "
+        "contained in the snapshot.")
+
+  @staticmethod
+  def _translate(pattern):
+    """Translates a wildcard pattern of a single path segment to a regex."""
+    return "".join("[^\\\\]*" if c == "*" else "[^\\\\]" if c == "?" else re.escape(c)
+      for c in pattern)
+
+  @staticmethod
+  def _compile_path_pattern(path,include_subfolders):
+    """Compiles a regex that matches the 'full_name' column. Segments
+    without class match objects of any class.
+    """
+    segments = []
+    for segment in path.split("\\"):
+      name_pattern, dot, class_pattern = segment.rpartition(".")
+      if dot:
+        segments.append(PFSnapshot._translate(name_pattern or "*") + "\\."
+          + PFSnapshot._translate(class_pattern))
+      else:
+        segments.append(PFSnapshot._translate(segment) + "\\.[^\\\\]*")
+    if include_subfolders:
+      regex = "\\\\".join(segments[:-1]) + "(?:\\\\[^\\\\]*)*\\\\" + segments[-1]
+      if len(segments) == 1:
+        regex = "(?:[^\\\\]*\\\\)*" + segments[-1]
+    else:
+      regex = "\\\\".join(segments)
+    return re.compile(regex)
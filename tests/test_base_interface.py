@@ -239,5 +239,195 @@ def test_create_directory(pfbi,activate_test_project):
     pfbi.create_directory(r"test1\test2")
     pfbi.delete_obj("test1")
 
+def test_path_cache(pfbi,activate_test_project):
+    pfbi.enable_path_cache(max_size=10)
+    path = r"Network Model\Network Data\test_base_interface\Grid\Terminal HV 1"
+    terminal_1 = pfbi.get_single_obj(path)
+    assert pfbi.get_single_obj(path) == terminal_1
+    cache_info = pfbi.get_path_cache_info()
+    assert cache_info.hits == 1
+    assert cache_info.misses == 1
+
+    folder = r"Library\Dynamic Models\TestDelete"
+    pfbi.create_in_folder(folder,"dummy_cached.BlkDef")
+    assert len(pfbi.get_obj("dummy_cached*",parent_folder=folder)) == 1
+    pfbi.delete_obj("dummy_cached*",parent_folder=folder)
+    assert not pfbi.get_obj("dummy_cached*",parent_folder=folder,
+        error_if_non_existent=False)
+
+    pfbi.activate_project(PF_PROJECT_PATH)
+    assert pfbi.get_path_cache_info().size == 0
+    pfbi.disable_path_cache()
+    assert pfbi.get_path_cache_info() is None
+
+def test_get_attr_table(pfbi,activate_test_project):
+    folder = r"Network Model\Network Data\test_base_interface\Grid"
+    table = pfbi.get_attr_table("*.ElmTerm",["uknom","systype"],parent_folder=folder)
+    assert len(table) == 3
+    assert table["uknom"].dtype == float
+    assert table.loc[r"Network Model\Network Data\test_base_interface\Grid\Terminal HV 1",
+        "systype"] == 0
+
+    array = pfbi.get_attr_table("*.ElmTerm",["uknom"],parent_folder=folder,
+        as_dataframe=False)
+    assert len(array["path"]) == 3
+    chunks = list(pfbi.iter_attr_table("*.ElmTerm",["uknom"],chunk_size=2,
+        parent_folder=folder))
+    assert [len(chunk) for chunk in chunks] == [2,1]
+
+    with pytest.raises(powfacpy.exceptions.PFAttributeError):
+        pfbi.get_attr_table("*.ElmTerm",["trixi"],parent_folder=folder)
+    with pytest.raises(powfacpy.PFPathError):
+        pfbi.get_attr_table("*.ElmTrem",["uknom"],parent_folder=folder)
+    assert len(pfbi.get_attr_table("*.ElmTrem",["uknom"],parent_folder=folder,
+        error_if_non_existent=False)) == 0
+
+def test_batch_writes(pfbi,activate_test_project):
+    path = r"Library\Dynamic Models\Linear_interpolation"
+    with pfbi.batch_writes() as batch:
+        pfbi.set_attr(path,{"sTitle":"TestString1"})
+        pfbi.set_attr_by_path(path + r"\sTitle","TestString2")
+        assert pfbi.get_attr(path,"sTitle") != "TestString2"
+    assert pfbi.get_attr(path,"sTitle") == "TestString2"
+    assert batch.coalesced_writes == 1
+    assert batch.flushed_writes == 1
+
+    with pytest.raises(powfacpy.exceptions.PFPathError):
+        with pfbi.batch_writes():
+            pfbi.set_attr_by_path(r"Stretchwork Model\Stretchwork Data\Grid\Termalamala",
+                ["description"])
+
+def test_object_index(pfbi,activate_test_project):
+    terminals = pfbi.get_obj(r"Network Data\test_base_interface\*.ElmTerm",parent_folder="Network Model",
+        include_subfolders=True)
+    index = pfbi.enable_object_index()
+    terminals_from_index = pfbi.get_obj(r"Network Data\test_base_interface\*.ElmTerm",
+        parent_folder="Network Model",include_subfolders=True)
+    assert len(terminals_from_index) == len(terminals) == 3
+    assert len(index.get_objects_of_class("ElmTerm")) >= 3
+    assert pfbi.path_exists(r"Network Model\Network Data\test_base_interface\Grid\Terminal HV 1")
+
+    grid = pfbi.get_upstream_obj(terminals_from_index[0],lambda x: x.GetClassName() == "ElmNet")
+    assert grid.loc_name == "Grid"
+
+    folder = r"Library\Dynamic Models\TestDelete"
+    pfbi.create_in_folder(folder,"dummy_indexed.BlkDef")
+    assert index.exists("dummy_indexed",parent_path=folder)
+    pfbi.delete_obj("dummy_indexed",parent_folder=folder)
+    assert not index.exists("dummy_indexed",parent_path=folder)
+    # Brackets are no wildcards (like in PF)
+    pfbi.create_in_folder(folder,"dummy [1].BlkDef")
+    assert len(index.get_obj("dummy [1]*",parent_path=folder)) == 1
+    pfbi.delete_obj("dummy [1].BlkDef",parent_folder=folder)
+    pfbi.disable_object_index()
+
+def test_get_obj_with_declarative_condition(pfbi,activate_test_project):
+    path = r"Network Model\Network Data\test_base_interface\Grid\Terminal*"
+    hv_terminals = pfbi.get_obj(path,condition=powfacpy.Attr("uknom") > 50)
+    assert len(hv_terminals) == 2
+    terminals = pfbi.get_obj(path,
+        condition=powfacpy.Attr("uknom").between(0,50) | (powfacpy.Attr("loc_name") == "Terminal HV 1"))
+    assert len(terminals) == 2
+    terminals = pfbi.get_obj(path,condition=~powfacpy.Attr("loc_name").isin(["Terminal HV 1"]))
+    assert len(terminals) == 2
+
+    with pytest.raises(powfacpy.exceptions.PFAttributeError):
+        pfbi.get_obj(path,condition=powfacpy.Attr("wrong_attr") > 100)
+
+def test_create_directory_with_path_cache(pfbi,activate_test_project):
+    pfbi.enable_path_cache()
+    parent_folder = r"Study Cases\test_case_studies"
+    folder_1 = pfbi.create_directory(r"test1\test2\test3",parent_folder=parent_folder)
+    folder_2 = pfbi.create_directory(r"test1\test2\test3",parent_folder=parent_folder)
+    assert folder_1 == folder_2
+    assert pfbi.path_cache.folders.hits >= 3
+    folder_4 = pfbi.create_directory(r"test1\test2\test3\test4",parent_folder=parent_folder)
+    assert folder_4.GetParent() == folder_1
+    assert pfbi.path_exists(r"test1\test2\test3\test4",parent=parent_folder)
+
+    pfbi.delete_obj("test1",parent_folder=parent_folder)
+    assert not pfbi.path_exists(r"test1\test2",parent=parent_folder)
+    pfbi.disable_path_cache()
+
+def test_delete_objects(pfbi,activate_test_project):
+    folder = r"Library\Dynamic Models\TestDelete"
+    sub_folder = pfbi.create_directory(r"sub1\sub2",parent_folder=folder)
+    pfbi.create_in_folder(sub_folder,"dummy_to_be_deleted_1.BlkDef")
+    objects = pfbi.get_obj("*",parent_folder=folder,include_subfolders=True)
+    pfbi.delete_objects(objects)
+    assert all(o.IsDeleted() for o in objects)
+    assert not pfbi.get_obj("*",parent_folder=folder,error_if_non_existent=False)
+
+def test_instrumentation(pf_app,activate_test_project):
+    pfbi = powfacpy.PFBaseInterface(pf_app,instrument=True)
+    terminals = pfbi.get_obj(r"Network Model\Network Data\test_base_interface\Grid\*.ElmTerm")
+    pfbi.get_attr(terminals[0],"uknom")
+    records = pfbi.api_statistics.get_records()
+    assert {"GetContents","GetAttribute"} <= {r["method"] for r in records}
+    assert any(r["caller"] == "PFBaseInterface.get_obj" for r in records)
+    assert pfbi.api_statistics.number_of_calls == sum(r["calls"] for r in records)
+    df = pfbi.api_statistics.to_dataframe(by="method")
+    assert df.loc["GetContents","calls"] >= 1
+    assert '"records"' in pfbi.api_statistics.to_json()
+    pfbi.disable_instrumentation()
+    assert not isinstance(pfbi.app,powfacpy.PFInstrumentedObject)
+
+def test_record_and_replay(pf_app,activate_test_project,tmp_path):
+    recorder = powfacpy.PFAPIRecorder(pf_app)
+    pfbi = powfacpy.PFBaseInterface(recorder.app)
+    folder = r"Network Model\Network Data\test_base_interface\Grid"
+    terminals = pfbi.get_obj("*.ElmTerm",parent_folder=folder)
+    voltages = [pfbi.get_attr(t,"uknom") for t in terminals]
+    trace_path = str(tmp_path / "get_obj.trace")
+    recorder.save(trace_path)
+    for strict in (False,True):
+        replayer = powfacpy.PFAPIReplayer(trace_path,strict=strict)
+        pfbi = powfacpy.PFBaseInterface(replayer.app)
+        replayed_terminals = pfbi.get_obj("*.ElmTerm",parent_folder=folder)
+        assert [pfbi.get_attr(t,"uknom") for t in replayed_terminals] == voltages
+        assert [str(t) for t in replayed_terminals] == [str(t) for t in terminals]
+    with pytest.raises(powfacpy.PFReplayMismatchError):
+        pfbi.get_obj("*.ElmLne",parent_folder=folder)
+
+def test_snapshot(pfbi,activate_test_project,tmp_path):
+    folder = r"Network Model\Network Data\test_base_interface\Grid"
+    for file_path in (str(tmp_path / "snapshot"),str(tmp_path / "snapshot.npz")):
+        pfbi.snapshot(file_path,attributes={"ElmTerm":["uknom","outserv"]})
+        snapshot = powfacpy.PFSnapshot(file_path)
+        assert snapshot.classes == ["ElmTerm"]
+        terminals = pfbi.get_obj("*.ElmTerm",parent_folder=folder)
+        paths = powfacpy.PFStringManipuilation.format_full_paths(
+            [str(t) for t in terminals],pfbi)
+        assert sorted(snapshot.get_obj("*.ElmTerm",parent_folder=folder)) == sorted(paths)
+        condition = powfacpy.Attr("uknom") == 110
+        terminals_110 = pfbi.get_obj("*.ElmTerm",parent_folder=folder,condition=condition)
+        assert (len(snapshot.get_obj("*.ElmTerm",parent_folder=folder,condition=condition))
+            == len(terminals_110))
+        table = snapshot.get_attr_table("*.ElmTerm",["uknom"],parent_folder=folder)
+        assert list(table["uknom"]) == [pfbi.get_attr(t,"uknom") for t in terminals]
+
+def test_get_paths_between_objects(pfbi,activate_test_project):
+    grid = pfbi.get_single_obj(r"Network Model\Network Data\test_base_interface\Grid")
+    terminals = pfbi.get_obj("*.ElmTerm",parent_folder=grid)
+    paths = pfbi.get_paths_between_objects(grid,terminals)
+    assert paths == [t.loc_name for t in terminals]
+    assert pfbi.get_path_between_objects(grid.GetParent(),terminals[0]) == "Grid\\" + paths[0]
+    assert pfbi.get_paths_between_objects(grid,terminals[:1],include_classes=True) == [
+        terminals[0].loc_name + ".ElmTerm"]
+    with pytest.raises(powfacpy.PFNotBelowObjectError,match="is not below"):
+        pfbi.get_path_between_objects(terminals[0],grid)
+    assert pfbi.get_corresponding_objs(terminals,grid,grid) == terminals
+
+def test_iter_obj(pfbi,activate_test_project):
+    folder = r"Network Model\Network Data\test_base_interface"
+    terminals = pfbi.get_obj("*.ElmTerm",parent_folder=folder,include_subfolders=True)
+    for order in ("dfs","bfs"):
+        terminals_found = list(pfbi.iter_obj(folder + r"\*.ElmTerm",order=order))
+        assert sorted(map(str,terminals_found)) == sorted(map(str,terminals))
+    assert len(list(pfbi.iter_obj("*.ElmTerm",parent_folder=folder,limit=2))) == 2
+    assert not list(pfbi.iter_obj("*.ElmTerm",parent_folder=folder,max_depth=1))
+    assert not list(pfbi.iter_obj("*.ElmTerm",parent_folder=folder,
+        prune=lambda x: x.GetClassName() == "ElmNet"))
+
 if __name__ == "__main__":
     pytest.main(([r"tests\test_base_interface.py"]))
@@ -36,6 +36,14 @@ def test_export_to_csv(pfsim,activate_test_project):
     pfsim.export_to_csv(results_obj=results_obj) 
     remove(export_dir + "\\results.csv")    
 
+    pfsim.export_to_csv(header_map=True)
+    results = powfacpy.PFBaseInterface.read_elmres_csv(export_dir + "\\results.csv")
+    assert results.columns[0] == "Time"
+    assert (r"Network Model\Network Data\test_dyn_sim_interface\Grid 1\AC Voltage Source\m:Psum:bus1"
+        in results.columns)
+    remove(export_dir + "\\results.csv")
+    remove(export_dir + "\\results.csv.header.json")
+
 def test_set_and_get_dsl_obj_array(pfsim,activate_test_project):
     array = [[2,0,2,0],[1,2,3,4],[5,6,7,8]]
     array_two_column = [[2,0],[1,2],[5,6]]
@@ -17,5 +17,14 @@ def test_get_vacant_cubicle_of_terminal(pfni,activate_test_project):
   pfni.get_vacant_cubicle_of_terminal(
     r"Network Model\Network Data\test_plot_interface\Grid 1\Terminal HV 2")
 
+def test_get_parent_grids(pfni,activate_test_project):
+  folder = r"Network Model\Network Data\test_plot_interface\Grid 1"
+  terminal = pfni.get_single_obj("Terminal HV 2",parent_folder=folder)
+  assert pfni.get_parent_grid(terminal) == pfni.get_single_obj(folder)
+  terminals = pfni.get_obj("*.ElmTerm",parent_folder=folder)
+  grids = pfni.get_parent_grids(terminals)
+  assert grids == [pfni.get_parent_grid(t) for t in terminals]
+  assert pfni.get_upstream_obj(terminal,lambda x: x.GetClassName() == "NoClass") is None
+
 if __name__ == "__main__":
   pytest.main(([r"tests\test_network_interface.py"]))
\ No newline at end of file
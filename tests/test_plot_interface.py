@@ -54,6 +54,13 @@ def test_pyplot_from_csv(pfplot,activate_test_project):
         r"Network Model\Network Data\test_plot_interface\Grid 1\AC Voltage Source\m:Qsum:bus1"]) 
     pyplot.xlabel("t [s]")
 
+    pyplot.figure()
+    plot = powfacpy.PFPlotInterface.plot_from_csv(
+        export_dir + "\\" + file_name + ".csv",
+        r"Network Model\Network Data\test_plot_interface\Grid 1\AC Voltage Source\m:Qsum:bus1",
+        max_points=20)
+    assert len(plot[0].get_xdata()) <= 20
+
 def test_copy_graphics_board_content(pfplot,activate_test_project):
     source_study_case = r"Study Cases\test_plot_interface\Study Case 1"
     target_study_cases = [r"Study Cases\test_plot_interface\Study Case 2", 
@@ -69,6 +76,23 @@ def test_copy_graphics_board_content_to_all_study_cases(pfplot,activate_test_pro
     pfplot.copy_graphics_board_content_to_all_study_cases(source_study_case,
         target_parent_folder=r"Study Cases\test_plot_interface")
 
+def test_downsample():
+    time = [t*0.001 for t in range(10001)]
+    values = [0.0]*10001
+    values[1234] = 5.0
+    values[6789] = -3.0
+    for method in ("minmax","lttb"):
+        time_downsampled,values_downsampled = powfacpy.downsample(
+            time,values,100,method=method)
+        assert len(time_downsampled) <= 100
+        assert time_downsampled[0] == time[0] and time_downsampled[-1] == time[-1]
+        assert max(values_downsampled) == 5.0
+        assert min(values_downsampled) == -3.0
+    time_downsampled,_ = powfacpy.downsample(time[:50],values[:50],100)
+    assert len(time_downsampled) == 50
+    with pytest.raises(ValueError):
+        powfacpy.downsample(time,values,100,method="unknown")
+
 if __name__ == "__main__":
     pytest.main(([r"tests\test_plot_interface.py"]))
     #pytest.main(([r"tests\test_plot_interface.py::test_plot"]))
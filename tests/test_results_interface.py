@@ -0,0 +1,189 @@
+import pytest
+import sys
+sys.path.append(r'C:\Program Files\DIgSILENT\PowerFactory 2022 SP1\Python\3.10')
+import powerfactory
+sys.path.insert(0,r'.\src')
+import powfacpy 
+import importlib
+importlib.reload(powfacpy)
+
+from test_base_interface import pfbi, pf_app, activate_test_project
+
+@pytest.fixture
+def pfri(pf_app):
+    # Return PFResultsInterface instance
+    return powfacpy.PFResultsInterface(pf_app)
+
+@pytest.fixture
+def pfsim(pf_app):
+    # Return PFDynSimInterface instance
+    return powfacpy.PFDynSimInterface(pf_app)
+
+STUDY_CASE = r"Study Cases\test_dyn_sim_interface\Study Case"
+
+@pytest.fixture
+def simulated_source(pfri,pfsim,activate_test_project):
+    # Run a simulation that records the power of the voltage source and return its path
+    pfsim.get_single_obj(STUDY_CASE).Activate()
+    source = r"Network Model\Network Data\test_dyn_sim_interface\Grid 1\AC Voltage Source"
+    pfsim.add_results_variable(source,["m:Psum:bus1","m:Qsum:bus1"])
+    pfsim.initialize_and_run_sim()
+    yield source
+    pfri.close_results_sessions()
+    pfri.disable_results_cache()
+    pfri.clear_intvec_pool()
+
+def test_get_results_matrix(pfri,simulated_source):
+    matrix = pfri.get_results_matrix(
+        [(simulated_source,"m:Psum:bus1"),(simulated_source,"m:Qsum:bus1")],include_time=True)
+    assert matrix.shape[1] == 3
+    assert list(matrix[:,1]) == pfri.get_list_with_results_of_variable(simulated_source,"m:Psum:bus1")
+    assert list(matrix[:,2]) == pfri.get_list_with_results_of_variable(simulated_source,"m:Qsum:bus1")
+
+    matrix_from_dict = pfri.get_results_matrix({simulated_source:["m:Psum:bus1","m:Qsum:bus1"]})
+    assert (matrix_from_dict == matrix[:,1:]).all()
+    # The IntVec used to read the results is deleted again
+    assert not pfri.get_obj("powfacpy_results.IntVec",parent_folder=STUDY_CASE,
+        error_if_non_existent=False)
+
+    with pytest.raises(powfacpy.PFResultsColumnNotFoundError):
+        pfri.get_results_matrix([(simulated_source,"m:not_recorded")])
+
+def test_results_session(pfri,simulated_source):
+    with pfri.get_results_session() as session:
+        assert pfri.get_results_session() is session
+        active_power = session.get_list(simulated_source,"m:Psum:bus1")
+        assert session.is_loaded
+        assert active_power == pfri.get_list_with_results_of_variable(simulated_source,"m:Psum:bus1")
+        assert session.get_column(simulated_source,"m:Psum:bus1") == session.get_columns(
+            {simulated_source:"m:Psum:bus1"})[0]
+        matrix = session.get_matrix([(simulated_source,"m:Qsum:bus1")],include_time=True)
+        assert list(matrix[:,0]) == session.get_time()
+    assert not session.is_loaded
+    assert not pfri.get_obj("powfacpy_results.IntVec",parent_folder=STUDY_CASE,
+        error_if_non_existent=False)
+    assert pfri.get_results_session() is not session
+
+def test_results_cache(pfri,pfsim,simulated_source,tmp_path):
+    cache = pfri.enable_results_cache(str(tmp_path))
+    with pfri.get_results_session() as session:
+        active_power = session.get_array(simulated_source,"m:Psum:bus1")
+        assert list(active_power) == session.get_list(simulated_source,"m:Psum:bus1")
+    assert cache.info().misses == 1
+
+    with pfri.get_results_session() as session:
+        active_power_cached = session.get_array(simulated_source,"m:Psum:bus1")
+        matrix = session.get_matrix([(simulated_source,"m:Psum:bus1")],include_time=True)
+    assert cache.info().hits == 1 # the matrix uses the column read by 'get_array'
+    assert (active_power_cached == active_power).all()
+    assert (matrix[:,1] == active_power).all()
+
+    # A simulation with a changed parameter (same time grid) must not use the cached column
+    load = pfsim.get_single_obj(
+        r"Network Model\Network Data\test_dyn_sim_interface\Grid 1\General Load HV")
+    plini = load.plini
+    load.plini = 2*plini
+    try:
+        with pfri.get_results_session() as session:
+            pfsim.initialize_and_run_sim()
+            misses = cache.info().misses
+            active_power_changed = session.get_array(simulated_source,"m:Psum:bus1")
+            assert cache.info().misses == misses + 1
+            assert list(active_power_changed) == session.get_list(simulated_source,"m:Psum:bus1")
+            assert list(active_power_changed) != list(active_power)
+        # Simulation that is not run with powfacpy (e.g. by another process)
+        load.plini = plini
+        pfsim.app.GetFromStudyCase("ComInc").Execute()
+        pfsim.app.GetFromStudyCase("ComSim").Execute()
+        with pfri.get_results_session() as session:
+            misses = cache.info().misses
+            assert (session.get_array(simulated_source,"m:Psum:bus1") == active_power).all()
+            assert cache.info().misses == misses + 1
+    finally:
+        load.plini = plini
+
+    cache.clear()
+    assert cache.get_size() == 0
+
+def test_iter_results_chunks_and_memmap(pfri,simulated_source,tmp_path):
+    elements_and_variables = [(simulated_source,"m:Psum:bus1")]
+    matrix = pfri.get_results_matrix(elements_and_variables,include_time=True)
+    rows = 0
+    for first_row,chunk in pfri.iter_results_chunks(
+        elements_and_variables,chunk_size=10,include_time=True):
+        assert chunk.shape[0] <= 10
+        assert (chunk == matrix[first_row:first_row+len(chunk)]).all()
+        rows += len(chunk)
+    assert rows == matrix.shape[0]
+
+    memmap = pfri.read_results_to_memmap(
+        elements_and_variables,str(tmp_path / "results.npy"),include_time=True)
+    assert (memmap == matrix).all()
+    memmap = pfri.read_results_to_memmap(
+        elements_and_variables,str(tmp_path / "results_chunked.npy"),chunk_size=10)
+    assert (memmap[:,0] == matrix[:,1]).all()
+
+def test_to_dataframe(pfri,simulated_source):
+    df = pfri.to_dataframe(variables="m:Psum:bus1")
+    column_name = simulated_source + "\\m:Psum:bus1"
+    assert column_name in df.columns
+    assert df.index.name == "Time"
+    assert list(df[column_name]) == pfri.get_list_with_results_of_variable(simulated_source,"m:Psum:bus1")
+
+    frame = pfri.to_dataframe(lazy=True)
+    assert column_name in frame
+    assert simulated_source + "\\m:Qsum:bus1" in frame.columns
+    assert (frame[column_name] == df[column_name]).all()
+    assert frame[[column_name]].shape == (len(df),1)
+
+def test_compute_kpis():
+    time = [0,0.5,1,1.5,2,3,4,6,8,10] # non-uniform time steps
+    step_response = [0,0.5,1.2,1.1,1.0,1.0,1.0,1.0,1.0,1.0]
+    constant = [1.0]*len(time)
+    kpis = powfacpy.compute_kpis(time,list(zip(step_response,constant)),
+        signal_names=["step","constant"],band=(0.95,1.05),reference=1.0,
+        as_dataframe=False)
+    assert list(kpis["maximum"]) == [1.2,1.0]
+    assert abs(kpis["overshoot"][0] - 20) < 1e-9
+    assert abs(kpis["rise_time"][0] - (0.5 + 0.5*0.4/0.7 - 0.1)) < 1e-9
+    assert kpis["settling_time"][0] == 2
+    assert kpis["rms"][1] == 1.0
+    assert list(kpis["steady_state_error"]) == [0,0]
+    assert kpis["time_outside_band"][0] == 1.75
+    assert kpis["time_outside_band"][1] == 0
+
+    df = powfacpy.compute_kpis(time,step_response,kpis=["minimum","maximum"])
+    assert list(df.columns) == ["signal","kpi","value"]
+    assert len(df) == 2
+
+def test_get_results_kpis(pfri,simulated_source):
+    kpis = pfri.get_results_kpis([(simulated_source,"m:Psum:bus1")],kpis=["minimum","maximum"])
+    assert list(kpis["signal"]) == [simulated_source + "\\m:Psum:bus1"]*2
+    values = pfri.get_list_with_results_of_variable(simulated_source,"m:Psum:bus1")
+    assert list(kpis["value"]) == [min(values),max(values)]
+
+def test_align_cases_and_get_case_statistics():
+    times = [[0,1,2,4],[0,2,4],[0,0.5,1,1.5,2,3,4]]
+    values_of_cases = [[t*1.0 for t in time] for time in times]
+    values_of_cases[2] = [t*2.0 for t in times[2]]
+    time_grid,aligned = powfacpy.align_cases(times,values_of_cases,time_grid=[0,1,3,4])
+    assert aligned.shape == (3,4,1)
+    assert list(aligned[1,:,0]) == [0,1,3,4]
+    assert list(aligned[2,:,0]) == [0,2,6,8]
+
+    statistics = powfacpy.get_case_statistics(aligned,percentiles=[50],reference=0)
+    assert list(statistics["maximum"][:,0]) == [0,2,6,8]
+    assert list(statistics["minimum"][:,0]) == [0,1,3,4]
+    assert list(statistics["percentiles"][0,:,0]) == [0,1,3,4]
+    assert list(statistics["max_deviation"][:,0]) == [0,0,4]
+    assert list(statistics["max_deviation_time"][:,0]) == [0,0,3]
+
+def test_get_aligned_results(pfri,simulated_source):
+    time,aligned = pfri.get_aligned_results([STUDY_CASE,STUDY_CASE],
+        [(simulated_source,"m:Psum:bus1")])
+    assert aligned.shape == (2,len(time),1)
+    statistics = powfacpy.get_case_statistics(aligned,reference=0)
+    assert (statistics["max_deviation"] == 0).all()
+
+if __name__ == "__main__":
+    pytest.main(([r"tests\test_results_interface.py"]))